@@ -1,6 +1,11 @@
 """Performance Dashboard Package."""
 
-from performance_dashboard.app import run_dashboard
-
 __all__ = ['run_dashboard']
 
+
+def __getattr__(name):
+    # 앱(streamlit)은 실제로 쓸 때만 import — engine / data 모듈은 streamlit 없이 import 할 수 있다
+    if name == 'run_dashboard':
+        from performance_dashboard.app import run_dashboard
+        return run_dashboard
+    raise AttributeError(f"module 'performance_dashboard' has no attribute {name!r}")
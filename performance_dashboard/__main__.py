@@ -1,7 +1,76 @@
-"""Entry point for running the dashboard as a module: python -m performance_dashboard"""
+"""Entry point for running the dashboard as a module: python -m performance_dashboard
 
-from performance_dashboard import run_dashboard
+    python -m performance_dashboard                 # 대시보드 실행
+    python -m performance_dashboard build [옵션]    # 사전 계산 번들 빌드 (Streamlit 없이 실행)
+    python -m performance_dashboard publish [옵션]  # 다중 워커용 번들 주기 게시
+"""
 
-if __name__ == "__main__":
+import argparse
+import sys
+
+
+def build(argv):
+    """번들 빌드 서브커맨드"""
+    from performance_dashboard.config import BUNDLE_DIR
+    from performance_dashboard.data.bundle import build_bundle
+
+    parser = argparse.ArgumentParser(prog="python -m performance_dashboard build",
+                                     description="원본 로드 + 전처리 결과를 memory-map 가능한 번들로 저장")
+    parser.add_argument("--out", default=BUNDLE_DIR, help=f"번들 저장 위치 (기본: {BUNDLE_DIR})")
+    parser.add_argument("--source-file", help="구글 시트 대신 읽을 CSV/Parquet 파일")
+    parser.add_argument("--keep", type=int, default=3, help="CURRENT 외에 보관할 이전 번들 수")
+    args = parser.parse_args(argv)
+
+    try:
+        result = build_bundle(args.out, source_file=args.source_file, keep=args.keep)
+    except ValueError as e:
+        print(f"번들 빌드 실패: {e}", file=sys.stderr)
+        return 1
+    timings = ", ".join(f"{k} {v:.2f}s" for k, v in result["timings"].items())
+    print(f"번들 {result['version']} ({result['rows']:,} rows) → {result['path']} [{timings}]")
+    if result["pruned"]:
+        print(f"정리한 이전 번들: {', '.join(result['pruned'])}")
+    return 0
+
+
+def publish(argv):
+    """번들 주기 게시 서브커맨드 (BUNDLE_DIR 당 하나만 실행)"""
+    import logging
+
+    from performance_dashboard.config import BUNDLE_DIR, PUBLISH_INTERVAL_SEC
+    from performance_dashboard.data.bundle import publish_loop
+
+    parser = argparse.ArgumentParser(prog="python -m performance_dashboard publish",
+                                     description="원본을 주기적으로 조회해 워커들이 공유하는 번들로 게시")
+    parser.add_argument("--out", default=BUNDLE_DIR, help=f"번들 저장 위치 (기본: {BUNDLE_DIR})")
+    parser.add_argument("--source-file", help="구글 시트 대신 읽을 CSV/Parquet 파일")
+    parser.add_argument("--interval", type=float, default=PUBLISH_INTERVAL_SEC, help="조회 주기 (초)")
+    parser.add_argument("--keep", type=int, default=3, help="CURRENT 외에 보관할 이전 번들 수")
+    parser.add_argument("--once", action="store_true", help="한 번만 게시하고 종료")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    try:
+        publish_loop(args.out, args.interval, source_file=args.source_file,
+                     keep=args.keep, once=args.once)
+    except BlockingIOError:
+        print(f"다른 publish 프로세스가 이미 {args.out} 에 게시 중입니다.", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "build":
+        return build(argv[1:])
+    if argv and argv[0] == "publish":
+        return publish(argv[1:])
+    from performance_dashboard import run_dashboard
     run_dashboard()
+    return 0
+
 
+if __name__ == "__main__":
+    sys.exit(main())
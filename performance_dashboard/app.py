@@ -1,56 +1,153 @@
 """Main Streamlit application entry point."""
 
+import time
+
 import streamlit as st
 import altair as alt
 
 
 def run_dashboard():
     """Run the dashboard application."""
+    t_run = time.perf_counter()
     # Lazy imports for faster initial loading
-    from performance_dashboard.config import SHEET_URL, SHEET_NAME, CREDENTIALS_FILE
-    from performance_dashboard.data.loader import load_mother_data
-    from performance_dashboard.data.preprocessor import preprocess_df
-    from performance_dashboard.ui.sidebar import render_sidebar_filters
-    from performance_dashboard.sections.kpi import render_kpi_section
-    from performance_dashboard.sections.trend import render_trend_section
-    from performance_dashboard.sections.funnel import render_funnel_section
-    from performance_dashboard.sections.segment import render_segment_section
-    from performance_dashboard.sections.product import render_product_section
+    from performance_dashboard.config import SHEET_URL, SHEET_NAME, CREDENTIALS_FILE, CACHE_WARMUP, PREVIEW_POLL_SEC, SECTION_TABS, KIOSK_MODE
+    from performance_dashboard.data import offload
+    from performance_dashboard.data.loader import get_shared_dataset
+    from performance_dashboard.data.view import get_filtered_view
+    from performance_dashboard.data.sample import sample_of
+    from performance_dashboard.preview import preview_view
+    from performance_dashboard.warmup import start_warmup
+    from performance_dashboard.utils.memory import track_rerun
+    from performance_dashboard.ui.sidebar import render_export_panel, render_sidebar_filters
+    from performance_dashboard.ui.components import lazy_tabs, render_preview_notice
+    from performance_dashboard.data.product_loader import load_product_dates
+    from performance_dashboard.sections import compute_sections, declare_section_aggregates
+    from performance_dashboard.sections.kpi import compute_kpi, kpi_params, render_kpi_section, render_live_kpi_section
+    from performance_dashboard.sections.trend import compute_trend, render_trend_section, trend_params
+    from performance_dashboard.sections.funnel import compute_funnel, render_funnel_section
+    from performance_dashboard.sections.segment import compute_segment, render_segment_section, segment_params
+    from performance_dashboard.sections.product import compute_product, product_params, render_product_section
     
     # 기본 설정
     st.set_page_config(page_title="Performance Dashboard", layout="wide", page_icon="📈")
     alt.data_transformers.disable_max_rows()
+    # 키오스크 모드: KPI Board 만 타이머로 다시 실행 (URL ?kiosk=1 또는 KIOSK_MODE=1)
+    kiosk = KIOSK_MODE or st.query_params.get("kiosk") == "1"
 
-    # 데이터 로딩
+    # 데이터 로딩 및 전처리 (프로세스 단위 공유, 읽기 전용)
     try:
-        mother_data = load_mother_data(SHEET_URL, SHEET_NAME, CREDENTIALS_FILE)
-        if mother_data is None or mother_data.empty:
-            st.error("구글 스프레드시트에서 데이터를 가져올 수 없습니다. 인증/권한을 확인하세요.")
-            st.stop()
+        dataset = get_shared_dataset(SHEET_URL, SHEET_NAME, CREDENTIALS_FILE)
+    except ValueError as e:
+        st.error(f"데이터 전처리 에러: {e}")
+        st.stop()
     except Exception as e:
         st.error(f"데이터 로딩 중 오류: {e}")
         st.stop()
-
-    # 데이터 전처리
-    try:
-        df = preprocess_df(mother_data)
-    except Exception as e:
-        st.error(f"데이터 전처리 에러: {e}")
+    if dataset is None:
+        st.error("구글 스프레드시트에서 데이터를 가져올 수 없습니다. 인증/권한을 확인하세요.")
         st.stop()
 
-    # 사이드바 필터 및 필터링된 데이터
-    fdf, granularity, start_d, end_d = render_sidebar_filters(df)
+    # 새 데이터 버전이면 기본 프리셋 x 집계 단위 집계를 백그라운드에서 예열
+    if CACHE_WARMUP:
+        start_warmup(dataset)
 
-    if fdf.empty:
-        st.warning("선택한 필터에 해당하는 데이터가 없습니다.")
-        st.stop()
+    # 직전 실행(과 그 뒤 fragment 재실행)에서 내보낸 차트별 전송 크기 → 사이드바 표시용
+    st.session_state["last_chart_payload"] = st.session_state.pop("chart_payload", None)
+
+    # rerun 동안 새로 할당한 메모리 측정 (MEMORY_STATS=1 일 때만, 사이드바 표시는 다음 rerun)
+    with track_rerun() as usage:
+        # 사이드바 필터 → 필터 상태별 뷰 (행 집합/섹션 집계는 세션 간 캐시 공유)
+        state = render_sidebar_filters(dataset)
+        # owner: 이번 실행의 세대 토큰 (세션이 다시 실행되면 워커 프로세스로 보낸 집계를 취소)
+        owner = offload.begin_run()
+        view = get_filtered_view(dataset, state, owner=owner)
+
+        if view.row_count == 0:
+            st.warning("선택한 필터에 해당하는 데이터가 없습니다.")
+            st.stop()
+
+        # 내려받기 버튼 (정확한 뷰 기준, 파일은 누를 때 만든다)
+        render_export_panel(view, segment_params(), load_product_dates() or [])
+
+        # 미리보기 안내와 KPI 는 탭보다 위에 그린다 (탭 열림 여부를 알아야 집계 범위가 정해지므로 자리만 먼저 잡는다)
+        top = st.container()
+
+        # KPI 아래 섹션은 탭으로 나눠 열린 탭만 계산 (SECTION_TABS=0 이면 한 페이지에 모두)
+        if SECTION_TABS:
+            tabs = lazy_tabs({
+                "trend": "📈 Trend",
+                "funnel": "📊 Funnel",
+                "segment": "🧩 Segment",
+                "product": "🏢 Product",
+            }, key="section_tab")
+        else:
+            tabs = {name: (st.container(), True) for name in ("trend", "funnel", "segment", "product")}
+        sections = tuple(name for name, (_, is_open) in tabs.items() if is_open)
+        if not kiosk:
+            # 키오스크 KPI 는 tick 마다 일별 합계로 따로 계산하므로 전체 실행 집계에서 뺀다
+            sections = ("kpi",) + sections
+
+        # 열린 섹션 집계 선언 → 최소 그룹 패스로 한 번에 계산 (위젯 값은 session_state 기준)
+        trend_dim = st.session_state.get("segment_trend_comparison", "source")
+        segment_dim = st.session_state.get("segment_comparison", "source")
+        declare_section_aggregates(view, trend_dim=trend_dim, segment_dim=segment_dim, sections=sections)
+
+        # 미리보기: 정확한 집계가 캐시에 없으면 백그라운드로 돌리고 개요 섹션은 표본 뷰로 먼저 그린다
+        # (제품 섹션은 원본 데이터셋 그대로)
+        exact_job = None
+        if st.session_state.get("preview_mode"):
+            sample_view, exact_job = preview_view(view, trend_dim=trend_dim, segment_dim=segment_dim, sections=sections)
+            if sample_view is not None:
+                view = sample_view
+        view.planner.execute()
+
+        # 섹션 계산(집계 파생/차트 spec)을 스레드 풀에서 동시에 → 끝나면 순서대로 렌더링
+        # (위젯 값과 st.cache_data 로더는 스크립트 스레드에서 미리 읽어 넘긴다)
+        tasks = {}
+        if "kpi" in sections:
+            kpi = kpi_params()
+            tasks["kpi"] = lambda: compute_kpi(view, kpi)
+        if "trend" in sections:
+            trend = trend_params(view)
+            tasks["trend"] = lambda: compute_trend(view, trend)
+        if "funnel" in sections:
+            tasks["funnel"] = lambda: compute_funnel(view)
+        if "segment" in sections:
+            segment = segment_params()
+            tasks["segment"] = lambda: compute_segment(view, segment)
+        if "product" in sections:
+            products = load_product_dates() or []
+            product = product_params()
+            tasks["product"] = lambda: compute_product(dataset, products, product, owner)
+        run = compute_sections(tasks)
 
-    # 섹션 렌더링
-    render_kpi_section(fdf)
-    render_trend_section(fdf, granularity)
-    render_funnel_section(fdf)
-    render_segment_section(fdf)
-    render_product_section(df)
+        # 섹션 렌더링 (KPI 는 탭 위, 나머지는 열린 탭 안에만)
+        with top:
+            if exact_job is not None:
+                render_preview_notice(sample_of(view).fraction, exact_job, PREVIEW_POLL_SEC)
+            if kiosk:
+                # tick 마다 현재 데이터 버전을 다시 확인 (조회 실패 시 이번 실행의 데이터셋)
+                render_live_kpi_section(lambda: get_shared_dataset(SHEET_URL, SHEET_NAME, CREDENTIALS_FILE) or dataset, state)
+            else:
+                render_kpi_section(view, run.result("kpi"))
+        renderers = {
+            "trend": lambda: render_trend_section(view, run.result("trend")),
+            "funnel": lambda: render_funnel_section(view, run.result("funnel")),
+            "segment": lambda: render_segment_section(view, run.result("segment")),
+            "product": lambda: render_product_section(dataset, run.result("product")),
+        }
+        for name, (container, is_open) in tabs.items():
+            if is_open:
+                with container:
+                    renderers[name]()
+        st.session_state["aggregation_report"] = view.planner.report()
+        st.session_state["section_timings"] = run.report()
+        # 전체 스크립트 실행 시간 (fragment 패널만 다시 실행한 시간은 panel_timings)
+        st.session_state["rerun_ms"] = (time.perf_counter() - t_run) * 1000
+    if usage:
+        previous = st.session_state.get("memory_stats") or {}
+        usage["session_peak_bytes"] = max(previous.get("session_peak_bytes", 0), usage["peak_bytes"])
+        st.session_state["memory_stats"] = usage
 
 
 if __name__ == "__main__":
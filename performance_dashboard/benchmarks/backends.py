@@ -0,0 +1,100 @@
+"""집계 백엔드 비교 벤치마크: pandas (마스크 + take + groupby) vs 내장 DuckDB (SQL 한 번).
+
+기본 프리셋 x 집계 단위 필터 상태와 차원 필터 상태마다 Overview 섹션의 집계 계획
+(루트 그룹 패스)을 두 백엔드로 실행해 지연시간을 재고, 선언별 롤업 결과가 같은지 확인합니다.
+캐시는 쓰지 않습니다 (매번 필터링부터 다시 계산).
+
+    python -m performance_dashboard.benchmarks.backends --rows 1000000 --repeat 3
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def _best_ms(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+def _max_rel_diff(left, right) -> float:
+    """두 결과의 숫자 값 최대 상대 오차 (모양이 다르면 inf)"""
+    if isinstance(left, pd.Series):
+        left, right = left.to_frame().T, right.to_frame().T
+    if left.shape != right.shape or list(left.columns) != list(right.columns):
+        return float("inf")
+    num = left.select_dtypes("number").columns
+    keys = [c for c in left.columns if c not in num]
+    if keys and not left[keys].astype(str).equals(right[keys].astype(str)):
+        return float("inf")
+    a = left[num].to_numpy(dtype=float)
+    b = right[num].to_numpy(dtype=float)
+    return float(np.max(np.abs(a - b) / np.maximum(np.abs(a), 1.0), initial=0.0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from performance_dashboard.benchmarks.synthetic import make_mother_data
+    from performance_dashboard.data import duckdb_backend
+    from performance_dashboard.data.dataset import build_shared_dataset
+    from performance_dashboard.data.planner import pandas_grouped_sum, plan_passes, rollup
+    from performance_dashboard.data.preprocessor import preprocess_frame
+    from performance_dashboard.data.view import DatasetView, FilterState, filter_rows
+    from performance_dashboard.engine import declare_section_aggregates
+    from performance_dashboard.warmup import warmup_states
+
+    if not duckdb_backend.is_available():
+        print("duckdb 가 설치되지 않았습니다: pip install duckdb", file=sys.stderr)
+        return 1
+
+    dataset = build_shared_dataset(preprocess_frame(make_mother_data(args.rows)))
+    t0 = time.perf_counter()
+    duckdb_backend._dataset_table(dataset)
+    print(json.dumps({"rows": args.rows, "register_ms": round((time.perf_counter() - t0) * 1000, 1)}))
+
+    states = warmup_states(dataset)
+    top_source = dataset.frame["source"].value_counts().index[0]
+    states.append(FilterState(start=states[0].start, end=states[0].end, granularity="Daily", source=(str(top_source),)))
+
+    for state in states:
+        def pandas_path():
+            view = DatasetView(dataset=dataset, state=state, rows=filter_rows(dataset.frame, state))
+            declare_section_aggregates(view)
+            return {root: pandas_grouped_sum(view, root, cols) for root, (cols, _) in plan_passes(view.planner.declared).items()}, view
+
+        def duckdb_path():
+            view = DatasetView(dataset=dataset, state=state, rows=np.empty(0, dtype=np.int64))
+            declare_section_aggregates(view)
+            return {root: duckdb_backend.grouped_sum(dataset, state, root, cols) for root, (cols, _) in plan_passes(view.planner.declared).items()}
+
+        pandas_ms, (pandas_roots, view) = _best_ms(pandas_path, args.repeat)
+        duckdb_ms, duckdb_roots = _best_ms(duckdb_path, args.repeat)
+        diff = 0.0
+        for root, (_, members) in plan_passes(view.planner.declared).items():
+            for spec in members:
+                diff = max(diff, _max_rel_diff(rollup(pandas_roots[root], root, spec), rollup(duckdb_roots[root], root, spec)))
+        print(json.dumps({
+            "state": f"{state.start}~{state.end} {state.granularity} {state.selections() or ''}".strip(),
+            "pandas_ms": round(pandas_ms, 1),
+            "duckdb_ms": round(duckdb_ms, 1),
+            "max_rel_diff": diff,
+            "match": diff < 1e-9,
+        }, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
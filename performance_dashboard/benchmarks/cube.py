@@ -0,0 +1,135 @@
+"""MetricCube bincount 커널 vs DataFrame.groupby 마이크로벤치마크.
+
+같은 데이터를 pandas 프레임(차원은 object 문자열)과 MetricCube 로 만들어 두고,
+필터(날짜 범위 + 차원 선택)와 grain 별 합계를 각각 실행해 최소 시간과 결과 일치 여부를 출력합니다.
+프레임/큐브 생성 시간은 측정에서 제외합니다.
+
+    python -m performance_dashboard.benchmarks.cube --rows 1000000 10000000
+
+10M 행 x 지표 15개는 프레임과 큐브를 합쳐 3GB 가량 필요합니다 (--metrics 로 지표 수를 줄일 수 있음).
+"""
+
+import argparse
+import datetime
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def _frame(n_rows, n_metrics, n_days=730, seed=0):
+    """synthetic.make_mother_data 와 같은 분포 (문자열은 행끼리 공유해 메모리를 아낀다)"""
+    from performance_dashboard.config import DATE_COL, METRICS
+
+    rng = np.random.default_rng(seed)
+    sources = np.array(["META", "UAC", "Twitter"], dtype=object)
+    src = rng.integers(0, 3, n_rows)
+    camp = rng.integers(0, 20, n_rows)
+    campaigns = np.array([f"{s}_campaign_{c}" for s in sources for c in range(20)], dtype=object)
+    end = np.datetime64(pd.Timestamp.now().normalize().date(), "D")
+    days = np.sort(rng.integers(0, n_days, n_rows)).astype("timedelta64[D]")
+    df = pd.DataFrame({
+        DATE_COL: (end - np.timedelta64(n_days - 1, "D") + days).astype("datetime64[ns]"),
+        "source": sources[src],
+        "campaign_name": campaigns[src * 20 + camp],
+        "sub_campaign_name": np.array([f"sub_{i}" for i in range(4)], dtype=object)[rng.integers(0, 4, n_rows)],
+        "creative_name": np.array([f"creative_{i}" for i in range(200)], dtype=object)[rng.integers(0, 200, n_rows)],
+    })
+    metrics = ["cost"] + [m for m in METRICS if m != "cost"][: max(n_metrics - 1, 0)]
+    for m in metrics:
+        df[m] = rng.gamma(2.0, 50_000.0, n_rows).round() if m == "cost" else rng.integers(0, 1000, n_rows)
+    # 앱의 bucketed_frame 과 같은 bucket 컬럼 (일 단위 date 객체, 같은 날짜는 객체 공유)
+    uniq, inverse = np.unique(df[DATE_COL].to_numpy("datetime64[D]"), return_inverse=True)
+    df["bucket"] = uniq.astype(object)[inverse.reshape(-1)]
+    return df, metrics
+
+
+def _best_ms(fn, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+def _same(left, right) -> bool:
+    try:
+        if isinstance(left, pd.Series):
+            pd.testing.assert_series_equal(left, right, check_exact=False, rtol=1e-9)
+        else:
+            pd.testing.assert_frame_equal(left, right, check_exact=False, rtol=1e-9)
+    except AssertionError:
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--metrics", type=int, default=15, help="합계를 낼 지표 수 (1~15)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from performance_dashboard.config import DIMENSIONS, METRICS
+    from performance_dashboard.data.cube import MetricCube, cube_from_arrays, epoch_days
+    from performance_dashboard.data.view import FilterState, filter_rows
+
+    for n_rows in args.rows:
+        df, metrics = _frame(n_rows, min(args.metrics, len(METRICS)))
+        codes, dictionaries = {}, {}
+        for dim in DIMENSIONS:
+            dim_codes, uniques = pd.factorize(df[dim], sort=True)
+            codes[dim] = dim_codes.astype(np.int32)
+            dictionaries[dim] = uniques
+        values = np.empty((len(metrics), n_rows))
+        for i, m in enumerate(metrics):
+            values[i] = df[m].to_numpy(np.float64)
+        cube: MetricCube = cube_from_arrays(
+            epoch_days(df["Date"]), codes, dictionaries, values, metrics,
+            integer=[m for m in metrics if df[m].dtype.kind in "iu"],
+        )
+        df["date"] = df["bucket"]  # filter_rows 는 date 컬럼으로 날짜 범위를 자른다
+
+        last = df["bucket"].iloc[-1]
+        state = FilterState(start=last - datetime.timedelta(days=89), end=last, granularity="Daily",
+                            source=("META", "UAC"))
+        rows = cube.filter_rows(state)
+        cases = [
+            ("filter 90d x source", lambda: filter_rows(df, state), lambda: cube.filter_rows(state)),
+        ]
+        for grain in [(), ("bucket",), ("source",), ("bucket", "source"), ("campaign_name", "creative_name"),
+                      tuple(DIMENSIONS)]:
+            for label, sel in (("all", None), ("filtered", rows)):
+                def pandas_fn(grain=grain, sel=sel):
+                    frame = df if sel is None else df.take(sel)
+                    if not grain:
+                        return frame[metrics].sum()
+                    return frame.groupby(list(grain), dropna=False)[metrics].sum().reset_index()
+
+                def cube_fn(grain=grain, sel=sel):
+                    return cube.grouped_sum(np.arange(n_rows) if sel is None else sel, grain, metrics)
+
+                cases.append((f"sum {'x'.join(grain) or 'total'} ({label})", pandas_fn, cube_fn))
+
+        for name, pandas_fn, cube_fn in cases:
+            pandas_ms, expected = _best_ms(pandas_fn, args.repeat)
+            cube_ms, actual = _best_ms(cube_fn, args.repeat)
+            match = np.array_equal(expected, actual) if isinstance(expected, np.ndarray) else _same(expected, actual)
+            print(json.dumps({
+                "rows": n_rows,
+                "metrics": len(metrics),
+                "case": name,
+                "pandas_ms": round(pandas_ms, 1),
+                "cube_ms": round(cube_ms, 1),
+                "speedup": round(pandas_ms / cube_ms, 1) if cube_ms else None,
+                "match": bool(match),
+            }))
+        del df, cube, values
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Headless engine benchmark: 섹션별 결과 계산 시간 (streamlit 없이 실행).
+
+기본 프리셋 x 집계 단위 필터 상태마다 집계 캐시를 비우고 `engine.open_view`(필터 + 섹션 집계 계획 실행)와
+섹션별 engine 함수(KPI / Funnel / Segment / Trend / Product)를 차례로 실행해 최소 시간을 출력합니다.
+차트 spec 직렬화와 렌더링은 포함하지 않습니다.
+
+    python -m performance_dashboard.benchmarks.engine --rows 1000000 --repeat 3
+"""
+
+import argparse
+import json
+import sys
+import time
+
+
+def _best_ms(fn, repeat, before=None):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from performance_dashboard import engine
+    from performance_dashboard.benchmarks.synthetic import make_mother_data
+    from performance_dashboard.utils.cache import AGGREGATE_CACHE
+    from performance_dashboard.warmup import warmup_states
+
+    t0 = time.perf_counter()
+    dataset = engine.dataset_from_frame(make_mother_data(args.rows))
+    print(json.dumps({
+        "rows": args.rows,
+        "load_ms": round((time.perf_counter() - t0) * 1000, 1),
+        "streamlit_imported": "streamlit" in sys.modules,
+    }))
+
+    start, end = dataset.frame["date"].min(), dataset.frame["date"].max()
+    products = [{"id": "all", "name": "all", "start_date": str(start), "end_date": str(end)}]
+    for state in warmup_states(dataset):
+        open_ms, view = _best_ms(lambda: engine.open_view(dataset, state), args.repeat, before=AGGREGATE_CACHE.clear)
+        if not view.row_count:
+            continue
+        sections = {
+            "kpi": lambda: engine.kpi_summary(view),
+            "funnel": lambda: engine.funnel_summary(view),
+            "segment": lambda: engine.segment_table(view, "source"),
+            "trend": lambda: (engine.conversion_trend(view), engine.funnel_rate_trend(view),
+                              engine.unit_cost_trend(view), engine.metric_comparison_trend(view),
+                              engine.segment_trend(view, "source")),
+            "product": lambda: (engine.product_comparison(dataset, products),
+                                engine.product_summary(dataset, products[0])),
+        }
+        print(json.dumps({
+            "state": f"{state.start}~{state.end} {state.granularity}",
+            "rows": view.row_count,
+            "open_view_ms": round(open_ms, 1),
+            **{f"{name}_ms": round(_best_ms(fn, args.repeat)[0], 1) for name, fn in sections.items()},
+        }, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""st.cache_data 복사 방식 vs 공유 읽기 전용 데이터셋 비교 벤치마크.
+
+동시 세션 N개가 각각 R번 rerun 하는 상황을 스레드로 흉내내고,
+rerun 당 지연시간과 프로세스 RSS 를 측정합니다.
+
+    python -m performance_dashboard.benchmarks.shared_dataset --sessions 24 --reruns 5
+"""
+
+import argparse
+import datetime
+import json
+import pickle
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+
+def _rss_bytes():
+    """현재/최대 RSS (psutil 이 없으면 최대 RSS 만)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _run_mode(mode, n_rows, sessions, reruns):
+    from performance_dashboard.benchmarks.synthetic import make_mother_data
+    from performance_dashboard.data.dataset import build_shared_dataset
+    from performance_dashboard.data.preprocessor import preprocess_frame
+    from performance_dashboard.data.view import FilterState, date_bounds, dimension_options, get_filtered_view
+
+    dataset = build_shared_dataset(preprocess_frame(make_mother_data(n_rows)))
+    # 두 모드 모두 최근 30일, Twitter 제외 (shared 는 앱과 같이 get_filtered_view 로)
+    max_d = date_bounds(dataset)[1]
+    state = FilterState(
+        start=max_d - datetime.timedelta(days=29), end=max_d, granularity="Daily",
+        source=tuple(s for s in dimension_options(dataset, "source") if s != "Twitter"),
+    )
+    # st.cache_data 는 값을 pickle 로 저장하고 적중할 때마다 unpickle 한다
+    pickled = pickle.dumps(dataset.frame, protocol=pickle.HIGHEST_PROTOCOL)
+    baseline_rss = _rss_bytes()
+
+    latencies = []
+    peak_rss = [baseline_rss]
+    lock = threading.Lock()
+    barrier = threading.Barrier(sessions)
+
+    def session():
+        held = None
+        for _ in range(reruns):
+            barrier.wait()
+            t0 = time.perf_counter()
+            if mode == "cache_data":
+                df = pickle.loads(pickled)
+                fdf = df.loc[(df["date"] >= state.start) & (df["source"] != "Twitter")]
+            else:
+                df = fdf = get_filtered_view(dataset, state).frame
+            fdf["cost"].sum()
+            elapsed = time.perf_counter() - t0
+            held = df  # rerun 이 끝날 때까지 세션이 프레임을 쥐고 있는 상황
+            barrier.wait()
+            with lock:
+                latencies.append(elapsed)
+                peak_rss[0] = max(peak_rss[0], _rss_bytes())
+        return held
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    lat = np.array(latencies) * 1000
+    return {
+        "mode": mode,
+        "sessions": sessions,
+        "reruns": reruns,
+        "rows": n_rows,
+        "dataset_mb": round(dataset.nbytes / 1e6, 1),
+        "latency_ms_p50": round(float(np.percentile(lat, 50)), 2),
+        "latency_ms_p95": round(float(np.percentile(lat, 95)), 2),
+        "rss_baseline_mb": round(baseline_rss / 1e6, 1),
+        "rss_peak_mb": round(peak_rss[0] / 1e6, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--sessions", type=int, default=24)
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--mode", choices=["cache_data", "shared"], help="단일 모드만 실행 (내부용)")
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(_run_mode(args.mode, args.rows, args.sessions, args.reruns)))
+        return 0
+
+    # RSS 를 분리해서 재기 위해 모드마다 별도 프로세스로 실행
+    for mode in ("cache_data", "shared"):
+        out = subprocess.run(
+            [sys.executable, "-m", "performance_dashboard.benchmarks.shared_dataset",
+             "--mode", mode, "--rows", str(args.rows),
+             "--sessions", str(args.sessions), "--reruns", str(args.reruns)],
+            capture_output=True, text=True, check=True,
+        )
+        print(out.stdout.strip().splitlines()[-1])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
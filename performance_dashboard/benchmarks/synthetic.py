@@ -0,0 +1,31 @@
+"""Synthetic mother data for benchmarks (구글 시트 없이 실행)."""
+
+import numpy as np
+import pandas as pd
+
+from performance_dashboard.config import DATE_COL, METRICS
+
+
+def make_mother_data(n_rows: int = 200_000, n_days: int = 730, seed: int = 0) -> pd.DataFrame:
+    """구글 시트 원본과 같은 스키마의 가짜 데이터 생성"""
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp.now(tz="Asia/Seoul").normalize().tz_localize(None)
+    days = pd.date_range(end=end, periods=n_days, freq="D")
+
+    sources = np.array(["META", "UAC", "Twitter"])
+    src = rng.integers(0, len(sources), n_rows)
+    camp = rng.integers(0, 20, n_rows)
+    sub = rng.integers(0, 4, n_rows)
+    creative = rng.integers(0, 200, n_rows)
+
+    df = pd.DataFrame({
+        DATE_COL: days[rng.integers(0, n_days, n_rows)].strftime("%Y-%m-%d"),
+        "source": sources[src],
+        "campaign_name": np.char.add(sources[src], np.char.add("_campaign_", camp.astype(str))),
+        "sub_campaign_name": np.char.add("sub_", sub.astype(str)),
+        "creative_name": np.char.add("creative_", creative.astype(str)),
+    })
+    for c in METRICS:
+        df[c] = rng.integers(0, 1000, n_rows)
+    df["cost"] = rng.gamma(2.0, 50_000.0, n_rows).round()
+    return df
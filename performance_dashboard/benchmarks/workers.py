@@ -0,0 +1,107 @@
+"""워커 프로세스 수에 따른 메모리 사용량: 워커별 실시간 로딩 vs 공유 번들 연결.
+
+워커 N개를 띄워 각각 데이터셋을 준비하게 한 뒤, 전원이 데이터를 들고 있는 상태에서
+워커별 PSS(공유 페이지는 나눠서 계산)와 private 메모리를 /proc/<pid>/smaps_rollup 에서 읽습니다.
+baseline 은 데이터 없이 import 만 한 워커입니다.
+Linux 전용입니다.
+
+    python -m performance_dashboard.benchmarks.workers --workers 1 2 4 8
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def _smaps(pid) -> dict:
+    """smaps_rollup 의 kB 항목 (Pss, Private_Clean, Private_Dirty ...)"""
+    out = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        key, value = line.split(":", 1)
+        out[key] = int(value.split()[0])
+    return out
+
+
+def _worker(mode, source, bundle_dir):
+    """데이터셋을 준비하고 신호를 보낸 뒤 stdin 이 닫힐 때까지 대기"""
+    import pandas as pd
+
+    from performance_dashboard.data.bundle import open_current_bundle
+    from performance_dashboard.data.dataset import build_shared_dataset
+    from performance_dashboard.data.preprocessor import preprocess_frame
+
+    if mode == "bundle":
+        dataset = open_current_bundle(bundle_dir)
+    elif mode == "live":
+        dataset = build_shared_dataset(preprocess_frame(pd.read_csv(source)))
+    else:
+        dataset = None  # import 만 한 상태 (인터프리터/라이브러리 기본 사용량)
+    if dataset is not None:
+        # 실제 세션처럼 배열을 한 번씩 읽어 페이지를 올린다
+        dataset.frame.select_dtypes("number").sum()
+    print("ready", flush=True)
+    sys.stdin.read()
+
+
+def _measure(mode, workers, source, bundle_dir):
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-m", "performance_dashboard.benchmarks.workers",
+             "--worker", mode, "--source", source, "--bundle-dir", bundle_dir],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+        for _ in range(workers)
+    ]
+    try:
+        for p in procs:
+            p.stdout.readline()
+        time.sleep(0.2)
+        stats = [_smaps(p.pid) for p in procs]
+    finally:
+        for p in procs:
+            p.stdin.close()
+            p.wait()
+    pss = sum(s["Pss"] for s in stats) / 1024
+    private = sum(s["Private_Clean"] + s["Private_Dirty"] for s in stats) / 1024
+    return {
+        "mode": mode,
+        "workers": workers,
+        "total_pss_mb": round(pss, 1),
+        "pss_per_worker_mb": round(pss / workers, 1),
+        "private_per_worker_mb": round(private / workers, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--worker", choices=["baseline", "live", "bundle"], help=argparse.SUPPRESS)
+    parser.add_argument("--source", help=argparse.SUPPRESS)
+    parser.add_argument("--bundle-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.worker, args.source, args.bundle_dir)
+        return 0
+
+    from performance_dashboard.benchmarks.synthetic import make_mother_data
+    from performance_dashboard.data.bundle import build_bundle
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = str(Path(tmp) / "source.csv")
+        bundle_dir = str(Path(tmp) / "bundles")
+        make_mother_data(args.rows).to_csv(source, index=False)
+        build_bundle(bundle_dir, source_file=source)
+        for mode in ("baseline", "live", "bundle"):
+            for n in args.workers:
+                print(json.dumps(_measure(mode, n, source, bundle_dir)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
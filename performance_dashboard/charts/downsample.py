@@ -0,0 +1,92 @@
+"""Largest-Triangle-Three-Buckets downsampling for long trend series."""
+
+import numpy as np
+import pandas as pd
+
+from performance_dashboard.config import DOWNSAMPLE_PX_PER_POINT, DOWNSAMPLE_WIDTH_PX
+
+
+def point_budget(width_fraction: float) -> int:
+    """차트 폭(본문 폭 x 열 비율)에 맞는 시리즈당 점 수 (0 이면 다운샘플링 안 함)"""
+    if DOWNSAMPLE_WIDTH_PX <= 0:
+        return 0
+    return max(3, int(DOWNSAMPLE_WIDTH_PX * width_fraction / DOWNSAMPLE_PX_PER_POINT))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """LTTB 로 고른 점의 위치 (x 오름차순, 처음/끝 점 포함, 길이 n_out 이하)
+
+    가운데 점들을 n_out - 2 개 bucket 으로 나누고, bucket 마다 직전에 고른 점과 다음 bucket
+    평균점으로 만든 삼각형의 넓이가 가장 큰 점을 고릅니다 (봉우리와 골짜기가 남는다).
+    NaN 값은 넓이 계산에서 0 으로 봅니다.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.nan_to_num(np.asarray(y, dtype=np.float64))
+    edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    picked = np.empty(n_out, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            nxt = slice(hi, edges[i + 2])
+            cx, cy = x[nxt].mean(), y[nxt].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        picked[i + 1] = a
+    return picked
+
+
+def _with_extremes(picked: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """LTTB 로 고른 점에 최댓값/최솟값 점을 넣는다 (가장 가까운 가운데 점과 바꾸므로 점 수는 그대로)"""
+    if np.isnan(y).all():
+        return picked
+    picked = picked.copy()
+    fixed = np.zeros(len(picked), dtype=bool)
+    fixed[[0, -1]] = True  # 처음/끝 점은 바꾸지 않는다
+    for extreme in (np.nanargmax(y), np.nanargmin(y)):
+        hit = np.flatnonzero(picked == extreme)
+        if len(hit):
+            fixed[hit] = True
+            continue
+        distance = np.where(fixed, np.inf, np.abs(picked - extreme).astype(np.float64))
+        if np.isinf(distance).all():
+            break
+        slot = int(np.argmin(distance))
+        picked[slot] = extreme
+        fixed[slot] = True
+    return np.sort(picked)
+
+
+def downsample(df: pd.DataFrame, x_col: str, value_cols, n_out: int, by: str = None) -> pd.DataFrame:
+    """x 순 시리즈를 시리즈당 n_out 점 이하로 줄인 프레임 (n_out 이하이거나 0 이면 그대로)
+
+    넓은 형태(bucket 당 한 행, 지표 여러 컬럼)는 남긴 행마다 모든 지표의 점이 되므로, n_out 을 value_cols 에
+    나눠 지표마다 LTTB 로 고르고(최댓값/최솟값 점은 가장 가까운 점과 바꿔 넣는다) 그 합집합을 남깁니다.
+    지표가 n_out / 3 개보다 많으면 지표당 3 점씩이라 n_out 을 넘을 수 있습니다.
+    by 가 있으면 그 컬럼 값(세그먼트)별로 따로 줄입니다. 원본 프레임은 수정하지 않습니다.
+    """
+    if not n_out or df.empty or not len(value_cols):
+        return df
+    groups = [df] if by is None else [part for _, part in df.groupby(by, sort=False)]
+    if all(len(part) <= n_out for part in groups):
+        return df
+    per_col = max(3, n_out // len(value_cols))
+    keep = []
+    for part in groups:
+        part = part.sort_values(x_col)
+        positions = df.index.get_indexer(part.index)
+        if len(part) <= n_out:
+            keep.append(positions)
+            continue
+        x = pd.to_datetime(part[x_col]).to_numpy("datetime64[ns]").astype(np.int64) / 86_400e9
+        for col in value_cols:
+            y = part[col].to_numpy(dtype=np.float64)
+            keep.append(positions[_with_extremes(lttb_indices(x, y, per_col), y)])
+    return df.take(np.unique(np.concatenate(keep)))
@@ -0,0 +1,167 @@
+"""Serialized Vega-Lite spec cache for Altair charts."""
+
+import datetime
+import hashlib
+import json
+import threading
+import time
+from contextlib import nullcontext
+from typing import NamedTuple
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+from performance_dashboard.utils.cache import AGGREGATE_CACHE, hash_value
+
+# altair 의 data transformer / theme 는 프로세스 전역 설정이므로 직렬화 구간을 직렬화한다
+_altair_lock = threading.Lock()
+_timings_lock = threading.Lock()
+_timings = {}  # chart_id -> 누적 시간/횟수
+# 실수 컬럼을 float32 로 보내도 되는 최대 절대 오차 (차트/툴팁 표시는 소수 둘째 자리까지)
+FLOAT32_TOLERANCE = 0.005
+
+
+class ChartPayload(NamedTuple):
+    """직렬화된 차트: 데이터를 뺀 Vega-Lite spec JSON + 이름 있는 Arrow 데이터셋 (이름 -> IPC 바이트)"""
+
+    spec_json: str
+    datasets: dict
+
+    @property
+    def nbytes(self) -> int:
+        """전송 크기 (spec JSON + 데이터셋 바이트)"""
+        return len(self.spec_json.encode()) + sum(len(b) for b in self.datasets.values())
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """전송용 컬럼 인코딩 (정수는 최소 폭, 실수는 표시 자릿수 안에서 같으면 float32,
+    문자열은 사전(category), datetime.date 는 datetime64)"""
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_bool_dtype(s):
+            out[col] = s
+        elif pd.api.types.is_integer_dtype(s):
+            out[col] = pd.to_numeric(s, downcast="integer")
+        elif pd.api.types.is_float_dtype(s):
+            v = s.to_numpy(np.float64)
+            finite = np.isfinite(v)
+            with np.errstate(over="ignore"):
+                error = np.abs(v[finite].astype(np.float32).astype(np.float64) - v[finite])
+            out[col] = s.astype(np.float32) if not error.size or error.max() < FLOAT32_TOLERANCE else s
+        elif s.dtype == object:
+            values = s.dropna()
+            if len(values) and isinstance(values.iloc[0], datetime.date):
+                out[col] = pd.to_datetime(s)
+            elif values.map(type).eq(str).all():
+                out[col] = s.astype("category")
+            else:
+                out[col] = s
+        else:
+            out[col] = s
+    return pd.DataFrame(out)
+
+
+def _arrow_dataset(data, datasets):
+    """altair data transformer: DataFrame → 내용 해시로 이름 붙인 Arrow 데이터셋 (같은 데이터는 한 번만)"""
+    table = pa.Table.from_pandas(compact_frame(pd.DataFrame(data)), preserve_index=False)
+    table = table.replace_schema_metadata(None)  # pandas 메타데이터는 브라우저에서 쓰지 않는다
+    sink = pa.BufferOutputStream()
+    with pa.RecordBatchStreamWriter(sink, table.schema) as writer:
+        writer.write_table(table)
+    payload = sink.getvalue().to_pybytes()
+    name = "data-" + hashlib.sha1(payload).hexdigest()[:16]
+    datasets[name] = payload
+    return {"name": name}
+
+
+def compile_chart(chart) -> ChartPayload:
+    """Altair 차트를 데이터 없는 spec JSON + Arrow 데이터셋으로 직렬화 (행 수 제한 없음)
+
+    레이어가 같은 프레임을 쓰면 데이터셋 하나를 이름으로 참조하고, 값은 JSON 대신
+    compact_frame 인코딩의 Arrow 로 보냅니다 (st.vega_lite_chart 가 바이트를 그대로 전달).
+    """
+    theme = getattr(alt, "theme", None) or alt.themes
+    alt.data_transformers.register("compact_arrow", _arrow_dataset)
+    datasets = {}
+    with _altair_lock:
+        # st.altair_chart 와 같은 결과가 되도록 altair 기본 테마(300x300 기본 크기)는 끈다
+        theme_context = theme.enable("none") if theme.active == "default" else nullcontext()
+        with theme_context, alt.data_transformers.enable("compact_arrow", datasets=datasets):
+            spec = chart.to_dict()
+    spec.pop("datasets", None)
+    return ChartPayload(json.dumps(spec, default=str), datasets)
+
+
+def _record(chart_id, hit=None, payload_bytes=None, **elapsed):
+    with _timings_lock:
+        entry = _timings.setdefault(chart_id, {"hits": 0, "misses": 0, "emits": 0, "build_ms": 0.0, "serialize_ms": 0.0,
+                                               "emit_ms": 0.0, "payload_bytes": 0})
+        for name, seconds in elapsed.items():
+            entry[name] += seconds * 1000
+        if hit is not None:
+            entry["hits" if hit else "misses"] += 1
+        if "emit_ms" in elapsed:
+            entry["emits"] += 1
+        if payload_bytes is not None:
+            entry["payload_bytes"] = payload_bytes
+
+
+def chart_spec(chart_id: str, build, *params) -> ChartPayload:
+    """Altair 차트의 직렬화 결과 (spec 캐시를 거침, st 호출 없음 — 섹션 계산 스레드에서 호출 가능)
+
+    (chart_id, params) 키로 ChartPayload 를 집계 캐시에 저장하고, 같은 키면 build() 를
+    호출하지 않습니다. params 에는 데이터 버전/필터 상태/위젯 값처럼 차트 모양을 결정하는 값을 모두 넘깁니다.
+    """
+    key = ("chart_spec", chart_id, hash_value(params))
+    payload = AGGREGATE_CACHE.get(key, namespace="chart_spec")
+    if payload is not None:
+        _record(chart_id, hit=True)
+        return payload
+    t0 = time.perf_counter()
+    chart = build()
+    t1 = time.perf_counter()
+    payload = compile_chart(chart)
+    t2 = time.perf_counter()
+    AGGREGATE_CACHE.put(key, payload, cost=t2 - t0, namespace="chart_spec")
+    _record(chart_id, hit=False, build_ms=t1 - t0, serialize_ms=t2 - t1)
+    return payload
+
+
+def emit_chart(chart_id: str, payload: ChartPayload):
+    """직렬화된 차트를 화면에 내보낸다 (스크립트 스레드에서만)
+
+    전송 크기는 차트별로 session_state["chart_payload"] 에 남긴다 (app 이 rerun 마다 모아 사이드바에 표시).
+    """
+    t0 = time.perf_counter()
+    spec = json.loads(payload.spec_json)
+    if payload.datasets:
+        spec["datasets"] = dict(payload.datasets)
+    st.vega_lite_chart(spec, width="stretch")
+    _record(chart_id, payload_bytes=payload.nbytes, emit_ms=time.perf_counter() - t0)
+    st.session_state.setdefault("chart_payload", {})[chart_id] = payload.nbytes
+
+
+def render_chart(chart_id: str, build, *params):
+    """Altair 차트를 spec 캐시를 거쳐 그린다 (chart_spec + emit_chart)"""
+    emit_chart(chart_id, chart_spec(chart_id, build, *params))
+
+
+def chart_timings() -> list:
+    """차트별 평균 build/serialize/emit 시간 (ms), spec 캐시 적중/미스, 마지막 전송 크기 (KB)"""
+    with _timings_lock:
+        rows = []
+        for chart_id, entry in sorted(_timings.items()):
+            rows.append({
+                "chart": chart_id,
+                "hits": entry["hits"],
+                "misses": entry["misses"],
+                "build_ms": entry["build_ms"] / entry["misses"] if entry["misses"] else 0.0,
+                "serialize_ms": entry["serialize_ms"] / entry["misses"] if entry["misses"] else 0.0,
+                "emit_ms": entry["emit_ms"] / entry["emits"] if entry["emits"] else 0.0,
+                "payload_kb": entry["payload_bytes"] / 1024,
+            })
+        return rows
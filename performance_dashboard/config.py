@@ -38,6 +38,17 @@ METRICS = [
 ]
 REQUIRED_COLS = [DATE_COL] + DIMENSIONS + METRICS
 
+# 사이드바 날짜 프리셋 / 집계 단위
+DATE_PRESETS = ["최근 7일", "최근 30일", "최근 90일", "전체"]
+GRANULARITIES = ["Daily", "Weekly", "Monthly"]
+
+# 사이드바 필터 적용 방식
+# FILTER_APPLY: form = 편집은 모아 두고 "필터 적용" 버튼으로 한 번에 반영 (편집 중에는 필터 패널만 다시 실행)
+#               debounce = 마지막 편집 후 FILTER_DEBOUNCE_SEC 동안 변경이 없으면 자동 반영
+#               live = 위젯을 바꿀 때마다 바로 전체 재실행 (이전 동작)
+FILTER_APPLY = os.getenv("FILTER_APPLY", "form").lower()
+FILTER_DEBOUNCE_SEC = float(os.getenv("FILTER_DEBOUNCE_SEC", "1.5"))
+
 # Product dates file
 # 배포 시 경로 문제를 방지하기 위해 여러 경로를 시도
 # 1. 환경 변수로 지정된 경로
@@ -62,3 +73,88 @@ else:
         # 기본값 (상대 경로, fallback)
         PRODUCT_DATES_FILE = os.path.join("configs", "product_dates.json")
 
+# 집계 캐시 설정 (바이트 예산 기반 LRU, 프로세스 단위 공유)
+# AGG_CACHE_MAX_MB: 파생 집계 캐시 전체 예산 (MB)
+# AGG_CACHE_COMPRESS: 예산의 75% 를 넘으면 오래된 항목을 압축 (1/0)
+# SHOW_CACHE_STATS: 사이드바에 캐시 적중/제거 카운터 표시 (1/0)
+AGG_CACHE_MAX_BYTES = int(float(os.getenv("AGG_CACHE_MAX_MB", "256")) * 1024 * 1024)
+AGG_CACHE_COMPRESS = os.getenv("AGG_CACHE_COMPRESS", "1") == "1"
+SHOW_CACHE_STATS = os.getenv("SHOW_CACHE_STATS", "0") == "1"
+# MEMORY_STATS: rerun 마다 새로 할당한 메모리 최대치를 tracemalloc 으로 측정해 사이드바에 표시 (1/0)
+#   측정 중에는 할당마다 추적 비용이 붙으므로 진단할 때만 켠다 (SHOW_CACHE_STATS=1 필요)
+MEMORY_STATS = os.getenv("MEMORY_STATS", "0") == "1"
+
+# 캐시 예열 (새 데이터 버전이 로드되면 기본 프리셋 x 집계 단위 집계를 백그라운드에서 미리 계산)
+# CACHE_WARMUP: 예열 사용 여부 (1/0)
+# CACHE_WARMUP_YIELD_SEC: 작업 사이 대기 시간 (사용자 요청에 CPU 양보)
+CACHE_WARMUP = os.getenv("CACHE_WARMUP", "1") == "1"
+CACHE_WARMUP_YIELD_SEC = float(os.getenv("CACHE_WARMUP_YIELD_SEC", "0.05"))
+
+# 사전 계산 번들 (python -m performance_dashboard build 로 생성)
+# BUNDLE_DIR: 번들 저장 위치. CURRENT 파일이 있으면 앱은 시트를 읽지 않고 번들을 연다
+BUNDLE_DIR = os.getenv("BUNDLE_DIR", str(Path(__file__).parent / "bundles"))
+
+# 다중 워커 배포 (python -m performance_dashboard publish 가 BUNDLE_DIR 에 게시, 워커는 읽기 전용으로 연결)
+# BUNDLE_ONLY: 워커가 구글 시트를 직접 읽지 않고 게시된 번들만 사용 (1/0)
+# PUBLISH_INTERVAL_SEC: 게시 프로세스의 원본 조회 주기 (초)
+BUNDLE_ONLY = os.getenv("BUNDLE_ONLY", "0") == "1"
+PUBLISH_INTERVAL_SEC = float(os.getenv("PUBLISH_INTERVAL_SEC", "3600"))
+
+# 집계 실행 백엔드 (섹션 집계 계획의 그룹 패스를 어디서 실행할지)
+# AGGREGATION_BACKEND: cube (기본, MetricCube 정수 코드 + np.bincount 커널)
+#   / pandas (DataFrame.groupby) / duckdb (내장 DuckDB 에서 필터+그룹 합계를 SQL 한 번으로, 멀티스레드)
+#   duckdb 가 설치되지 않았으면 cube 로 대체
+# DUCKDB_THREADS: DuckDB 쿼리 스레드 수 (0 이면 DuckDB 기본값 = CPU 코어 수)
+AGGREGATION_BACKEND = os.getenv("AGGREGATION_BACKEND", "cube").lower()
+DUCKDB_THREADS = int(os.getenv("DUCKDB_THREADS", "0"))
+
+# 섹션 계산 병렬화 (섹션별 집계 파생/차트 spec 생성을 스레드 풀에서 동시에 실행한 뒤 순서대로 렌더링)
+# SECTION_COMPUTE_WORKERS: 스레드 수 (0 이면 스크립트 스레드에서 순서대로 계산)
+SECTION_COMPUTE_WORKERS = int(os.getenv("SECTION_COMPUTE_WORKERS", "4"))
+# SECTION_FRAGMENTS: 위젯이 있는 패널(Trend 비교 차트, Segment 테이블, Product 비교/상세)을 st.fragment 로 감싸
+#   위젯을 바꾸면 그 패널만 다시 실행 (0 이면 위젯 변경마다 전체 스크립트 재실행)
+SECTION_FRAGMENTS = os.getenv("SECTION_FRAGMENTS", "1") == "1"
+# SECTION_TABS: KPI 아래 섹션(Trend/Funnel/Segment/Product)을 탭으로 나눠 열린 탭만 집계/계산/렌더링
+#   (탭 결과는 집계 캐시에 데이터 버전 단위로 남아 다시 열면 바로 그린다, 0 이면 한 페이지에 모두 계산)
+SECTION_TABS = os.getenv("SECTION_TABS", "1") == "1"
+
+# Trend 차트 다운샘플링 (LTTB: 시리즈마다 봉우리/골짜기를 남기고 점 수를 차트 폭에 맞춰 줄인 뒤 전송)
+# DOWNSAMPLE_WIDTH_PX: 본문 폭 가정값(px), 차트 폭 = 본문 폭 x 열 비율 (0 이면 다운샘플링 끔)
+# DOWNSAMPLE_PX_PER_POINT: 점 하나당 픽셀 — 시리즈 점 수가 차트 폭 / 이 값을 넘을 때만 줄인다
+DOWNSAMPLE_WIDTH_PX = int(os.getenv("DOWNSAMPLE_WIDTH_PX", "1400"))
+DOWNSAMPLE_PX_PER_POINT = float(os.getenv("DOWNSAMPLE_PX_PER_POINT", "2"))
+
+# 표 렌더링 (숫자 형식은 column_config 로 선언해 브라우저에서 포맷, 값은 숫자 타입 그대로 전송)
+# TABLE_PAGE_ROWS: 이보다 긴 표는 서버에서 정렬한 뒤 현재 페이지 행만 보낸다 (0 이면 페이지 나누지 않음)
+TABLE_PAGE_ROWS = int(os.getenv("TABLE_PAGE_ROWS", "500"))
+
+# 키오스크 모드 (사무실 TV 등: URL 에 ?kiosk=1 또는 KIOSK_MODE=1)
+# KPI Board 와 최근 일별 추이만 KIOSK_REFRESH_SEC 마다 다시 실행하고 나머지 섹션은 처음 그린 그대로 둔다
+# KIOSK_RESTATE_DAYS: 새 데이터 버전에서 다시 합산할 최근 일수 (늦게 들어오는 30일 전환 보정 구간, 그 이전 일별 합계는 재사용)
+# KIOSK_TREND_DAYS: KPI 아래 최근 추이 차트에 그릴 일수
+KIOSK_MODE = os.getenv("KIOSK_MODE", "0") == "1"
+KIOSK_REFRESH_SEC = float(os.getenv("KIOSK_REFRESH_SEC", "60"))
+KIOSK_RESTATE_DAYS = int(os.getenv("KIOSK_RESTATE_DAYS", "30"))
+KIOSK_TREND_DAYS = int(os.getenv("KIOSK_TREND_DAYS", "14"))
+
+# 내보내기 (사이드바 📤 내보내기: 필터된 원본 행 / 섹션 집계를 CSV / Parquet / XLSX 로)
+# EXPORT_CHUNK_ROWS: 한 번에 꺼내 파일에 쓰는 행 수 (메모리에는 이 청크 하나만 올라간다)
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "100000"))
+
+# 무거운 집계의 워커 프로세스 오프로드 (MetricCube 배열을 공유 메모리로 붙인 별도 프로세스에서 계산,
+#   결과는 Arrow 버퍼로 받음 → 한 사용자의 큰 집계가 같은 프로세스의 다른 세션을 막지 않는다)
+# OFFLOAD_WORKERS: 워커 프로세스 수 (0 이면 사용 안 함, 기본)
+# OFFLOAD_MIN_ROWS: 이 행 수 이상을 훑는 집계만 오프로드 (작은 집계는 프로세스 간 전달 비용이 더 큼)
+# OFFLOAD_SHM_DIR: 시트에서 바로 로딩한 데이터셋의 큐브 배열을 둘 디렉토리
+#   (기본: /dev/shm, 없으면 임시 디렉토리 / 번들로 연 데이터셋은 번들 파일을 그대로 공유)
+OFFLOAD_WORKERS = int(os.getenv("OFFLOAD_WORKERS", "0"))
+OFFLOAD_MIN_ROWS = int(os.getenv("OFFLOAD_MIN_ROWS", "500000"))
+OFFLOAD_SHM_DIR = os.getenv("OFFLOAD_SHM_DIR", "")
+
+# 근사 미리보기 (사이드바에서 켜면 source x 일자 층화 표본으로 먼저 그리고, 정확한 집계는 백그라운드에서 계산)
+# PREVIEW_SAMPLE_FRACTION: 층마다 뽑을 행 비율 (층당 최소 2행)
+# PREVIEW_MIN_ROWS: 필터된 행이 이 수 이상일 때만 미리보기 사용 (작으면 바로 정확히 계산)
+# PREVIEW_POLL_SEC: 정확한 집계가 끝났는지 확인하는 주기 (초, 끝나면 화면을 다시 그린다)
+PREVIEW_SAMPLE_FRACTION = float(os.getenv("PREVIEW_SAMPLE_FRACTION", "0.05"))
+PREVIEW_MIN_ROWS = int(os.getenv("PREVIEW_MIN_ROWS", "200000"))
+PREVIEW_POLL_SEC = float(os.getenv("PREVIEW_POLL_SEC", "1.0"))
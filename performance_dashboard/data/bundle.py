@@ -0,0 +1,384 @@
+"""Precomputed artifact bundle: built offline, memory-mapped by the app.
+
+번들 디렉토리 구조::
+
+    <BUNDLE_DIR>/
+        CURRENT                  # 현재 버전 디렉토리 이름
+        <version>/
+            manifest.json        # 포맷/버전/행 수/날짜 범위/파일 목록
+            dictionaries.json    # 차원별 값 사전 (codes 배열의 인덱스 순서)
+            rows/                # 행 단위 배열 (Date, 지표/파생 지표, 차원 코드 int32,
+                                 #   MetricCube 용 days int32 / metric_matrix 지표 x 행 float64)
+            cube/                # (일자, 차원...) 단위 합계 큐브 (days / 차원 코드 / metric_matrix)
+            rollups/daily/       # 일자별 전체 합계 (days / metric_matrix, 마지막 지표 row_count 는 행 수)
+
+모든 배열은 .npy 로 저장되어 `np.load(mmap_mode="r")` 로 복사 없이 열립니다.
+집계 planner 는 번들 데이터셋의 그룹 패스를 원본 행 대신 cube/ (차원 선택이 없는 전체 / bucket 집계는
+rollups/daily/) 에서 계산하고, Product 기간 합계도 rollups/daily/ 의 구간 합으로 냅니다 (`Bundle.grouped_sum`,
+`Bundle.period_sums`). 원본 행 배열(rows/)은 필터 행 위치, 내보내기, 키오스크 증분 합산 등 행 단위 작업에 씁니다.
+여러 워커 프로세스가 같은 번들을 열면 숫자 배열은 OS 페이지 캐시 한 벌을 공유하고,
+프로세스마다 따로 만드는 것은 차원/날짜 컬럼의 포인터 배열(행당 8바이트)뿐입니다.
+
+버전 교체는 `<BUNDLE_DIR>/.lock` 잠금 파일로 조정합니다. CURRENT 교체와 이전 번들
+정리는 배타 잠금, 워커가 CURRENT 를 읽고 번들을 여는 구간은 공유 잠금을 잡습니다.
+"""
+
+import functools
+import json
+import logging
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: 잠금 없이 동작 (단일 프로세스 배포 가정)
+    fcntl = None
+
+from performance_dashboard.config import DATE_COL, DIMENSIONS, METRICS
+from performance_dashboard.data.cube import cube_from_arrays, epoch_days, open_cube
+from performance_dashboard.data.dataset import SharedDataset, build_shared_dataset
+from performance_dashboard.data.preprocessor import add_date_columns
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT = 4
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = ".lock"
+PUBLISHER_LOCK_FILE = ".publisher.lock"
+# 일별 롤업의 행 수 컬럼 (Product 기간 행 수)
+ROW_COUNT = "row_count"
+
+
+@dataclass(frozen=True)
+class Bundle:
+    """열려 있는 번들 (manifest 와 차원 사전, 배열은 필요할 때 mmap)"""
+
+    path: Path
+    manifest: dict
+    dictionaries: dict
+
+    @property
+    def version(self) -> str:
+        return self.manifest["version"]
+
+    def array(self, name: str) -> np.ndarray:
+        """번들 배열을 읽기 전용 memory-map 으로 연다 (예: "cube/metric_matrix")"""
+        return np.load(self.path / f"{name}.npy", mmap_mode="r")
+
+    @functools.cached_property
+    def aggregate_cube(self):
+        """(일자, 차원...) 단위 합계 큐브 (MetricCube, 행 = 빌드 때 합친 조합)"""
+        return cube_from_arrays(
+            days=self.array("cube/days"),
+            codes={dim: self.array(f"cube/{dim}") for dim in self.manifest["dimensions"]},
+            dictionaries=self.dictionaries,
+            values=self.array("cube/metric_matrix"),
+            metrics=self.manifest["metrics"],
+            integer=self.manifest["integer_metrics"],
+        )
+
+    @functools.cached_property
+    def daily_cube(self):
+        """일자별 전체 합계 큐브 (차원 없음, 마지막 지표 ROW_COUNT 는 원본 행 수)"""
+        return cube_from_arrays(
+            days=self.array("rollups/daily/days"),
+            codes={},
+            dictionaries={},
+            values=self.array("rollups/daily/metric_matrix"),
+            metrics=self.manifest["metrics"] + [ROW_COUNT],
+            integer=self.manifest["integer_metrics"] + [ROW_COUNT],
+        )
+
+    def grouped_sum(self, state, grain, cols):
+        """필터 상태의 grain 별 cols 합계 (MetricCube.grouped_sum 과 같은 결과, 원본 행을 훑지 않음)
+
+        차원 선택이 없고 grain 이 bucket 뿐이거나 전체 합계면 일별 롤업, 아니면 (일자, 차원...) 큐브에서 계산합니다.
+        """
+        rollup = not state.selections() and set(grain) <= {"bucket"}
+        cube = self.daily_cube if rollup else self.aggregate_cube
+        return cube.grouped_sum(cube.filter_rows(state), tuple(grain), list(cols), state.granularity)
+
+    def period_sums(self, ranges, cols) -> pd.DataFrame:
+        """(시작일, 종료일) 구간별 원본 행 수(rows)와 cols 합계 (MetricCube.period_sums 와 같은 형태)"""
+        sums = self.daily_cube.period_sums(ranges, list(cols) + [ROW_COUNT])
+        sums["rows"] = sums.pop(ROW_COUNT)
+        return sums
+
+
+@contextmanager
+def bundle_lock(root, exclusive: bool = False, blocking: bool = True, name: str = LOCK_FILE):
+    """번들 디렉토리 잠금 (교체/정리는 배타, 열기는 공유)
+
+    blocking=False 이고 다른 프로세스가 잡고 있으면 BlockingIOError 를 발생시킵니다.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / name, "a+") as f:
+        if fcntl is not None:
+            flags = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+            fcntl.flock(f.fileno(), flags if blocking else flags | fcntl.LOCK_NB)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def content_digest(version: str) -> str:
+    """버전 문자열의 내용 해시 부분 ("<시각>-<해시>")"""
+    return version.rsplit("-", 1)[-1]
+
+
+def _group_sum(keys: np.ndarray, values: np.ndarray):
+    """keys(행 x k) 별 values(행 x m) 합계 → (고유 keys, 합계)"""
+    uniq, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    sums = np.column_stack([
+        np.bincount(inverse, weights=values[:, j], minlength=len(uniq)) for j in range(values.shape[1])
+    ]) if len(uniq) else np.zeros((0, values.shape[1]))
+    return uniq, sums
+
+
+def _json_value(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _write_json(path: Path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1, default=str)
+
+
+def write_bundle(dataset: SharedDataset, root) -> Path:
+    """공유 데이터셋을 버전 디렉토리로 저장하고 CURRENT 를 교체"""
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    frame = dataset.frame
+    target = root / dataset.version
+    tmp = root / f".tmp-{dataset.version}-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    for sub in ("rows", "cube", "rollups/daily"):
+        (tmp / sub).mkdir(parents=True)
+
+    # 행 단위 배열 (숫자 컬럼은 파생 지표까지 저장해 워커가 다시 계산하지 않게 한다)
+    np.save(tmp / "rows" / f"{DATE_COL}.npy", frame[DATE_COL].to_numpy("datetime64[ns]"))
+    metrics = np.column_stack([frame[m].to_numpy(np.float64) for m in METRICS])
+    numeric = [c for c in frame.columns if c != DATE_COL and frame[c].dtype.kind in "biuf"]
+    for name in numeric:
+        np.save(tmp / "rows" / f"{name}.npy", frame[name].to_numpy())
+    dictionaries, codes = {}, {}
+    for dim in DIMENSIONS:
+        dim_codes, uniques = pd.factorize(frame[dim], sort=False)
+        codes[dim] = dim_codes.astype(np.int32)
+        dictionaries[dim] = [_json_value(u) for u in uniques.tolist()]
+        np.save(tmp / "rows" / f"{dim}.npy", codes[dim])
+
+    # MetricCube 배열 (워커가 memory-map 으로 그대로 연다)
+    days = epoch_days(frame[DATE_COL])
+    np.save(tmp / "rows" / "days.npy", days)
+    np.save(tmp / "rows" / "metric_matrix.npy", np.ascontiguousarray(metrics.T))
+
+    # (일자, 차원...) 큐브 (날짜 오름차순: 날짜 범위를 이진 탐색으로 자른다)
+    keys, sums = _group_sum(np.column_stack([days] + [codes[d] for d in DIMENSIONS]), metrics)
+    np.save(tmp / "cube" / "days.npy", keys[:, 0].astype(np.int32))
+    for i, dim in enumerate(DIMENSIONS, start=1):
+        np.save(tmp / "cube" / f"{dim}.npy", keys[:, i].astype(np.int32))
+    np.save(tmp / "cube" / "metric_matrix.npy", np.ascontiguousarray(sums.T))
+
+    # 일별 롤업 (지표 합계 + 행 수)
+    daily_keys, daily_sums = _group_sum(days.reshape(-1, 1), np.column_stack([metrics, np.ones(len(days))]))
+    np.save(tmp / "rollups" / "daily" / "days.npy", daily_keys[:, 0].astype(np.int32))
+    np.save(tmp / "rollups" / "daily" / "metric_matrix.npy", np.ascontiguousarray(daily_sums.T))
+
+    _write_json(tmp / "dictionaries.json", dictionaries)
+    _write_json(tmp / "manifest.json", {
+        "format": BUNDLE_FORMAT,
+        "version": dataset.version,
+        "created_at": pd.Timestamp.now(tz="Asia/Seoul").isoformat(),
+        "rows": int(len(frame)),
+        "cube_rows": int(len(keys)),
+        "date_min": str(frame["date"].min()) if len(frame) else None,
+        "date_max": str(frame["date"].max()) if len(frame) else None,
+        "columns": list(frame.columns),
+        "numeric_columns": numeric,
+        "dimensions": DIMENSIONS,
+        "metrics": METRICS,
+        "integer_metrics": [m for m in METRICS if frame[m].dtype.kind in "biu"],
+        "files": sorted(str(p.relative_to(tmp)) for p in tmp.rglob("*") if p.is_file()),
+    })
+
+    with bundle_lock(root, exclusive=True):
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(tmp, target)
+        set_current_bundle(root, dataset.version)
+    return target
+
+
+def set_current_bundle(root, version: str):
+    """CURRENT 포인터를 원자적으로 교체"""
+    root = Path(root)
+    tmp = root / f".{CURRENT_FILE}.{os.getpid()}"
+    tmp.write_text(version, encoding="utf-8")
+    os.replace(tmp, root / CURRENT_FILE)
+
+
+def current_bundle_version(root):
+    """CURRENT 가 가리키는 번들 버전 (번들이 없으면 None)"""
+    if root is None:
+        return None
+    pointer = Path(root) / CURRENT_FILE
+    try:
+        version = pointer.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    if not version or not (Path(root) / version / "manifest.json").exists():
+        return None
+    return version
+
+
+def prune_bundles(root, keep: int = 3):
+    """CURRENT 를 제외하고 오래된 번들 정리 (최신 keep 개 유지)
+
+    이미 열어 둔 워커의 memory-map 은 파일이 지워져도 유효합니다 (POSIX).
+    """
+    root = Path(root)
+    with bundle_lock(root, exclusive=True):
+        current = current_bundle_version(root)
+        versions = sorted(p for p in root.iterdir() if p.is_dir() and (p / "manifest.json").exists())
+        old = [p for p in versions if p.name != current]
+        old = old[:len(old) - keep] if keep > 0 else old
+        for path in old:
+            shutil.rmtree(path, ignore_errors=True)
+    return [p.name for p in old]
+
+
+def _date_columns(dates: np.ndarray) -> tuple:
+    """날짜 파생 컬럼을 고유 시각 단위로 계산 → ({컬럼: 고유값 배열}, 행별 인덱스)"""
+    uniq, index = np.unique(dates, return_inverse=True)
+    small = pd.DataFrame({DATE_COL: uniq})
+    add_date_columns(small)
+    derived = {c: small[c].to_numpy(object) for c in small.columns if c != DATE_COL}
+    return derived, index.reshape(-1)
+
+
+def open_bundle(path) -> SharedDataset:
+    """번들을 memory-map 으로 열어 공유 데이터셋 생성 (지표/날짜 배열은 복사하지 않음)"""
+    path = Path(path)
+    with open(path / "manifest.json", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise ValueError(f"지원하지 않는 번들 포맷: {manifest.get('format')} (필요: {BUNDLE_FORMAT})")
+    with open(path / "dictionaries.json", encoding="utf-8") as f:
+        dictionaries = json.load(f)
+    bundle = Bundle(path=path, manifest=manifest, dictionaries=dictionaries)
+
+    dates = bundle.array(f"rows/{DATE_COL}")
+    date_columns, date_index = _date_columns(dates)
+    columns = {}
+    for name in manifest["columns"]:
+        if name == DATE_COL:
+            columns[name] = dates
+        elif name in DIMENSIONS:
+            # 코드 -1 (결측) 은 사전 끝에 붙인 NaN 으로 매핑
+            values = np.array(dictionaries[name] + [np.nan], dtype=object)
+            columns[name] = values[bundle.array(f"rows/{name}")]
+        elif name in date_columns:
+            # 같은 날짜 객체를 행끼리 공유 (행마다 객체를 만들지 않음)
+            columns[name] = date_columns[name][date_index]
+        else:
+            columns[name] = bundle.array(f"rows/{name}")
+    frame = pd.DataFrame(columns, copy=False)
+    cube = open_cube(path)
+    return build_shared_dataset(frame, version=bundle.version, bundle=bundle, cube=cube)
+
+
+def open_current_bundle(root):
+    """CURRENT 번들을 공유 잠금 아래에서 연다 (번들이 없으면 None)"""
+    if root is None or not Path(root).exists():
+        return None
+    with bundle_lock(root):
+        version = current_bundle_version(root)
+        if version is None:
+            return None
+        return open_bundle(Path(root) / version)
+
+
+def load_source_frame(source_file=None) -> pd.DataFrame:
+    """번들 빌드용 원본 (파일 지정 시 CSV/Parquet, 아니면 구글 시트)"""
+    if source_file:
+        if str(source_file).endswith(".parquet"):
+            return pd.read_parquet(source_file)
+        return pd.read_csv(source_file)
+    from performance_dashboard.config import SHEET_URL, SHEET_NAME, CREDENTIALS_FILE
+    from performance_dashboard.data.gspread_reader import read_google_sheet_to_df
+    return read_google_sheet_to_df(SHEET_URL, SHEET_NAME, CREDENTIALS_FILE)
+
+
+def _bundle_format(path):
+    try:
+        with open(Path(path) / "manifest.json", encoding="utf-8") as f:
+            return json.load(f).get("format")
+    except (OSError, ValueError):
+        return None
+
+
+def build_bundle(root, source_file=None, keep: int = 3, skip_unchanged: bool = False) -> dict:
+    """원본 로드 → 전처리 → 번들 저장 → CURRENT 교체 → 오래된 번들 정리
+
+    skip_unchanged=True 이면 내용 해시가 CURRENT 와 같을 때 저장하지 않습니다
+    (CURRENT 가 이전 번들 포맷이면 내용이 같아도 다시 저장).
+    """
+    from performance_dashboard.data.preprocessor import preprocess_frame
+
+    timings = {}
+    t0 = time.perf_counter()
+    raw = load_source_frame(source_file)
+    if raw is None or raw.empty:
+        raise ValueError("원본 데이터를 가져올 수 없습니다. 인증/권한 또는 파일 경로를 확인하세요.")
+    timings["load"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    dataset = build_shared_dataset(preprocess_frame(raw))
+    timings["preprocess"] = time.perf_counter() - t0
+
+    current = current_bundle_version(root)
+    if (skip_unchanged and current is not None and content_digest(current) == content_digest(dataset.version)
+            and _bundle_format(Path(root) / current) == BUNDLE_FORMAT):
+        return {"version": current, "path": str(Path(root) / current), "rows": len(dataset.frame),
+                "pruned": [], "timings": timings, "skipped": True}
+
+    t0 = time.perf_counter()
+    path = write_bundle(dataset, root)
+    timings["write"] = time.perf_counter() - t0
+
+    pruned = prune_bundles(root, keep=keep)
+    return {"version": dataset.version, "path": str(path), "rows": len(dataset.frame), "pruned": pruned, "timings": timings,
+            "skipped": False}
+
+
+def publish_loop(root, interval: float, source_file=None, keep: int = 3, once: bool = False):
+    """주기적으로 번들을 빌드해 게시 (BUNDLE_DIR 당 게시 프로세스 하나만 실행)
+
+    다른 게시 프로세스가 이미 실행 중이면 BlockingIOError 를 발생시킵니다.
+    내용이 바뀌지 않았으면 새 버전을 만들지 않으므로 워커는 교체 없이 계속 사용합니다.
+    """
+    with bundle_lock(root, exclusive=True, blocking=False, name=PUBLISHER_LOCK_FILE):
+        while True:
+            try:
+                result = build_bundle(root, source_file=source_file, keep=keep, skip_unchanged=True)
+                logger.info("bundle %s %s (%d rows)", result["version"],
+                            "unchanged" if result["skipped"] else "published", result["rows"])
+            except Exception as e:
+                # 실패해도 기존 CURRENT 번들은 그대로 유지된다
+                logger.warning("bundle publish failed: %s", e)
+            if once:
+                return
+            time.sleep(interval)
@@ -0,0 +1,298 @@
+"""Array-backed metric cube with bincount group-by kernels."""
+
+import datetime
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from performance_dashboard.config import DATE_COL, DIMENSIONS, METRICS
+
+EPOCH = datetime.date(1970, 1, 1)
+# 조합 키 공간이 (행 수 x 이 배수) 이하이면 조밀한 bincount, 넘으면 np.unique 로 압축
+DENSE_FACTOR = 4
+
+
+def epoch_days(dates) -> np.ndarray:
+    """datetime64 배열/Series → 1970-01-01 기준 일수 (int32)"""
+    return np.asarray(dates, dtype="datetime64[ns]").astype("datetime64[D]").astype(np.int64).astype(np.int32)
+
+
+def _freeze(array: np.ndarray) -> np.ndarray:
+    if array.flags.writeable:
+        array.flags.writeable = False
+    return array
+
+
+def _sort_ranks(dictionary: np.ndarray) -> np.ndarray:
+    """사전 코드 → 값 정렬 순위 (마지막 칸은 결측 코드용, 항상 맨 뒤)"""
+    ranks = np.empty(len(dictionary) + 1, dtype=np.int64)
+    ranks[np.argsort(dictionary, kind="stable")] = np.arange(len(dictionary))
+    ranks[-1] = len(dictionary)
+    return ranks
+
+
+@dataclass(frozen=True, eq=False)
+class MetricCube:
+    """고정 스키마(DIMENSIONS x METRICS) 행 단위 배열 구조
+
+    pandas groupby 대신 정수 코드 조합 + np.bincount / np.add.reduceat 으로 합계를 냅니다.
+
+    Attributes:
+        days: 행별 날짜 (1970-01-01 기준 일수, int32)
+        codes: 차원별 값 코드 (int32, -1 은 결측) — dictionaries[dim] 의 인덱스
+        dictionaries: 차원별 값 사전 (object 배열, 순서는 임의)
+        ranks: 차원별 코드 → 정렬 순위 (결과를 pandas groupby 와 같은 순서로 정렬)
+        values: 지표 행렬 (지표 x 행, float64, 지표마다 연속 메모리)
+        metrics: values 의 행 순서에 해당하는 지표 이름
+        integer: 원본이 정수형인 지표 (합계를 int64 로 돌려준다)
+        days_sorted: days 가 오름차순인지 (날짜 범위를 이진 탐색으로 자른다)
+    """
+
+    days: np.ndarray
+    codes: dict
+    dictionaries: dict
+    ranks: dict
+    values: np.ndarray
+    metrics: tuple
+    integer: frozenset
+    days_sorted: bool
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.days)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.days.nbytes + self.values.nbytes + sum(c.nbytes for c in self.codes.values()))
+
+    def supports(self, grain, cols) -> bool:
+        """이 큐브로 계산할 수 있는 집계인지 (grain 은 bucket/차원, cols 는 큐브 지표)"""
+        return all(g == "bucket" or g in self.codes for g in grain) and all(c in self.metrics for c in cols)
+
+    def filter_rows(self, state) -> np.ndarray:
+        """필터 상태에 해당하는 행 위치 (view.filter_rows 와 같은 결과)"""
+        return self.filter_range(state.start, state.end, state.selections())
+
+    def filter_range(self, start_date, end_date, selections: dict) -> np.ndarray:
+        """날짜 범위(양 끝 포함) + 차원 선택값에 해당하는 행 위치"""
+        mask, days_slice = self._range_mask(start_date, end_date, selections)
+        if mask is None:
+            return np.arange(days_slice.start, days_slice.stop, dtype=np.int64)
+        return np.flatnonzero(mask) + (days_slice.start or 0)
+
+    def count_range(self, start_date, end_date, selections: dict) -> int:
+        """filter_range 의 행 수 (행 위치 배열을 만들지 않는다)"""
+        mask, days_slice = self._range_mask(start_date, end_date, selections)
+        if mask is None:
+            return days_slice.stop - days_slice.start
+        return int(np.count_nonzero(mask))
+
+    def _range_mask(self, start_date, end_date, selections: dict) -> tuple:
+        """(days_slice 안의 행 마스크 또는 None(구간 전체), days_slice)"""
+        start = (start_date - EPOCH).days
+        end = (end_date - EPOCH).days
+        if self.days_sorted:
+            lo, hi = np.searchsorted(self.days, [start, end + 1])
+            mask = None
+            days_slice = slice(int(lo), int(hi))
+        else:
+            mask = (self.days >= start) & (self.days <= end)
+            days_slice = slice(None)
+        for dim, values in selections.items():
+            allowed = np.flatnonzero(np.isin(self.dictionaries[dim].astype(str), list(values)))
+            dim_mask = np.isin(self.codes[dim][days_slice], allowed)
+            mask = dim_mask if mask is None else mask & dim_mask
+        return mask, days_slice
+
+    def _bucket_codes(self, days: np.ndarray, granularity: str) -> tuple:
+        """행별 bucket 코드와 코드별 bucket 시작일 (add_time_bucket 과 같은 값)"""
+        if not len(days):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype="datetime64[D]")
+        first, last = int(days.min()), int(days.max())
+        span = np.arange(first, last + 1, dtype=np.int64)
+        if granularity == "Daily":
+            starts = span.astype("datetime64[D]")
+        elif granularity == "Weekly":
+            # 1970-01-01 은 목요일 → (일수 + 3) % 7 이 월요일부터의 경과 일수
+            starts = (span - (span + 3) % 7).astype("datetime64[D]")
+        else:
+            starts = span.astype("datetime64[D]").astype("datetime64[M]").astype("datetime64[D]")
+        labels, table = np.unique(starts, return_inverse=True)
+        return table.reshape(-1)[days - first], labels
+
+    def grouped_sum(self, rows: np.ndarray, grain: tuple, cols, granularity: str = "Daily"):
+        """rows(오름차순 행 위치) 의 grain 별 cols 합계
+
+        planner 의 pandas 루트 패스와 같은 결과를 돌려줍니다: grain 이 비면 합계 Series,
+        아니면 grain 컬럼 + 합계 컬럼 DataFrame (결측 키 포함, 키 오름차순 / 결측은 마지막).
+        """
+        cols = list(cols)
+        # 전체 행이면 지표 행을 복사 없이, 아니면 지표마다 필요한 행만 모은다
+        full = len(rows) == self.n_rows
+        sub = [self.values[self.metrics.index(c)] for c in cols]
+        if not full:
+            sub = [w.take(rows) for w in sub]
+        if not grain:
+            return self._typed(pd.Series([w.sum() for w in sub], index=cols, dtype=np.float64))
+
+        # grain 키를 하나의 정수 조합 키로 (결측 코드는 각 차원의 마지막 칸)
+        composite = np.zeros(len(rows), dtype=np.int64)
+        cards, labels = [], []
+        for g in grain:
+            if g == "bucket":
+                code, label = self._bucket_codes(self.days if full else self.days.take(rows), granularity)
+                card = len(label)
+            else:
+                code = (self.codes[g] if full else self.codes[g].take(rows)).astype(np.int64)
+                card = len(self.dictionaries[g]) + 1
+                code[code < 0] = card - 1
+                label = None
+            composite = composite * card + code
+            cards.append(card)
+            labels.append(label)
+
+        space = int(np.prod(cards, dtype=np.float64))
+        if len(grain) == 1 and (len(composite) < 2 or bool(np.all(composite[1:] >= composite[:-1]))):
+            # 날짜순 정렬된 행의 bucket 처럼 키가 이미 정렬돼 있으면 구간 합 한 번
+            starts = np.flatnonzero(np.r_[True, composite[1:] != composite[:-1]]) if len(composite) else np.zeros(0, dtype=np.int64)
+            keys = composite[starts]
+            sums = np.vstack([np.add.reduceat(w, starts) for w in sub]) if len(starts) else np.zeros((len(cols), 0))
+        elif space <= DENSE_FACTOR * len(composite) + 1024:
+            keys = np.flatnonzero(np.bincount(composite, minlength=space))
+            sums = np.vstack([np.bincount(composite, weights=w, minlength=space)[keys] for w in sub])
+        else:
+            keys, inverse = np.unique(composite, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            sums = np.vstack([np.bincount(inverse, weights=w, minlength=len(keys)) for w in sub])
+
+        # 조합 키 → grain 별 코드
+        key_codes = []
+        rest = keys
+        for card in reversed(cards):
+            rest, code = np.divmod(rest, card)
+            key_codes.append(code)
+        key_codes.reverse()
+
+        # pandas groupby(sort=True) 와 같은 순서: 값 오름차순, 결측은 마지막
+        order = np.lexsort([
+            code if g == "bucket" else self.ranks[g][code]
+            for g, code in reversed(list(zip(grain, key_codes)))
+        ])
+        out = {}
+        for g, code, label in zip(grain, key_codes, labels):
+            code = code[order]
+            if g == "bucket":
+                out[g] = label[code].astype(object)
+            else:
+                out[g] = np.append(self.dictionaries[g], np.nan).astype(object)[code]
+        frame = pd.DataFrame(out)
+        for c, values in zip(cols, sums[:, order]):
+            frame[c] = values
+        return self._typed(frame)
+
+    def period_sums(self, ranges, cols) -> pd.DataFrame:
+        """(시작일, 종료일) 구간별 행 수(rows)와 cols 합계 (구간 양 끝 포함, 구간 순서대로)"""
+        idx = [self.metrics.index(c) for c in cols]
+        bounds = np.array([((s - EPOCH).days, (e - EPOCH).days + 1) for s, e in ranges], dtype=np.int64).reshape(-1, 2)
+        sums = np.zeros((len(bounds), len(idx)))
+        if self.days_sorted:
+            # 날짜순 행이면 구간마다 연속 구간 합 (마스크를 만들지 않음)
+            positions = np.searchsorted(self.days, bounds)
+            counts = np.maximum(positions[:, 1] - positions[:, 0], 0)
+            for r, (lo, hi) in enumerate(positions):
+                for j, i in enumerate(idx):
+                    sums[r, j] = self.values[i, lo:hi].sum()
+        else:
+            counts = np.zeros(len(bounds), dtype=np.int64)
+            for r, (lo, hi) in enumerate(bounds):
+                mask = (self.days >= lo) & (self.days < hi)
+                counts[r] = int(mask.sum())
+                for j, i in enumerate(idx):
+                    sums[r, j] = self.values[i][mask].sum()
+        frame = pd.DataFrame(sums, columns=list(cols))
+        frame.insert(0, "rows", counts.astype(np.int64))
+        return self._typed(frame)
+
+    def _typed(self, result):
+        """정수형 원본 지표의 합계는 int64 로 (pandas 합계와 같은 dtype)"""
+        if isinstance(result, pd.Series):
+            # 정수/실수가 섞인 합계 Series 는 pandas 와 같이 float64
+            if all(c in self.integer for c in result.index):
+                return result.round().astype(np.int64)
+            return result
+        for c in result.columns:
+            if c in self.integer:
+                result[c] = result[c].round().astype(np.int64)
+        return result
+
+
+def build_metric_cube(frame: pd.DataFrame):
+    """전처리된 프레임으로 큐브 생성 (필수 컬럼이 없으면 None)"""
+    if DATE_COL not in frame.columns or not all(c in frame.columns for c in DIMENSIONS + METRICS):
+        return None
+    days = epoch_days(frame[DATE_COL])
+    codes, dictionaries, ranks = {}, {}, {}
+    for dim in DIMENSIONS:
+        dim_codes, uniques = pd.factorize(frame[dim], sort=True)
+        codes[dim] = _freeze(dim_codes.astype(np.int32))
+        dictionaries[dim] = np.asarray(uniques, dtype=object)
+        ranks[dim] = np.append(np.arange(len(uniques), dtype=np.int64), len(uniques))
+    values = np.empty((len(METRICS), len(frame)), dtype=np.float64)
+    for i, c in enumerate(METRICS):
+        values[i] = frame[c].to_numpy(dtype=np.float64)
+    return cube_from_arrays(days, codes, dictionaries, values, METRICS,
+                            integer=[c for c in METRICS if pd.api.types.is_integer_dtype(frame[c].dtype)],
+                            ranks=ranks)
+
+
+def cube_from_arrays(days, codes, dictionaries, values, metrics, integer=(), ranks=None) -> MetricCube:
+    """이미 만들어진 배열(번들 memory-map 등)로 큐브 생성 (배열은 복사하지 않음)"""
+    dictionaries = {dim: np.asarray(values_, dtype=object) for dim, values_ in dictionaries.items()}
+    if ranks is None:
+        ranks = {dim: _sort_ranks(d) for dim, d in dictionaries.items()}
+    return MetricCube(
+        days=_freeze(days),
+        codes={dim: _freeze(c) for dim, c in codes.items()},
+        dictionaries=dictionaries,
+        ranks=ranks,
+        values=_freeze(values),
+        metrics=tuple(metrics),
+        integer=frozenset(integer),
+        days_sorted=bool(len(days) < 2 or np.all(days[1:] >= days[:-1])),
+    )
+
+
+def save_cube(cube: MetricCube, path):
+    """큐브 배열을 번들과 같은 배치(rows/*.npy + dictionaries.json + manifest.json)로 저장"""
+    path = Path(path)
+    (path / "rows").mkdir(parents=True, exist_ok=True)
+    np.save(path / "rows" / "days.npy", cube.days)
+    for dim, codes in cube.codes.items():
+        np.save(path / "rows" / f"{dim}.npy", codes)
+    np.save(path / "rows" / "metric_matrix.npy", cube.values)
+    with open(path / "dictionaries.json", "w", encoding="utf-8") as f:
+        json.dump({dim: values.tolist() for dim, values in cube.dictionaries.items()}, f, ensure_ascii=False)
+    with open(path / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump({"dimensions": list(cube.codes), "metrics": list(cube.metrics),
+                   "integer_metrics": sorted(cube.integer)}, f, ensure_ascii=False)
+
+
+def open_cube(path) -> MetricCube:
+    """save_cube / 번들 디렉토리의 큐브 배열을 읽기 전용 memory-map 으로 연다"""
+    path = Path(path)
+    with open(path / "manifest.json", encoding="utf-8") as f:
+        manifest = json.load(f)
+    with open(path / "dictionaries.json", encoding="utf-8") as f:
+        dictionaries = json.load(f)
+    dimensions = manifest.get("dimensions", DIMENSIONS)
+    return cube_from_arrays(
+        days=np.load(path / "rows" / "days.npy", mmap_mode="r"),
+        codes={dim: np.load(path / "rows" / f"{dim}.npy", mmap_mode="r") for dim in dimensions},
+        dictionaries={dim: dictionaries[dim] for dim in dimensions},
+        values=np.load(path / "rows" / "metric_matrix.npy", mmap_mode="r"),
+        metrics=manifest["metrics"],
+        integer=manifest["integer_metrics"],
+    )
@@ -0,0 +1,69 @@
+"""Process-wide read-only dataset shared by every session."""
+
+import hashlib
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from performance_dashboard.data import offload
+from performance_dashboard.data.cube import build_metric_cube
+
+
+@dataclass(frozen=True)
+class SharedDataset:
+    """전처리가 끝난 읽기 전용 데이터셋 (프로세스 단위 공유)
+
+    Attributes:
+        frame: 쓰기 금지된 numpy 배열로 구성된 DataFrame
+        version: 데이터 버전 식별자 (로딩 시각 + 내용 해시)
+        loaded_at: 로딩 시각 (KST)
+        nbytes: 컬럼 배열이 차지하는 바이트 수
+        bundle: 사전 계산 번들에서 열었으면 해당 번들 (실시간 계산이면 None)
+        cube: 필터/그룹 합계용 배열 구조 (MetricCube, 필수 컬럼이 없으면 None)
+    """
+
+    frame: pd.DataFrame
+    version: str
+    loaded_at: pd.Timestamp
+    nbytes: int
+    bundle: object = None
+    cube: object = None
+
+
+def freeze_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """모든 컬럼 배열을 쓰기 금지로 고정한 DataFrame 반환
+
+    numpy 배열로 표현되는 컬럼은 복사 없이 `writeable=False` 로 고정하며,
+    이 배열에 대한 제자리 쓰기는 ValueError 를 발생시킵니다.
+    """
+    columns = {}
+    for name in df.columns:
+        values = df[name].to_numpy(copy=False)
+        if isinstance(values, np.ndarray):
+            values.flags.writeable = False
+            columns[name] = values
+        else:
+            # 확장 배열(extension array)은 그대로 둔다
+            columns[name] = df[name].array
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """DataFrame 컬럼 배열의 바이트 수 (object 컬럼은 포인터 크기만 계산)"""
+    return int(df.memory_usage(index=True, deep=False).sum())
+
+
+def build_shared_dataset(df: pd.DataFrame, version: str = None, bundle=None, cube=None) -> SharedDataset:
+    """전처리된 DataFrame 으로 공유 데이터셋 생성 (version 이 없으면 내용 해시로 생성)"""
+    frozen = freeze_frame(df)
+    loaded_at = pd.Timestamp.now(tz="Asia/Seoul")
+    if version is None:
+        digest = hashlib.sha1(pd.util.hash_pandas_object(frozen, index=False).to_numpy().tobytes()).hexdigest()
+        version = f"{loaded_at:%Y%m%d%H%M%S}-{digest[:8]}"
+    if cube is None:
+        cube = build_metric_cube(frozen)
+        # 오프로드 워커가 붙을 수 있게 큐브 배열을 공유 메모리 파일로 옮긴다 (번들은 번들 파일을 공유)
+        if cube is not None and bundle is None and offload.enabled():
+            cube = offload.share_cube(cube, version)
+    return SharedDataset(frame=frozen, version=version, loaded_at=loaded_at, nbytes=frame_nbytes(frozen), bundle=bundle, cube=cube)
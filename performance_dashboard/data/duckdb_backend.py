@@ -0,0 +1,104 @@
+"""Optional DuckDB execution backend for filtered group-by passes."""
+
+import logging
+import threading
+
+import pandas as pd
+
+from performance_dashboard.config import DIMENSIONS, DUCKDB_THREADS
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_tables = {}  # 데이터 버전 -> (DuckDB 연결, Arrow 테이블), 최신 버전만 유지
+
+# 집계 단위별 bucket 식 (add_time_bucket 과 같은 값: 일자 / 주 시작 월요일 / 월 1일)
+BUCKET_SQL = {
+    "Daily": 'CAST("Date" AS DATE)',
+    "Weekly": "CAST(date_trunc('week', \"Date\") AS DATE)",
+    "Monthly": "CAST(date_trunc('month', \"Date\") AS DATE)",
+}
+
+
+def is_available() -> bool:
+    """duckdb 패키지 설치 여부"""
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _arrow_table(frame: pd.DataFrame):
+    """Date / 차원 / 숫자 컬럼만 Arrow 테이블로 (숫자·날짜 배열은 복사 없이 감싼다)"""
+    import pyarrow as pa
+
+    columns = ["Date"] + [c for c in DIMENSIONS if c in frame.columns]
+    columns += [c for c in frame.select_dtypes("number").columns if c not in columns]
+    return pa.table({c: pa.array(frame[c].to_numpy(), from_pandas=True) for c in columns})
+
+
+def _dataset_table(dataset):
+    """데이터 버전별 연결과 Arrow 테이블 (버전당 한 번만 만든다)"""
+    import duckdb
+
+    with _lock:
+        entry = _tables.get(dataset.version)
+        if entry is None:
+            con = duckdb.connect()
+            if DUCKDB_THREADS:
+                con.execute(f"SET threads = {int(DUCKDB_THREADS)}")
+            entry = (con, _arrow_table(dataset.frame))
+            _tables.clear()  # 이전 버전 테이블은 버린다
+            _tables[dataset.version] = entry
+            logger.info("duckdb backend: registered %s (%d rows)", dataset.version, entry[1].num_rows)
+        return entry
+
+
+def _filter_sql(state) -> tuple:
+    """FilterState → WHERE 절과 파라미터 (filter_rows 와 같은 조건)"""
+    where = ['CAST("Date" AS DATE) BETWEEN ? AND ?']
+    params = [state.start, state.end]
+    for dim, values in state.selections().items():
+        where.append(f"CAST({_quote(dim)} AS VARCHAR) IN ({', '.join('?' * len(values))})")
+        params.extend(values)
+    return " AND ".join(where), params
+
+
+def grouped_sum(dataset, state, grain: tuple, cols: list):
+    """필터 + grain 별 합계를 SQL 한 번으로 계산
+
+    planner 의 pandas 루트 패스와 같은 모양을 돌려줍니다: grain 이 비면 합계 Series,
+    아니면 grain 컬럼 + 합계 컬럼 DataFrame (결측 키 포함, 키 오름차순 / 결측은 마지막).
+    """
+    con, table = _dataset_table(dataset)
+    frame = dataset.frame
+    keys = [BUCKET_SQL[state.granularity] if g == "bucket" else _quote(g) for g in grain]
+    sums = []
+    for c in cols:
+        sql_type = "BIGINT" if pd.api.types.is_integer_dtype(frame[c].dtype) else "DOUBLE"
+        sums.append(f"CAST(COALESCE(SUM({_quote(c)}), 0) AS {sql_type}) AS {_quote(c)}")
+    where, params = _filter_sql(state)
+    select = [f"{k} AS {_quote(g)}" for k, g in zip(keys, grain)] + sums
+    sql = f"SELECT {', '.join(select)} FROM dataset WHERE {where}"
+    if grain:
+        positions = ", ".join(str(i) for i in range(1, len(grain) + 1))
+        sql += f" GROUP BY {positions} ORDER BY {', '.join(f'{i} NULLS LAST' for i in range(1, len(grain) + 1))}"
+
+    # 등록한 뷰는 연결 단위이므로 쿼리마다 커서(스레드 안전)에 다시 등록 (복사 없음)
+    cursor = con.cursor()
+    try:
+        cursor.register("dataset", table)
+        out = cursor.execute(sql, params).df()
+    finally:
+        cursor.close()
+
+    if not grain:
+        return out.iloc[0].rename(None)
+    if "bucket" in grain:
+        out["bucket"] = out["bucket"].dt.date
+    return out
@@ -1,20 +1,45 @@
 """Data loading from Google Sheets."""
 
-import pandas as pd
 import streamlit as st
 
+from performance_dashboard.config import BUNDLE_DIR, BUNDLE_ONLY
 from performance_dashboard.data.gspread_reader import read_google_sheet_to_df
+from performance_dashboard.data.bundle import current_bundle_version, open_current_bundle
+from performance_dashboard.data.dataset import SharedDataset, build_shared_dataset
+from performance_dashboard.data.preprocessor import preprocess_frame
 
 
-@st.cache_data(show_spinner=True, ttl=3600, max_entries=1)
-def load_mother_data(sheet_url: str, sheet_name: str, cred_file: str) -> pd.DataFrame:
-    """구글 시트 데이터 로드 (캐시됨)"""
-    df = read_google_sheet_to_df(sheet_url, sheet_name, cred_file)
-    if df is None:
-        return pd.DataFrame()
-    return df
+def _is_current(dataset) -> bool:
+    """캐시된 데이터셋이 여전히 최신인지 (번들이 새로 빌드/삭제되면 교체)"""
+    if dataset is None:
+        return False
+    bundle_version = dataset.bundle.version if dataset.bundle is not None else None
+    return current_bundle_version(BUNDLE_DIR) == bundle_version
+
+
+@st.cache_resource(show_spinner=True, ttl=3600, max_entries=1, validate=_is_current)
+def get_shared_dataset(sheet_url: str, sheet_name: str, cred_file: str) -> SharedDataset:
+    """구글 시트 로드 + 전처리 결과를 프로세스 단위로 공유 (세션마다 복사하지 않음)
+
+    st.cache_data 와 달리 캐시 적중 시 역직렬화 복사본을 만들지 않으며,
+    반환되는 데이터셋의 배열은 쓰기 금지 상태입니다. 원본 시트 데이터는
+    전처리 후 버려지므로 프로세스에는 전처리 결과 한 벌만 남습니다.
+    데이터를 가져오지 못하면 None 을 반환하며, None 은 다음 호출 때 다시 조회합니다.
+
+    BUNDLE_DIR 에 사전 계산 번들이 있으면 시트 대신 번들을 memory-map 으로 엽니다.
+    BUNDLE_ONLY 워커는 번들이 없어도 시트를 읽지 않습니다 (게시 프로세스만 시트 조회).
+    """
+    dataset = open_current_bundle(BUNDLE_DIR)
+    if dataset is not None:
+        return dataset
+    if BUNDLE_ONLY:
+        raise FileNotFoundError(f"게시된 데이터 번들이 없습니다 ({BUNDLE_DIR}). publish 프로세스를 확인하세요.")
+    raw = read_google_sheet_to_df(sheet_url, sheet_name, cred_file)
+    if raw is None or raw.empty:
+        return None
+    return build_shared_dataset(preprocess_frame(raw))
 
 
 def clear_data_cache():
     """데이터 로딩 캐시 초기화"""
-    load_mother_data.clear()
\ No newline at end of file
+    get_shared_dataset.clear()
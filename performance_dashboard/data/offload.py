@@ -0,0 +1,331 @@
+"""Optional worker-process pool for heavy cube aggregations (results as Arrow IPC)."""
+
+import atexit
+import itertools
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from performance_dashboard.config import OFFLOAD_MIN_ROWS, OFFLOAD_SHM_DIR, OFFLOAD_WORKERS
+from performance_dashboard.data.cube import open_cube, save_cube
+
+logger = logging.getLogger(__name__)
+
+# 작업별 취소 플래그 칸 수 (작업 번호 % 칸 수, 제출할 때 0 으로 초기화)
+CANCEL_SLOTS = 4096
+# 결과를 기다리면서 세션의 실행 세대를 확인하는 주기 (초)
+POLL_SEC = 0.05
+# 스크립트 스레드에서 기다릴 때 Streamlit 에 재실행/중지 요청을 처리할 기회를 주는 주기 (초)
+YIELD_SEC = 0.25
+# 세션별 실행 세대 카운터를 두는 session_state 키
+GENERATION_KEY = "offload_generation"
+# 공유 디렉토리에 남겨 둘 데이터 버전 수 (이전 버전을 쓰는 세션이 아직 있을 수 있음)
+KEEP_VERSIONS = 2
+# 워커가 한 번에 훑는 행 수 (구간 사이마다 취소 여부 확인)
+CHUNK_ROWS = 1_000_000
+
+
+class OffloadCancelled(Exception):
+    """세션의 재실행/중지 요청으로 취소된 오프로드 작업"""
+
+
+_lock = threading.Lock()
+_pool = None
+_root = None  # 이 프로세스 전용 공유 디렉토리 (큐브 배열 + 취소 플래그)
+_flags = None
+_paths = {}  # 데이터 버전 -> 워커가 열 큐브 디렉토리 (시트에서 로딩한 데이터셋)
+_tasks = itertools.count()
+
+
+def enabled() -> bool:
+    """오프로드 사용 여부 (OFFLOAD_WORKERS > 0)"""
+    return OFFLOAD_WORKERS > 0
+
+
+def _shared_root() -> Path:
+    global _root
+    if _root is None:
+        base = OFFLOAD_SHM_DIR or ("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir())
+        _root = Path(tempfile.mkdtemp(prefix="perfdash-offload-", dir=base))
+        atexit.register(shutil.rmtree, _root, True)
+    return _root
+
+
+def share_cube(cube, version: str):
+    """큐브 배열을 공유 디렉토리(tmpfs)로 옮기고 그 파일을 memory-map 으로 연 큐브를 돌려준다
+
+    워커 프로세스는 같은 파일을 열어 페이지 한 벌을 공유합니다 (앱 프로세스도 원래 배열 대신
+    이 파일을 쓰므로 복사본이 남지 않는다). 오래된 버전 디렉토리는 지웁니다 — 이미 연 memory-map 은
+    파일을 지워도 유지됩니다.
+    """
+    with _lock:
+        root = _shared_root()
+        path = root / version
+        save_cube(cube, path)
+        _paths[version] = path
+        for old in list(_paths)[:-KEEP_VERSIONS]:
+            shutil.rmtree(_paths.pop(old), ignore_errors=True)
+    return open_cube(path)
+
+
+def _cube_path(dataset):
+    """워커가 열 큐브 디렉토리 (번들이면 번들 디렉토리, 없으면 None)"""
+    if dataset.bundle is not None:
+        return dataset.bundle.path
+    return _paths.get(dataset.version)
+
+
+def should_offload(dataset, n_rows: int) -> bool:
+    """n_rows 행을 훑는 큐브 집계를 워커 프로세스로 보낼지"""
+    return (enabled() and dataset.cube is not None and n_rows >= OFFLOAD_MIN_ROWS
+            and _cube_path(dataset) is not None)
+
+
+def _get_pool():
+    global _pool, _flags
+    with _lock:
+        if _pool is None:
+            flags_path = _shared_root() / "cancel.flags"
+            _flags = np.memmap(flags_path, dtype=np.uint8, mode="w+", shape=(CANCEL_SLOTS,))
+            # fork 는 스크립트/서버 스레드 상태까지 복제하므로 spawn 으로 새로 띄운다.
+            # spawn 워커는 앱 스크립트(main.py)를 __mp_main__ 으로 import 만 하고
+            # `if __name__ == "__main__"` 가드 때문에 대시보드는 실행하지 않는다
+            _pool = ProcessPoolExecutor(
+                max_workers=OFFLOAD_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(str(flags_path),),
+            )
+            logger.info("offload: started %d worker processes (%s)", OFFLOAD_WORKERS, _root)
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def current_owner():
+    """현재 스크립트 실행 컨텍스트 (없으면 None)"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    return get_script_run_ctx(suppress_warning=True)
+
+
+class RunGeneration:
+    """세션별 실행 세대 카운터 (session_state 에 하나, 전체 스크립트 실행마다 1 증가)"""
+
+    def __init__(self):
+        self.value = 0
+        self.session_id = uuid.uuid4().hex
+
+
+@dataclass(frozen=True)
+class RunToken:
+    """오프로드 작업을 맡긴 스크립트 실행 (세션의 세대가 바뀌면 그 실행의 작업은 필요 없다)"""
+
+    counter: RunGeneration
+    generation: int
+    thread: threading.Thread  # 스크립트 스레드 (여기서 기다릴 때만 Streamlit 에 요청 처리 기회를 준다)
+
+    @property
+    def session_id(self) -> str:
+        return self.counter.session_id
+
+    def superseded(self) -> bool:
+        """세션이 그 뒤에 다시 실행되었는지 (어느 스레드에서든 읽을 수 있다)"""
+        return self.counter.value != self.generation
+
+
+def _generation() -> RunGeneration:
+    import streamlit as st
+
+    return st.session_state.setdefault(GENERATION_KEY, RunGeneration())
+
+
+def begin_run() -> RunToken:
+    """전체 스크립트 실행 시작: 세션의 세대를 올리고 이번 실행의 토큰을 돌려준다
+
+    이전 실행이 워커 프로세스로 보낸 집계는 세대가 바뀐 것을 보고 취소됩니다.
+    """
+    counter = _generation()
+    counter.value += 1
+    return RunToken(counter, counter.value, threading.current_thread())
+
+
+def run_token() -> RunToken:
+    """세대를 올리지 않은 현재 실행의 토큰 (fragment 재실행용)"""
+    counter = _generation()
+    return RunToken(counter, counter.value, threading.current_thread())
+
+
+def yield_to_rerun(placeholder=None):
+    """스크립트 스레드에서 빈 요소를 내보내 대기 중인 재실행/중지 요청을 Streamlit 이 처리하게 한다
+
+    요청이 있으면 Streamlit 이 여기서 실행을 끝냅니다. 같은 자리를 다시 쓰도록 placeholder 를 돌려준다.
+    """
+    import streamlit as st
+
+    if placeholder is None:
+        return st.empty()
+    placeholder.empty()
+    return placeholder
+
+
+def _run(dataset, owner, fallback, task, *args):
+    """task 를 워커 프로세스에서 실행하고 Arrow 결과를 pandas 로 돌려준다
+
+    기다리는 동안 owner(RunToken) 세션이 다시 실행되면 작업을 취소하고 OffloadCancelled 를 발생시킵니다.
+    스크립트 스레드에서 기다리면 주기적으로 Streamlit 에 재실행 요청을 처리할 기회를 줍니다.
+    워커를 쓸 수 없으면 (프로세스 비정상 종료, 큐브 파일 없음) fallback() 으로 앱 프로세스에서 계산합니다.
+    """
+    slot = next(_tasks) % CANCEL_SLOTS
+    try:
+        pool = _get_pool()
+        _flags[slot] = 0
+        with _lock:
+            future = pool.submit(task, str(_cube_path(dataset)), slot, *args)
+        on_script = owner is not None and owner.thread is threading.current_thread()
+        placeholder, next_yield = None, time.monotonic() + YIELD_SEC
+        try:
+            while True:
+                try:
+                    return _from_arrow(future.result(timeout=POLL_SEC))
+                except FutureTimeout:
+                    if owner is not None and owner.superseded():
+                        raise OffloadCancelled(task.__name__)
+                    if on_script and time.monotonic() >= next_yield:
+                        placeholder = yield_to_rerun(placeholder)
+                        next_yield = time.monotonic() + YIELD_SEC
+        except BaseException:
+            # 취소/재실행: 대기 중이면 빼고, 이미 실행 중이면 워커가 다음 확인 지점에서 멈춘다
+            future.cancel()
+            _flags[slot] = 1
+            raise
+    except BrokenProcessPool as e:
+        logger.warning("offload: worker pool broken (%s), computing in-process", e)
+        _reset_pool()
+    except OSError as e:
+        logger.warning("offload: %s failed (%s), computing in-process", task.__name__, e)
+    return fallback()
+
+
+def grouped_sum(dataset, state, grain: tuple, cols, owner=None):
+    """필터 + grain 별 합계를 워커 프로세스에서 계산 (MetricCube.grouped_sum 과 같은 결과)"""
+    cube = dataset.cube
+    selections = state.selections()
+    return _run(
+        dataset, owner,
+        lambda: cube.grouped_sum(cube.filter_rows(state), grain, cols, state.granularity),
+        _grouped_sum_task, state.start, state.end, selections, tuple(grain), list(cols), state.granularity,
+    )
+
+
+def period_sums(dataset, ranges, cols, owner=None):
+    """날짜 구간별 행 수와 합계를 워커 프로세스에서 계산 (MetricCube.period_sums 와 같은 결과)"""
+    return _run(
+        dataset, owner,
+        lambda: dataset.cube.period_sums(ranges, cols),
+        _period_sums_task, list(ranges), list(cols),
+    )
+
+
+# ---- Arrow 직렬화 ----
+
+def _to_arrow(result):
+    """집계 결과 → (Series 여부, Arrow IPC 스트림 버퍼)"""
+    import pyarrow as pa
+
+    is_series = isinstance(result, pd.Series)
+    frame = result.to_frame().T if is_series else result
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return is_series, sink.getvalue()
+
+
+def _from_arrow(payload):
+    """(Series 여부, Arrow 버퍼) → pandas (결측 키는 pandas groupby 결과와 같이 NaN)"""
+    import pyarrow as pa
+
+    is_series, buffer = payload
+    frame = pa.ipc.open_stream(buffer).read_all().to_pandas(date_as_object=True)
+    for c in frame.columns:
+        if frame[c].dtype == object:
+            frame[c] = frame[c].mask(frame[c].isna(), np.nan)
+    return frame.iloc[0].rename(None) if is_series else frame
+
+
+# ---- 워커 프로세스 ----
+
+_worker_flags = None
+_worker_cubes = {}  # 큐브 디렉토리 -> MetricCube (최근 KEEP_VERSIONS 개)
+
+
+def _init_worker(flags_path):
+    global _worker_flags
+    _worker_flags = np.memmap(flags_path, dtype=np.uint8, mode="r", shape=(CANCEL_SLOTS,))
+
+
+def _check(slot):
+    if _worker_flags is not None and _worker_flags[slot]:
+        raise OffloadCancelled(slot)
+
+
+def _attach(path):
+    """큐브 디렉토리를 memory-map 으로 연다 (워커당 버전별 한 번)"""
+    cube = _worker_cubes.get(path)
+    if cube is None:
+        cube = open_cube(path)
+        _worker_cubes[path] = cube
+        while len(_worker_cubes) > KEEP_VERSIONS:
+            _worker_cubes.pop(next(iter(_worker_cubes)))
+    return cube
+
+
+def _merge_parts(parts, grain, cols):
+    """행 구간별 부분 합계를 하나로 (grouped_sum 과 같은 순서: 키 오름차순, 결측은 마지막)"""
+    if not grain:
+        return sum(parts[1:], parts[0])
+    merged = pd.concat(parts, ignore_index=True)
+    return merged.groupby(list(grain), dropna=False, sort=True)[list(cols)].sum().reset_index()
+
+
+def _grouped_sum_task(path, slot, start, end, selections, grain, cols, granularity):
+    cube = _attach(path)
+    _check(slot)
+    rows = cube.filter_range(start, end, selections)
+    parts = []
+    for i in range(0, max(len(rows), 1), CHUNK_ROWS):
+        _check(slot)
+        parts.append(cube.grouped_sum(rows[i:i + CHUNK_ROWS], grain, cols, granularity))
+    return _to_arrow(parts[0] if len(parts) == 1 else _merge_parts(parts, grain, cols))
+
+
+def _period_sums_task(path, slot, ranges, cols, chunk=8):
+    cube = _attach(path)
+    parts = []
+    for i in range(0, len(ranges), chunk):
+        _check(slot)
+        parts.append(cube.period_sums(ranges[i:i + chunk], cols))
+    result = pd.concat(parts, ignore_index=True) if parts else cube.period_sums([], cols)
+    return _to_arrow(result)
@@ -0,0 +1,194 @@
+"""Per-view aggregation planner: merge section declarations into few grouped passes."""
+
+import functools
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+import pandas as pd
+
+from performance_dashboard.config import AGGREGATION_BACKEND
+from performance_dashboard.data import duckdb_backend, offload
+from performance_dashboard.utils.cache import AGGREGATE_CACHE
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AggregateSpec:
+    """섹션이 선언하는 집계 (행 필터는 뷰의 FilterState 를 따른다)
+
+    Attributes:
+        grain: 그룹 키 컬럼 (빈 튜플이면 전체 합계)
+        columns: 합계를 낼 컬럼
+    """
+
+    grain: tuple
+    columns: tuple
+
+
+@functools.lru_cache(maxsize=None)
+def aggregation_backend() -> str:
+    """실제로 쓰는 집계 백엔드 (duckdb 를 골랐지만 설치되지 않았으면 cube)"""
+    if AGGREGATION_BACKEND == "duckdb":
+        if duckdb_backend.is_available():
+            return "duckdb"
+        logger.warning("AGGREGATION_BACKEND=duckdb 이지만 duckdb 가 설치되지 않아 cube 로 집계합니다")
+    return "pandas" if AGGREGATION_BACKEND == "pandas" else "cube"
+
+
+def pandas_grouped_sum(view, grain: tuple, cols: list):
+    """필터링된 행에서 grain 별 합계 (결측 키 포함, grain 이 비면 합계 Series)"""
+    frame = view.bucketed_frame if "bucket" in grain else view.frame
+    if not grain:
+        return frame[cols].sum()
+    return frame.groupby(list(grain), dropna=False)[cols].sum().reset_index()
+
+
+def plan_passes(specs) -> dict:
+    """spec 들을 실제 그룹 패스 단위로 묶기
+
+    다른 선언의 grain 에 포함되는 grain 은 따로 행을 훑지 않고 더 잘게 나눈
+    패스 결과에서 롤업합니다 (합계는 분해 가능). 같은 패스로 묶인 선언의
+    컬럼은 합집합으로 한 번에 계산합니다.
+
+    Returns:
+        {루트 grain: (컬럼 합집합, [spec, ...])}
+    """
+    grains = []
+    for spec in specs:
+        if not any(set(g) == set(spec.grain) for g in grains):
+            grains.append(spec.grain)
+    roots = [g for g in grains if not any(set(g) < set(other) for other in grains)]
+    passes = {}
+    for spec in specs:
+        root = min((r for r in roots if set(spec.grain) <= set(r)), key=len)
+        cols, members = passes.setdefault(root, ([], []))
+        cols.extend(c for c in spec.columns if c not in cols)
+        members.append(spec)
+    return passes
+
+
+def rollup(base, root: tuple, spec: AggregateSpec):
+    """루트 패스 결과에서 spec 의 grain 으로 재집계
+
+    루트 패스는 결측 키를 남겨 두므로(dropna=False) 전체 합계가 보존되고,
+    spec 의 grain 키가 결측인 행만 여기서 제외합니다 (groupby 기본 동작과 동일).
+    """
+    cols = list(spec.columns)
+    if not root:
+        return base[cols]
+    if not spec.grain:
+        return base[cols].sum()
+    keyed = base.dropna(subset=list(spec.grain))
+    if tuple(spec.grain) == tuple(root):
+        return keyed[list(root) + cols].reset_index(drop=True)
+    return keyed.groupby(list(spec.grain))[cols].sum().reset_index()
+
+
+class AggregationPlanner:
+    """한 뷰(필터 상태)에 대한 섹션 집계 선언을 모아 최소 그룹 패스로 실행
+
+    섹션은 렌더링 전에 `declare()` 로 필요한 집계를 선언하고, `execute()` 가
+    캐시에 없는 선언만 묶어서 계산합니다. 선언하지 않은 집계를 `result()` 로
+    요청하면 그 자리에서 계산합니다 (리포트의 on_demand).
+    섹션 계산 스레드가 동시에 `result()` 를 호출할 수 있으므로 상태 변경은 잠금 안에서 합니다.
+    """
+
+    def __init__(self, view):
+        self.view = view
+        self._lock = threading.RLock()
+        self._declared = []
+        self._results = {}
+        self._counters = {
+            "declared": 0,
+            "from_cache": 0,
+            "planned_passes": 0,
+            "executed_passes": 0,
+            "rollups": 0,
+            "on_demand": 0,
+        }
+
+    def declare(self, grain, columns) -> AggregateSpec:
+        """집계 선언 (grain: 그룹 키, columns: 합계 컬럼)"""
+        spec = AggregateSpec(tuple(grain), tuple(columns))
+        with self._lock:
+            self._counters["declared"] += 1
+            if spec not in self._declared:
+                self._declared.append(spec)
+        return spec
+
+    @property
+    def declared(self) -> tuple:
+        """선언된 집계 (중복 제거, 선언 순서)"""
+        return tuple(self._declared)
+
+    def _spec_key(self, spec):
+        return self.view.cache_key("aggregate", spec.grain, spec.columns)
+
+    def _run_pass(self, root, cols):
+        self._counters["executed_passes"] += 1
+        backend = aggregation_backend()
+        cube = self.view.dataset.cube
+        if backend == "duckdb":
+            return duckdb_backend.grouped_sum(self.view.dataset, self.view.state, root, cols)
+        if backend == "cube" and cube is not None and cube.supports(root, cols):
+            if self.view.dataset.bundle is not None:
+                # 번들: 빌드 때 만든 (일자, 차원) 큐브 / 일별 롤업에서 (원본 행을 훑지 않음)
+                return self.view.dataset.bundle.grouped_sum(self.view.state, root, cols)
+            if offload.should_offload(self.view.dataset, self.view.row_count):
+                return offload.grouped_sum(self.view.dataset, self.view.state, root, cols, owner=self.view.owner)
+            return cube.grouped_sum(self.view.rows, root, cols, self.view.state.granularity)
+        return pandas_grouped_sum(self.view, root, cols)
+
+    def _load_cached(self) -> list:
+        """선언 중 결과가 없는 것은 캐시에서 채우고, 캐시에도 없는 선언 목록 반환"""
+        pending = []
+        for spec in self._declared:
+            if spec in self._results:
+                continue
+            cached = AGGREGATE_CACHE.get(self._spec_key(spec), namespace="aggregate")
+            if cached is not None:
+                self._results[spec] = cached
+                self._counters["from_cache"] += 1
+            else:
+                pending.append(spec)
+        return pending
+
+    def ready(self) -> bool:
+        """선언한 집계가 모두 계산돼 있는지 (캐시에 있는 결과는 채우고, 새로 계산하지는 않는다)"""
+        with self._lock:
+            return not self._load_cached()
+
+    def execute(self):
+        """선언된 집계 중 결과가 없는 것을 계산"""
+        with self._lock:
+            pending = self._load_cached()
+            passes = plan_passes(pending)
+            self._counters["planned_passes"] += len(passes)
+            for root, (cols, members) in passes.items():
+                base = self.view.cached("aggregate_pass", lambda: self._run_pass(root, cols), root, tuple(cols))
+                for spec in members:
+                    t0 = time.perf_counter()
+                    value = rollup(base, root, spec)
+                    AGGREGATE_CACHE.put(self._spec_key(spec), value, cost=time.perf_counter() - t0, namespace="aggregate")
+                    self._results[spec] = value
+                    self._counters["rollups"] += 1
+
+    def result(self, grain, columns):
+        """선언한 집계 결과 (호출자가 수정해도 되도록 복사본)"""
+        spec = AggregateSpec(tuple(grain), tuple(columns))
+        with self._lock:
+            if spec not in self._results:
+                if spec not in self._declared:
+                    self._counters["on_demand"] += 1
+                    self.declare(grain, columns)
+                self.execute()
+            value = self._results[spec]
+        return value.copy() if isinstance(value, (pd.DataFrame, pd.Series)) else value
+
+    def report(self) -> dict:
+        """선언 수 / 계획된 패스 / 실제 실행된 패스 / 캐시 적중 / 롤업 / 즉석 계산 횟수"""
+        with self._lock:
+            return dict(self._counters)
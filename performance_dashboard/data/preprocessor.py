@@ -2,30 +2,13 @@
 
 import pandas as pd
 import numpy as np
-import streamlit as st
 
 from performance_dashboard.config import DATE_COL, METRICS, REQUIRED_COLS
 from performance_dashboard.utils.helpers import safe_divide
 
 
-@st.cache_data(show_spinner=False, max_entries=1)
-def preprocess_df(df: pd.DataFrame) -> pd.DataFrame:
-    """데이터 전처리 및 파생 지표 계산"""
-    df = df.copy()
-    missing = [c for c in REQUIRED_COLS if c not in df.columns]
-    if missing:
-        raise ValueError(f"필수 컬럼 누락: {missing}")
-
-    # Date 처리
-    df[DATE_COL] = pd.to_datetime(df[DATE_COL], errors="coerce")
-    df = df.dropna(subset=[DATE_COL])
-    df.sort_values(DATE_COL, inplace=True)
-
-    # 숫자형 캐스팅
-    for c in METRICS:
-        df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
-
-    # 파생 지표
+def add_derived_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """행 단위 파생 지표 추가 (제자리)"""
     df["CTR"] = safe_divide(df["clicks"], df["impressions"])
     df["CPC"] = safe_divide(df["cost"], df["clicks"])
     df["CPI"] = safe_divide(df["cost"], df["installs"])
@@ -42,11 +25,39 @@ def preprocess_df(df: pd.DataFrame) -> pd.DataFrame:
     df["CAC_create_account_7d"] = safe_divide(df["cost"], df["create_account_7d"])
     df["CPS_deposit_30d"] = safe_divide(df["cost"], df["deposit_30d"])
     df["Offering_ROI_30d"] = safe_divide(df["initial_offering_revenue_30d"], df["cost"])
+    return df
 
-    # 날짜 파생
+
+def add_date_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """date / week / month 파생 컬럼 추가 (제자리)"""
     df["date"] = df[DATE_COL].dt.date
-    df["week"] = df[DATE_COL].dt.to_period("W").apply(lambda r: r.start_time.date())
+    # 주 시작일(월요일) = to_period("W").start_time 과 동일, 행 단위 apply 없이 계산
+    day = df[DATE_COL].dt.normalize()
+    df["week"] = (day - pd.to_timedelta(day.dt.weekday, unit="D")).dt.date
     df["month"] = df[DATE_COL].dt.to_period("M").astype(str)
-
     return df
 
+
+def preprocess_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """데이터 전처리 및 파생 지표 계산 (캐시 없음)"""
+    df = df.copy()
+    missing = [c for c in REQUIRED_COLS if c not in df.columns]
+    if missing:
+        raise ValueError(f"필수 컬럼 누락: {missing}")
+
+    # Date 처리
+    df[DATE_COL] = pd.to_datetime(df[DATE_COL], errors="coerce")
+    df = df.dropna(subset=[DATE_COL])
+    df.sort_values(DATE_COL, inplace=True)
+
+    # 숫자형 캐스팅
+    for c in METRICS:
+        df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
+
+    # 파생 지표
+    add_derived_metrics(df)
+
+    # 날짜 파생
+    add_date_columns(df)
+
+    return df
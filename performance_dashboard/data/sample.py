@@ -0,0 +1,166 @@
+"""Stratified row sample of the shared dataset for approximate previews."""
+
+import hashlib
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from performance_dashboard.config import METRICS, PREVIEW_SAMPLE_FRACTION
+from performance_dashboard.data.dataset import SharedDataset, build_shared_dataset
+
+# 95% 신뢰구간 (정규 근사)
+PREVIEW_Z = 1.96
+# 층마다 최소 표본 수 (층 분산을 추정하려면 2개 이상 필요)
+MIN_STRATUM_SAMPLE = 2
+
+_lock = threading.Lock()
+_samples = {}  # 원본 데이터 버전 -> StratifiedSample (최신 버전만 유지)
+_by_sample_version = {}  # 표본 데이터셋 버전 -> StratifiedSample
+
+
+@dataclass(frozen=True)
+class StratifiedSample:
+    """source x 일자 층별 단순임의표본 (층마다 같은 비율로 비복원 추출)
+
+    Attributes:
+        dataset: 표본 행으로 만든 데이터셋 — 합계 지표는 가중치(N_h / n_h)를 곱해 두었으므로
+            필터/집계 결과가 그대로 원본 합계의 추정값(Horvitz-Thompson)이 된다
+        source_version: 원본 데이터 버전
+        fraction: 추출 비율
+        weights: 표본 행별 가중치 N_h / n_h
+        strata: 표본 행별 층 번호
+        stratum_size: 층별 원본 행 수 N_h
+        stratum_sample: 층별 표본 행 수 n_h
+    """
+
+    dataset: SharedDataset
+    source_version: str
+    fraction: float
+    weights: np.ndarray
+    strata: np.ndarray
+    stratum_size: np.ndarray
+    stratum_sample: np.ndarray
+
+
+def build_sample(dataset: SharedDataset, fraction: float = PREVIEW_SAMPLE_FRACTION) -> StratifiedSample:
+    """큐브의 일자 / source 코드로 층을 나눠 표본 데이터셋 생성 (데이터 버전마다 같은 표본)"""
+    cube = dataset.cube
+    source = cube.codes["source"].astype(np.int64) + 1  # 결측(-1)도 하나의 층
+    key = (cube.days.astype(np.int64) - int(cube.days.min())) * (int(source.max()) + 1) + source
+    _, strata = np.unique(key, return_inverse=True)
+    strata = strata.reshape(-1)
+    size = np.bincount(strata)
+    take = np.minimum(size, np.maximum(np.rint(size * fraction).astype(np.int64), MIN_STRATUM_SAMPLE))
+
+    # 층 안에서 난수 순서로 앞의 n_h 개 (시드는 데이터 버전에서 만든다)
+    seed = int.from_bytes(hashlib.sha1(dataset.version.encode()).digest()[:8], "little")
+    order = np.lexsort((np.random.default_rng(seed).random(len(strata)), strata))
+    starts = np.concatenate(([0], np.cumsum(size)[:-1]))
+    rank = np.arange(len(order)) - starts[strata[order]]
+    rows = np.sort(order[rank < take[strata[order]]])
+
+    row_strata = strata[rows].astype(np.int32)
+    weights = size[row_strata] / take[row_strata]
+    frame = dataset.frame.take(rows).reset_index(drop=True)
+    for m in METRICS:
+        frame[m] = frame[m].to_numpy(np.float64) * weights
+    sample_dataset = build_shared_dataset(frame, version=f"{dataset.version}~sample{fraction:g}")
+    return StratifiedSample(
+        dataset=sample_dataset,
+        source_version=dataset.version,
+        fraction=fraction,
+        weights=weights,
+        strata=row_strata,
+        stratum_size=size,
+        stratum_sample=take,
+    )
+
+
+def get_sample(dataset: SharedDataset) -> StratifiedSample:
+    """데이터 버전별 표본 (처음 요청할 때 한 번 만든다)"""
+    with _lock:
+        sample = _samples.get(dataset.version)
+        if sample is None:
+            sample = build_sample(dataset)
+            _samples.clear()  # 이전 버전 표본은 버린다
+            _by_sample_version.clear()
+            _samples[dataset.version] = sample
+            _by_sample_version[sample.dataset.version] = sample
+        return sample
+
+
+def sample_of(view):
+    """표본 데이터셋 위의 뷰면 해당 표본, 아니면 None"""
+    return _by_sample_version.get(view.dataset.version)
+
+
+def _estimates(sample: StratifiedSample, rows, groups, n_groups, num, den=None) -> tuple:
+    """그룹별 합계(den 없음) 또는 비율 num/den 의 추정값과 95% 신뢰구간 반폭
+
+    층별 단순임의표본의 합계 분산 Σ N_h²(1 - n_h/N_h) s_h² / n_h 을 그룹(도메인)마다 계산합니다.
+    비율은 z = y - R·x 로 선형화한 합계의 분산을 분모 합계의 제곱으로 나눕니다.
+    """
+    cube = sample.dataset.cube
+    weights = sample.weights[rows]
+    y = cube.values[cube.metrics.index(num)].take(rows)  # 가중치를 곱한 값
+    total_y = np.bincount(groups, weights=y, minlength=n_groups)
+    if den is None:
+        estimate, total_x = total_y, None
+        z = y / weights
+    else:
+        x = cube.values[cube.metrics.index(den)].take(rows)
+        total_x = np.bincount(groups, weights=x, minlength=n_groups)
+        estimate = np.divide(total_y, total_x, out=np.full(n_groups, np.nan), where=total_x > 0)
+        z = (y - estimate[groups] * x) / weights
+
+    n_strata = len(sample.stratum_size)
+    keys, inverse = np.unique(groups.astype(np.int64) * n_strata + sample.strata[rows], return_inverse=True)
+    inverse = inverse.reshape(-1)
+    s1 = np.bincount(inverse, weights=z)
+    s2 = np.bincount(inverse, weights=z * z)
+    group, stratum = np.divmod(keys, n_strata)
+    N = sample.stratum_size[stratum].astype(np.float64)
+    n = sample.stratum_sample[stratum].astype(np.float64)
+    # 층 안에서 도메인 밖 행은 z = 0 으로 보고 층 전체 표본(n_h) 기준 분산을 쓴다
+    s_h2 = np.where(n > 1, (s2 - s1 * s1 / n) / np.maximum(n - 1, 1), 0.0)
+    variance = np.bincount(group, weights=N * N * (1 - n / N) / n * np.maximum(s_h2, 0), minlength=n_groups)
+    half = PREVIEW_Z * np.sqrt(variance)
+    if total_x is not None:
+        half = np.divide(half, total_x, out=np.full(n_groups, np.nan), where=total_x > 0)
+    return estimate, half
+
+
+def total_intervals(view, series: dict):
+    """표본 뷰면 {이름: 전체 합계/비율의 95% 신뢰구간 반폭}, 정확한 뷰면 None
+
+    series: {이름: (분자 지표, 분모 지표 또는 None)}
+    """
+    sample = sample_of(view)
+    if sample is None:
+        return None
+    groups = np.zeros(view.row_count, dtype=np.int64)
+    return {name: float(_estimates(sample, view.rows, groups, 1, num, den)[1][0])
+            for name, (num, den) in series.items()}
+
+
+def bucket_intervals(view, series: dict, label_col: str = "series"):
+    """표본 뷰면 bucket x 이름별 추정값과 95% 신뢰구간 (bucket, label_col, estimate, lower, upper), 아니면 None"""
+    sample = sample_of(view)
+    if sample is None:
+        return None
+    cube = sample.dataset.cube
+    groups, labels = cube._bucket_codes(cube.days.take(view.rows), view.state.granularity)
+    present = np.bincount(groups, minlength=len(labels)) > 0  # 행이 없는 bucket 은 집계 결과에도 없다
+    parts = []
+    for name, (num, den) in series.items():
+        estimate, half = _estimates(sample, view.rows, groups, len(labels), num, den)
+        parts.append(pd.DataFrame({
+            "bucket": labels[present].astype("datetime64[ns]"),
+            label_col: name,
+            "estimate": estimate[present],
+            "lower": (estimate - half)[present],
+            "upper": (estimate + half)[present],
+        }))
+    return pd.concat(parts, ignore_index=True) if parts else None
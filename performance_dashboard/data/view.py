@@ -0,0 +1,213 @@
+"""Filter-state keyed views over the shared dataset."""
+
+import datetime
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from performance_dashboard.config import DIMENSIONS, METRICS
+from performance_dashboard.data.dataset import SharedDataset
+from performance_dashboard.data.planner import AggregationPlanner
+from performance_dashboard.utils.cache import AGGREGATE_CACHE
+from performance_dashboard.utils.helpers import add_time_bucket
+
+ALL_OPTION = "(All)"
+
+
+@dataclass(frozen=True)
+class FilterState:
+    """사이드바 필터 상태의 정규형 (캐시 키로 사용)
+
+    차원 선택값은 정렬된 튜플이며, 빈 튜플은 "(All)" (필터 없음)을 뜻합니다.
+    """
+
+    start: datetime.date
+    end: datetime.date
+    granularity: str
+    source: tuple = ()
+    campaign_name: tuple = ()
+    sub_campaign_name: tuple = ()
+    creative_name: tuple = ()
+
+    @classmethod
+    def from_selections(cls, start, end, granularity, selections: dict) -> "FilterState":
+        """사이드바 멀티셀렉트 값으로 정규화된 상태 생성"""
+        dims = {}
+        for dim in DIMENSIONS:
+            values = selections.get(dim) or []
+            dims[dim] = () if ALL_OPTION in values else tuple(sorted(set(str(v) for v in values)))
+        return cls(start=start, end=end, granularity=granularity, **dims)
+
+    def selections(self) -> dict:
+        """차원별 선택값 (필터 없는 차원은 제외)"""
+        return {dim: getattr(self, dim) for dim in DIMENSIONS if getattr(self, dim)}
+
+    @property
+    def row_key(self) -> tuple:
+        """행 집합을 결정하는 부분 (집계 단위는 행 집합에 영향 없음)"""
+        return (self.start, self.end) + tuple(getattr(self, dim) for dim in DIMENSIONS)
+
+
+def _cached(namespace, key, compute):
+    value = AGGREGATE_CACHE.get(key, namespace=namespace, default=None)
+    if value is None:
+        t0 = time.perf_counter()
+        value = compute()
+        AGGREGATE_CACHE.put(key, value, cost=time.perf_counter() - t0, namespace=namespace)
+    return value
+
+
+def filter_rows(df: pd.DataFrame, state: FilterState) -> np.ndarray:
+    """필터 상태에 해당하는 행 위치(정수 배열) 계산"""
+    mask = (df["date"] >= state.start) & (df["date"] <= state.end)
+    for dim, values in state.selections().items():
+        mask &= df[dim].astype(str).isin(values)
+    return np.flatnonzero(mask.to_numpy())
+
+
+def take_rows(frame: pd.DataFrame, rows: np.ndarray) -> pd.DataFrame:
+    """오름차순 행 위치로 행 선택 (연속 구간이면 복사 없는 slice, 아니면 take)
+
+    slice 는 공유 프레임의 쓰기 금지 배열을 그대로 보므로 제자리 수정은 ValueError 가 납니다.
+    컬럼을 추가하려면 copy(deep=False) 한 뒤 추가합니다.
+    """
+    if len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+        return frame.iloc[rows[0]:rows[-1] + 1]
+    return frame.take(rows)
+
+
+def date_range_rows(dataset: SharedDataset, start: datetime.date, end: datetime.date) -> np.ndarray:
+    """날짜 범위(양 끝 포함)의 행 위치 (큐브가 있으면 날짜순 이진 탐색)"""
+    if dataset.cube is not None:
+        return dataset.cube.filter_range(start, end, {})
+    dates = dataset.frame["date"]
+    return np.flatnonzero(((dates >= start) & (dates <= end)).to_numpy())
+
+
+def dataset_cached(dataset: SharedDataset, name: str, compute, *params):
+    """(데이터 버전, 이름, 파라미터) 키로 결과 캐시 (필터 상태와 무관한 결과용)"""
+    return _cached(name, (name, dataset.version, params), compute)
+
+
+def pending_row_count(dataset: SharedDataset, state: FilterState) -> int:
+    """필터 상태에 해당할 행 수 (적용 전 미리보기용)
+
+    이미 계산한 행 집합이 캐시에 있으면 그 길이, 큐브가 있으면 정수 코드 마스크의 개수만 셉니다
+    (행 위치 배열을 만들거나 캐시에 넣지 않음).
+    """
+    rows = AGGREGATE_CACHE.get(("filter_rows", dataset.version, state.row_key), namespace="filter_rows", default=None)
+    if rows is not None:
+        return len(rows)
+    if dataset.cube is not None:
+        return dataset.cube.count_range(state.start, state.end, state.selections())
+    return len(filter_rows(dataset.frame, state))
+
+
+def dimension_options(dataset: SharedDataset, column: str) -> list:
+    """차원별 선택지 (데이터 버전 단위 캐시, 번들이 있으면 사전에서 읽음)"""
+    def compute():
+        if dataset.bundle is not None:
+            return sorted(str(x) for x in dataset.bundle.dictionaries[column] if x is not None)
+        return sorted(str(x) for x in dataset.frame[column].dropna().unique())
+
+    return _cached("dimension_options", ("dimension_options", dataset.version, column), compute)
+
+
+def date_bounds(dataset: SharedDataset) -> tuple:
+    """데이터의 최소/최대 날짜 (데이터 버전 단위 캐시, 번들이 있으면 manifest 에서 읽음)"""
+    manifest = dataset.bundle.manifest if dataset.bundle is not None else {}
+    if manifest.get("date_min"):
+        return (datetime.date.fromisoformat(manifest["date_min"]), datetime.date.fromisoformat(manifest["date_max"]))
+    return _cached(
+        "date_bounds",
+        ("date_bounds", dataset.version),
+        lambda: (dataset.frame["date"].min(), dataset.frame["date"].max()),
+    )
+
+
+@dataclass
+class DatasetView:
+    """필터 상태 하나에 대한 결과 핸들
+
+    필터링된 행 집합과 섹션 집계를 (데이터 버전, 필터 상태) 키로
+    프로세스 공용 집계 캐시에 저장하므로, 최근에 본 화면으로 돌아가면
+    마스크 계산과 섹션 집계를 다시 하지 않습니다.
+    """
+
+    dataset: SharedDataset
+    state: FilterState
+    rows: np.ndarray
+    _frame: pd.DataFrame = field(default=None, repr=False)
+    _bucketed: pd.DataFrame = field(default=None, repr=False)
+    owner: object = field(default=None, repr=False, compare=False)
+    _planner: AggregationPlanner = field(default=None, repr=False)
+
+    @property
+    def row_count(self) -> int:
+        return len(self.rows)
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """필터링된 행 (rerun 당 한 번만 만든다, 날짜 필터만 있으면 복사 없는 slice)"""
+        if self._frame is None:
+            self._frame = take_rows(self.dataset.frame, self.rows)
+        return self._frame
+
+    @property
+    def bucketed_frame(self) -> pd.DataFrame:
+        """bucket 컬럼이 추가된 필터링 행 (rerun 당 한 번만 만든다)"""
+        if self._bucketed is None:
+            self._bucketed = add_time_bucket(self.frame, self.state.granularity)
+        return self._bucketed
+
+    @property
+    def key(self) -> tuple:
+        """(데이터 버전, 필터 상태): 이 뷰에서 파생된 결과의 캐시 키"""
+        return (self.dataset.version, self.state)
+
+    def cache_key(self, name, *params) -> tuple:
+        """(데이터 버전, 필터 상태, 이름, 파라미터) 캐시 키"""
+        return ("view", self.dataset.version, self.state, name, params)
+
+    def cached(self, name, compute, *params):
+        """(데이터 버전, 필터 상태, 이름, 파라미터) 키로 결과 캐시"""
+        return _cached(name, self.cache_key(name, *params), compute)
+
+    @property
+    def planner(self) -> AggregationPlanner:
+        """이 뷰의 집계 계획 (섹션 선언을 모아 한 번에 계산)"""
+        if self._planner is None:
+            self._planner = AggregationPlanner(self)
+        return self._planner
+
+    def aggregate(self, grain, cols_to_sum):
+        """grain 별 합계 (grain 이 빈 튜플이면 전체 합계 Series)"""
+        return self.planner.result(grain, cols_to_sum)
+
+    def totals(self) -> pd.Series:
+        """전체 합계 (KPI / Funnel)"""
+        return self.aggregate((), METRICS)
+
+    def bucket_aggregation(self, cols_to_sum) -> pd.DataFrame:
+        """시간 버킷별 합계 (Trend)"""
+        return self.aggregate(("bucket",), cols_to_sum)
+
+    def segment_aggregation(self, seg_col, cols_to_sum) -> pd.DataFrame:
+        """세그먼트별 합계 (Segment)"""
+        return self.aggregate((seg_col,), cols_to_sum)
+
+
+def get_filtered_view(dataset: SharedDataset, state: FilterState, owner=None) -> DatasetView:
+    """필터 상태에 해당하는 뷰 반환 (행 집합은 캐시에서 재사용)
+
+    owner 는 이 뷰를 쓰는 실행의 토큰(offload.begin_run)으로, 세션이 다시 실행되면 오프로드된 집계를 취소합니다.
+    """
+    def compute():
+        if dataset.cube is not None:
+            return dataset.cube.filter_rows(state)
+        return filter_rows(dataset.frame, state)
+
+    rows = _cached("filter_rows", ("filter_rows", dataset.version, state.row_key), compute)
+    return DatasetView(dataset=dataset, state=state, rows=rows, owner=owner)
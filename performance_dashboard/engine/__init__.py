@@ -0,0 +1,75 @@
+"""Streamlit-free analytics engine: dataset + filter state in, aggregate results out.
+
+대시보드 섹션(`sections/`)은 이 모듈의 결과를 위젯/차트로 그리기만 합니다.
+streamlit 을 import 하지 않으므로 배치 작업, 프로파일링, 벤치마크에서 그대로 쓸 수 있습니다.
+
+    from performance_dashboard.engine import dataset_from_frame, open_view, kpi_summary
+    dataset = dataset_from_frame(raw_df)
+    view = open_view(dataset, FilterState(start=start, end=end, granularity="Daily"))
+    kpi_summary(view).ratios
+"""
+
+from performance_dashboard.data.dataset import SharedDataset, build_shared_dataset
+from performance_dashboard.data.preprocessor import preprocess_frame
+from performance_dashboard.data.view import DatasetView, FilterState, get_filtered_view
+from performance_dashboard.engine.funnel import FunnelSummary, declare_funnel_aggregates, funnel_summary
+from performance_dashboard.engine.kiosk import KioskSnapshot, kiosk_snapshot
+from performance_dashboard.engine.kpi import (
+    COMPARISONS, DailyPrefix, KpiCard, KpiSummary, comparison_range, daily_prefix, declare_kpi_aggregates,
+    kpi_from_totals, kpi_matrix, kpi_summary,
+)
+from performance_dashboard.engine.product import (
+    ProductSummary, product_breakdown, product_comparison, product_period_totals, product_summary,
+)
+from performance_dashboard.engine.segment import declare_segment_aggregates, installs_max, segment_metrics, segment_table
+from performance_dashboard.engine.trend import (
+    ROLLING_WINDOWS, SERIES_MODES, conversion_trend, declare_trend_aggregates, funnel_rate_trend, metric_comparison_trend,
+    segment_totals, segment_trend, series_modes, series_sums, unit_cost_trend,
+)
+
+
+OVERVIEW_SECTIONS = ("kpi", "trend", "funnel", "segment")
+
+
+def declare_section_aggregates(view, trend_dim="source", segment_dim="source", sections=OVERVIEW_SECTIONS):
+    """Overview 섹션(KPI/Trend/Funnel/Segment) 집계를 한 번에 선언 (sections: 선언할 섹션, 기본 전부)
+
+    선언만 하고 계산은 `view.planner.execute()` 에서 최소 그룹 패스로 수행합니다.
+    """
+    if "kpi" in sections:
+        declare_kpi_aggregates(view)
+    if "trend" in sections:
+        declare_trend_aggregates(view, trend_dim)
+    if "funnel" in sections:
+        declare_funnel_aggregates(view)
+    if "segment" in sections:
+        declare_segment_aggregates(view, segment_dim)
+
+
+def dataset_from_frame(raw) -> SharedDataset:
+    """원본 DataFrame 을 전처리해 공유 데이터셋 생성 (시트/번들 로딩 없이)"""
+    return build_shared_dataset(preprocess_frame(raw))
+
+
+def open_view(dataset: SharedDataset, state: FilterState, owner=None,
+              trend_dim="source", segment_dim="source", sections=OVERVIEW_SECTIONS) -> DatasetView:
+    """필터 상태의 뷰를 만들고 Overview 섹션 집계를 미리 계산 (결과는 집계 캐시에 공유)"""
+    view = get_filtered_view(dataset, state, owner=owner)
+    if view.row_count:
+        declare_section_aggregates(view, trend_dim=trend_dim, segment_dim=segment_dim, sections=sections)
+        view.planner.execute()
+    return view
+
+
+__all__ = [
+    "SharedDataset", "DatasetView", "FilterState",
+    "dataset_from_frame", "open_view", "declare_section_aggregates", "OVERVIEW_SECTIONS",
+    "KpiCard", "KpiSummary", "kpi_summary", "kpi_from_totals",
+    "COMPARISONS", "DailyPrefix", "comparison_range", "daily_prefix", "kpi_matrix",
+    "KioskSnapshot", "kiosk_snapshot",
+    "FunnelSummary", "funnel_summary",
+    "segment_table", "segment_metrics", "installs_max",
+    "conversion_trend", "funnel_rate_trend", "unit_cost_trend", "metric_comparison_trend", "segment_trend",
+    "SERIES_MODES", "ROLLING_WINDOWS", "series_modes", "series_sums", "segment_totals",
+    "ProductSummary", "product_period_totals", "product_comparison", "product_summary", "product_breakdown",
+]
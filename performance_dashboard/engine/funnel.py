@@ -0,0 +1,63 @@
+"""Funnel stage counts, conversion rates and unit costs."""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from performance_dashboard.config import METRICS
+
+FUNNEL_STAGES = ["Install", "Signup", "Create Account", "Deposit", "Initial Offering"]
+
+
+@dataclass(frozen=True)
+class FunnelSummary:
+    """Funnel 섹션 결과
+
+    Attributes:
+        stages: 단계별 전환수 (Stage, Count)
+        conversion: 단계별 전환율 (Metric, Rate — 분모가 0 이면 NaN)
+        unit_costs: 단계별 단가 (Metric, Cost — 분모가 0 이면 NaN)
+    """
+
+    stages: pd.DataFrame
+    conversion: pd.DataFrame
+    unit_costs: pd.DataFrame
+
+
+def declare_funnel_aggregates(view):
+    """Funnel 섹션이 쓰는 집계 선언 (KPI 와 같은 전체 합계)"""
+    view.planner.declare((), METRICS)
+
+
+def funnel_summary(view) -> FunnelSummary:
+    """필터된 전체 합계로 퍼널 단계/전환율/단가 계산"""
+    tot = view.totals()
+    F_IMP = tot["impressions"]
+    F_CLK = tot["clicks"]
+    F_INS = tot["installs"]
+    F_SGN = tot["signup_7d"]
+    F_ACC = tot["create_account_7d"]
+    F_DEP = tot["deposit_30d"]
+    F_IO = tot["initial_offering_30d"]
+    F_COST = tot["cost"]
+
+    conv = {
+        "CTR": (F_CLK / F_IMP) if F_IMP > 0 else np.nan,
+        "설치율": (F_INS / F_CLK) if F_CLK > 0 else np.nan,
+        "회원가입률": (F_SGN / F_INS) if F_INS > 0 else np.nan,
+        "지갑개설률": (F_ACC / F_SGN) if F_SGN > 0 else np.nan,
+        "예치금입금율": (F_DEP / F_ACC) if F_ACC > 0 else np.nan,
+    }
+    cost = {
+        "CPM": (F_COST / F_IMP * 1000) if F_IMP > 0 else np.nan,
+        "CPC": (F_COST / F_CLK) if F_CLK > 0 else np.nan,
+        "CPI": (F_COST / F_INS) if F_INS > 0 else np.nan,
+        "회원가입단가": (F_COST / F_SGN) if F_SGN > 0 else np.nan,
+        "지갑개설단가": (F_COST / F_ACC) if F_ACC > 0 else np.nan,
+    }
+    return FunnelSummary(
+        stages=pd.DataFrame({"Stage": FUNNEL_STAGES, "Count": [F_INS, F_SGN, F_ACC, F_DEP, F_IO]}),
+        conversion=pd.DataFrame({"Metric": list(conv.keys()), "Rate": list(conv.values())}),
+        unit_costs=pd.DataFrame({"Metric": list(cost.keys()), "Cost": list(cost.values())}),
+    )
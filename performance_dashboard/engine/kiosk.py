@@ -0,0 +1,102 @@
+"""Incremental per-day totals for the kiosk (live KPI Board) refresh."""
+
+import dataclasses
+import datetime
+from dataclasses import dataclass
+
+import pandas as pd
+
+from performance_dashboard.config import KIOSK_RESTATE_DAYS, METRICS
+from performance_dashboard.data.view import FilterState, date_bounds, get_filtered_view
+
+
+@dataclass(frozen=True)
+class KioskSnapshot:
+    """키오스크 tick 하나의 일별 합계
+
+    Attributes:
+        version: 합산한 데이터 버전
+        state: 기준 필터 상태 (사이드바에서 적용된 상태)
+        end: 실제로 합산한 마지막 날짜
+        follow_latest: 기준 상태가 데이터 최신일까지였는지 (그렇다면 새 날짜가 들어오면 end 가 따라간다)
+        daily: 일별 합계 (bucket + METRICS, 날짜 오름차순)
+        watermark: 다음 tick 에 다시 합산할 구간의 시작일 (그 이전은 확정 구간)
+        settled_rows: 확정 구간의 행 수 (다음 tick 에서 과거 데이터가 바뀌었는지 확인)
+        scanned_rows: 이번 tick 에 다시 합산한 행 수
+    """
+
+    version: str
+    state: FilterState
+    end: datetime.date
+    follow_latest: bool
+    daily: pd.DataFrame
+    watermark: datetime.date
+    settled_rows: int
+    scanned_rows: int
+
+    def totals(self) -> pd.Series:
+        """합산 구간 전체 합계 (KPI 카드 입력)"""
+        return self.daily[METRICS].sum()
+
+    def latest(self, days: int) -> pd.DataFrame:
+        """마지막 days 일의 일별 합계 (최신 Trend 점)"""
+        return self.daily.tail(days).reset_index(drop=True)
+
+
+def _daily_sums(dataset, state, start, end):
+    """[start, end] 일별 합계와 합산한 행 수 (큐브가 있으면 날짜순 구간만 훑는다)"""
+    if dataset.cube is not None:
+        rows = dataset.cube.filter_range(start, end, state.selections())
+        daily = dataset.cube.grouped_sum(rows, ("bucket",), METRICS, "Daily")
+        return daily, len(rows)
+    view = get_filtered_view(dataset, dataclasses.replace(state, start=start, end=end, granularity="Daily"))
+    daily = view.bucket_aggregation(METRICS).copy()
+    daily["bucket"] = pd.to_datetime(daily["bucket"]).dt.date
+    return daily, view.row_count
+
+
+def _settled_count(dataset, state, watermark) -> int:
+    """확정 구간(start ~ watermark 전날)의 행 수 (큐브: 날짜 이진 탐색 + 차원 코드 마스크, 지표는 읽지 않음)"""
+    last = watermark - datetime.timedelta(days=1)
+    if last < state.start:
+        return 0
+    return dataset.cube.count_range(state.start, last, state.selections())
+
+
+def kiosk_snapshot(dataset, state: FilterState, previous: KioskSnapshot = None,
+                   restate_days: int = KIOSK_RESTATE_DAYS) -> KioskSnapshot:
+    """필터 상태의 일별 합계 (previous 가 같은 필터의 직전 tick 이면 바뀐 구간만 다시 합산)
+
+    같은 데이터 버전이면 previous 를 그대로 돌려줍니다. 새 버전이면 직전 tick 의 watermark
+    (마지막 날짜 - restate_days, 늦게 들어오는 전환이 보정되는 구간) 이후 행만 다시 합산하고
+    그 이전 일별 합계는 previous 에서 가져옵니다. 확정 구간의 행 수가 달라졌거나 큐브가 날짜순이
+    아니면 전체 구간을 다시 합산합니다 (행 수가 같은 과거 값 수정은 다음 전체 실행에서 반영).
+    """
+    latest = date_bounds(dataset)[1]
+    if previous is not None and previous.state == state:
+        if previous.version == dataset.version:
+            return dataclasses.replace(previous, scanned_rows=0)
+        follow = previous.follow_latest
+    else:
+        previous = None
+        follow = state.end >= latest
+    end = max(latest, state.end) if follow else state.end
+
+    incremental = (
+        previous is not None and dataset.cube is not None and dataset.cube.days_sorted
+        and _settled_count(dataset, state, previous.watermark) == previous.settled_rows
+    )
+    if incremental:
+        tail, scanned = _daily_sums(dataset, state, previous.watermark, end)
+        head = previous.daily[previous.daily["bucket"] < previous.watermark]
+        daily = pd.concat([head, tail], ignore_index=True)
+    else:
+        daily, scanned = _daily_sums(dataset, state, state.start, end)
+
+    last_day = daily["bucket"].max() if len(daily) else end
+    watermark = max(state.start, last_day - datetime.timedelta(days=restate_days))
+    settled = _settled_count(dataset, state, watermark) if dataset.cube is not None else 0
+    return KioskSnapshot(
+        version=dataset.version, state=state, end=end, follow_latest=follow, daily=daily,
+        watermark=watermark, settled_rows=settled, scanned_rows=scanned,
+    )
@@ -0,0 +1,165 @@
+"""KPI totals and unit costs."""
+
+import datetime
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from performance_dashboard.config import METRICS
+from performance_dashboard.data.cube import EPOCH, epoch_days
+from performance_dashboard.data.sample import total_intervals
+from performance_dashboard.data.view import FilterState, dataset_cached, date_bounds, get_filtered_view
+
+# KPI 카드 정의 (라벨, 분자, 분모 또는 None, 배율, 표시 형식) — 앞 5개는 합계 카드, 뒤 5개는 단가/ROAS 카드
+KPI_CARDS = [
+    ("비용", "cost", None, 1, "₩{:,.0f}"),
+    ("설치", "installs", None, 1, "{:,.0f}"),
+    ("회원가입", "signup_7d", None, 1, "{:,.0f}"),
+    ("지갑개설", "create_account_7d", None, 1, "{:,.0f}"),
+    ("청약금", "initial_offering_revenue_30d", None, 1, "₩{:,.0f}"),
+    ("CPI", "cost", "installs", 1, "₩{:,.0f}"),
+    ("회원가입 단가", "cost", "signup_7d", 1, "₩{:,.0f}"),
+    ("지갑개설 단가", "cost", "create_account_7d", 1, "₩{:,.0f}"),
+    ("입금 ROAS", "deposit_revenue_30d", "cost", 100, "{:.2f}%"),
+    ("청약 ROAS", "initial_offering_revenue_30d", "cost", 100, "{:.2f}%"),
+]
+COUNT_CARDS = 5
+
+# 표본 미리보기에서 신뢰구간을 계산할 카드 (라벨: (분자, 분모 또는 None))
+KPI_INTERVALS = {label: (num, den) for label, num, den, _, _ in KPI_CARDS}
+
+# KPI 변화율 비교 기간 (키: 표시 이름)
+COMPARISONS = {
+    "none": "비교 안 함",
+    "previous": "이전 기간",
+    "month": "전월 동기간",
+    "year": "전년 동기간",
+    "custom": "직접 설정",
+}
+
+
+@dataclass(frozen=True)
+class KpiCard:
+    """KPI 카드 값 하나
+
+    Attributes:
+        label: 카드 이름
+        value: 값 (분모가 0 이면 NaN)
+        format: 표시 포맷 문자열
+        margin: 95% 신뢰구간 반폭 (표본 미리보기일 때만, 정확한 값이면 None)
+        delta: 비교 기간 대비 변화율 (비교 안 함 / 비교 기간 값이 0 이면 None 또는 NaN)
+    """
+
+    label: str
+    value: float
+    format: str
+    margin: float = None
+    delta: float = None
+
+
+@dataclass(frozen=True)
+class KpiSummary:
+    """KPI 섹션 결과 (counts: 합계 카드, ratios: 단가/ROAS 카드, compare: 비교 구간 (시작일, 종료일) 또는 None)"""
+
+    counts: list
+    ratios: list
+    compare: tuple = None
+
+
+def declare_kpi_aggregates(view):
+    """KPI 섹션이 쓰는 집계 선언"""
+    view.planner.declare((), METRICS)
+
+
+def kpi_matrix(sums: np.ndarray) -> np.ndarray:
+    """기간별 METRICS 합계 행렬 (기간 x METRICS) → 기간별 KPI 카드 값 (기간 x KPI_CARDS, 분모 0 은 NaN)"""
+    sums = np.atleast_2d(np.asarray(sums, dtype=np.float64))
+    col = {m: i for i, m in enumerate(METRICS)}
+    num = sums[:, [col[n] for _, n, _, _, _ in KPI_CARDS]]
+    den = np.ones_like(num)
+    for j, (_, _, d, _, _) in enumerate(KPI_CARDS):
+        if d is not None:
+            den[:, j] = sums[:, col[d]]
+    scale = np.array([sc for _, _, _, sc, _ in KPI_CARDS], dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(den > 0, num / den * scale, np.nan)
+
+
+def kpi_summary(view, compare="none", custom=None) -> KpiSummary:
+    """필터된 전체 합계와 단가/ROAS (ROAS 는 % 단위)
+
+    compare 가 "none" 이 아니면 비교 기간(COMPARISONS, custom 은 직접 설정 구간) 대비 변화율을 붙입니다.
+    현재 / 비교 기간 값은 일별 누적 합계에서 한 번에 구합니다 (원본 행을 다시 훑지 않음).
+    """
+    deltas, compare_range = None, comparison_range(compare, view.state.start, view.state.end, custom)
+    if compare_range is not None:
+        values = kpi_matrix(daily_prefix(view).range_sums([(view.state.start, view.state.end), compare_range]))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            deltas = np.where(values[1] > 0, values[0] / values[1] - 1, np.nan)
+    return kpi_from_totals(view.totals(), total_intervals(view, KPI_INTERVALS), deltas, compare_range)
+
+
+def kpi_from_totals(tot, margins=None, deltas=None, compare=None) -> KpiSummary:
+    """METRICS 합계 Series → KPI 카드 (margins: 카드 라벨별 95% 신뢰구간 반폭, deltas: KPI_CARDS 순서 변화율)"""
+    margins = margins or {}
+    values = kpi_matrix(tot.reindex(METRICS).to_numpy(dtype=np.float64))[0]
+    cards = []
+    for j, (label, num, den, scale, fmt) in enumerate(KPI_CARDS):
+        value = tot[num] if den is None else values[j]
+        margin = margins.get(label)
+        cards.append(KpiCard(label, value, fmt, None if margin is None else margin * scale,
+                             None if deltas is None else float(deltas[j])))
+    return KpiSummary(counts=cards[:COUNT_CARDS], ratios=cards[COUNT_CARDS:], compare=compare)
+
+
+def comparison_range(compare, start, end, custom=None):
+    """비교 기간 (시작일, 종료일) (비교 안 함 / 직접 설정 구간이 없으면 None)
+
+    previous: 바로 앞 같은 길이 구간, month / year: 1개월 / 1년 전 같은 날짜 (말일은 그 달 말일로 맞춘다).
+    """
+    if compare == "previous":
+        length = (end - start).days + 1
+        return (start - datetime.timedelta(days=length), start - datetime.timedelta(days=1))
+    if compare in ("month", "year"):
+        offset = pd.DateOffset(months=1 if compare == "month" else 12)
+        return ((pd.Timestamp(start) - offset).date(), (pd.Timestamp(end) - offset).date())
+    if compare == "custom" and custom is not None and len(custom) == 2:
+        return tuple(custom)
+    return None
+
+
+@dataclass(frozen=True)
+class DailyPrefix:
+    """일별 METRICS 누적 합계 (구간 합 = 누적[끝 다음 날] - 누적[시작일], 구간 수와 무관하게 O(1))
+
+    Attributes:
+        first: 첫 날짜 (1970-01-01 기준 일수)
+        cumsum: (일수 + 1) x METRICS 누적 합계 행렬 (0 행은 0), 데이터가 없는 날은 0 으로 채운다
+    """
+
+    first: int
+    cumsum: np.ndarray
+
+    def range_sums(self, ranges) -> np.ndarray:
+        """(시작일, 종료일) 구간들의 METRICS 합계 (구간 x METRICS, 데이터 범위 밖은 0)"""
+        bounds = np.array([((s - EPOCH).days, (e - EPOCH).days + 1) for s, e in ranges], dtype=np.int64)
+        idx = np.clip(bounds - self.first, 0, len(self.cumsum) - 1)
+        return self.cumsum[idx[:, 1]] - self.cumsum[idx[:, 0]]
+
+
+def daily_prefix(view) -> DailyPrefix:
+    """뷰의 차원 선택값(날짜 범위 무시)에 대한 일별 누적 합계 (데이터 버전 x 선택값 단위 캐시)"""
+    dataset, selections = view.dataset, view.state.selections()
+
+    def compute():
+        lo, hi = date_bounds(dataset)
+        state = FilterState(start=lo, end=hi, granularity="Daily", **selections)
+        daily = get_filtered_view(dataset, state).bucket_aggregation(METRICS)
+        days = epoch_days(pd.to_datetime(daily["bucket"]))
+        first = (lo - EPOCH).days
+        dense = np.zeros(((hi - lo).days + 2, len(METRICS)))
+        dense[days - first + 1] = daily[METRICS].to_numpy(dtype=np.float64)
+        return DailyPrefix(first=first, cumsum=np.cumsum(dense, axis=0))
+
+    return dataset_cached(dataset, "daily_prefix", compute, tuple(sorted(selections.items())))
@@ -0,0 +1,156 @@
+"""Product-period totals, comparison table and per-product breakdowns."""
+
+import json
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from performance_dashboard.data import offload
+from performance_dashboard.data.view import dataset_cached, date_range_rows, take_rows
+from performance_dashboard.utils.helpers import safe_divide
+
+# Product 비교에 쓰는 기간 합계 컬럼
+PRODUCT_SUM_COLS = ['cost', 'installs', 'signup_7d', 'create_account_7d', 'deposit_30d', 'initial_offering_30d',
+                    'deposit_revenue_30d', 'initial_offering_revenue_30d']
+UNSPECIFIED = '(미지정)'
+
+
+@dataclass(frozen=True)
+class ProductSummary:
+    """Product 기간 하나의 합계와 전환율/단가/ROAS
+
+    Attributes:
+        product_df: 기간 행 (날짜순 데이터면 공유 프레임의 복사 없는 slice, 수정 금지)
+        totals: PRODUCT_SUM_COLS 합계 (행이 없으면 빈 dict)
+        costs: (CPI, 회원가입단가, 지갑개설단가, 청약단가)
+        roas: (입금 ROAS, 청약 ROAS)
+        cvr: (회원가입률, 지갑개설률, 입금전환율, 청약전환율) — 앞의 둘은 설치 대비, 뒤의 둘은 지갑개설 대비
+    """
+
+    product_df: pd.DataFrame
+    totals: dict
+    costs: tuple = ()
+    roas: tuple = ()
+    cvr: tuple = ()
+
+
+def product_range(product) -> tuple:
+    """Product 설정의 (시작일, 종료일)"""
+    return pd.to_datetime(product['start_date']).date(), pd.to_datetime(product['end_date']).date()
+
+
+def product_period_totals(dataset, products, owner=None) -> pd.DataFrame:
+    """Product 기간별 행 수(rows)와 PRODUCT_SUM_COLS 합계 (products 순서)
+
+    번들이면 일별 롤업의 구간 합, 큐브가 있으면 날짜순 행의 구간 합으로 계산하고 (큰 데이터셋은 오프로드 워커에서),
+    없으면 Product 마다 기간 행(연속 구간이면 복사 없는 slice)의 합계를 냅니다.
+    """
+    ranges = [product_range(p) for p in products]
+    cube = dataset.cube
+    if cube is not None and cube.supports((), PRODUCT_SUM_COLS):
+        if dataset.bundle is not None:
+            return dataset.bundle.period_sums(ranges, PRODUCT_SUM_COLS)
+        if offload.should_offload(dataset, cube.n_rows):
+            return offload.period_sums(dataset, ranges, PRODUCT_SUM_COLS, owner=owner)
+        return cube.period_sums(ranges, PRODUCT_SUM_COLS)
+    rows = []
+    for product_start, product_end in ranges:
+        product_df = take_rows(dataset.frame, date_range_rows(dataset, product_start, product_end))
+        rows.append({'rows': len(product_df), **{c: product_df[c].sum() for c in PRODUCT_SUM_COLS}})
+    return pd.DataFrame(rows, columns=['rows'] + PRODUCT_SUM_COLS)
+
+
+def product_comparison(dataset, products, owner=None):
+    """Product 별 기간 합계와 파생 지표 (데이터가 있는 Product 가 없으면 None)
+
+    필터와 무관하므로 (데이터 버전, Product 설정) 단위로 캐시합니다.
+    """
+    key = json.dumps(products, sort_keys=True, ensure_ascii=False, default=str)
+    return dataset_cached(dataset, "product_comparison", lambda: _product_comparison(dataset, products, owner), key)
+
+
+def _product_comparison(dataset, products, owner=None):
+    period_totals = product_period_totals(dataset, products, owner).to_dict('records')
+    all_products_data = []
+    for product, totals in zip(products, period_totals):
+        if totals['rows'] > 0:
+            total_cost = totals['cost']
+            total_installs = totals['installs']
+            total_signup = totals['signup_7d']
+            total_create_account = totals['create_account_7d']
+            total_deposit_30d = totals['deposit_30d']
+            total_initial_offering_30d = totals['initial_offering_30d']
+            total_deposit_revenue_30d = totals['deposit_revenue_30d']
+            total_initial_offering_revenue_30d = totals['initial_offering_revenue_30d']
+            
+            all_products_data.append({
+                'product_name': product['name'],
+                'product_id': product['id'],
+                'theme_color': product.get('theme_color', '#1f77b4'),
+                '비용': total_cost,
+                '설치': total_installs,
+                '회원가입': total_signup,
+                '지갑개설': total_create_account,
+                '입금건수': total_deposit_30d,
+                '청약건수': total_initial_offering_30d,
+                'CPI': total_cost / total_installs if total_installs > 0 else 0,
+                '회원가입단가': total_cost / total_signup if total_signup > 0 else 0,
+                '지갑개설단가': total_cost / total_create_account if total_create_account > 0 else 0,
+                '회원가입률': total_signup / total_installs if total_installs > 0 else 0,
+                '지갑개설률': total_create_account / total_installs if total_installs > 0 else 0,
+                '입금전환율': total_deposit_30d / total_create_account if total_create_account > 0 else 0,
+                '청약전환율': total_initial_offering_30d / total_create_account if total_create_account > 0 else 0,
+                '입금 ROAS': total_deposit_revenue_30d / total_cost if total_cost > 0 else 0,
+                '청약 ROAS': total_initial_offering_revenue_30d / total_cost if total_cost > 0 else 0,
+                '입금액': total_deposit_revenue_30d,
+                '청약금액': total_initial_offering_revenue_30d,
+            })
+    
+    if not all_products_data:
+        return None
+    return pd.DataFrame(all_products_data)
+
+
+def _ratio(num, den):
+    return safe_divide(np.array([num]), np.array([den]))[0]
+
+
+def product_summary(dataset, product) -> ProductSummary:
+    """선택 Product 기간의 행과 합계 / 단가 / ROAS / 전환율"""
+    product_start, product_end = product_range(product)
+    product_df = take_rows(dataset.frame, date_range_rows(dataset, product_start, product_end))
+    if len(product_df) == 0:
+        return ProductSummary(product_df=product_df, totals={})
+    
+    t = {c: product_df[c].sum() for c in PRODUCT_SUM_COLS}
+    return ProductSummary(
+        product_df=product_df,
+        totals=t,
+        costs=(_ratio(t['cost'], t['installs']), _ratio(t['cost'], t['signup_7d']),
+               _ratio(t['cost'], t['create_account_7d']), _ratio(t['cost'], t['initial_offering_30d'])),
+        roas=(_ratio(t['deposit_revenue_30d'], t['cost']), _ratio(t['initial_offering_revenue_30d'], t['cost'])),
+        cvr=(_ratio(t['signup_7d'], t['installs']), _ratio(t['create_account_7d'], t['installs']),
+             _ratio(t['deposit_30d'], t['create_account_7d']), _ratio(t['initial_offering_30d'], t['create_account_7d'])),
+    )
+
+
+def product_breakdown(product_df, group_column, keep=None, dims=None) -> pd.DataFrame:
+    """Product 기간 행의 group_column 별 합계와 전환율/ROAS (keep: 남길 행 마스크)
+
+    dims 에 group_column 이 있으면 그 컬럼(결측을 UNSPECIFIED 로 채운 차원)으로 묶습니다.
+    행을 복사하지 않고, keep 밖의 행은 그룹 키를 결측으로 두어 제외합니다.
+    """
+    group_keys = (dims or {}).get(group_column, product_df[group_column])
+    if keep is not None:
+        group_keys = group_keys.where(keep)
+    grouped_agg = product_df.groupby(group_keys).agg({c: 'sum' for c in PRODUCT_SUM_COLS}).reset_index()
+    
+    grouped_agg['CPI'] = safe_divide(grouped_agg['cost'], grouped_agg['installs'])
+    grouped_agg['회원가입률'] = safe_divide(grouped_agg['signup_7d'], grouped_agg['installs'])
+    grouped_agg['지갑개설률'] = safe_divide(grouped_agg['create_account_7d'], grouped_agg['installs'])
+    grouped_agg['입금전환율_30d'] = safe_divide(grouped_agg['deposit_30d'], grouped_agg['create_account_7d'])
+    grouped_agg['청약전환율_30d'] = safe_divide(grouped_agg['initial_offering_30d'], grouped_agg['create_account_7d'])
+    grouped_agg['Deposit_ROAS_30d'] = safe_divide(grouped_agg['deposit_revenue_30d'], grouped_agg['cost'])
+    grouped_agg['InitialOffering_ROAS_30d'] = safe_divide(grouped_agg['initial_offering_revenue_30d'], grouped_agg['cost'])
+    return grouped_agg
@@ -0,0 +1,61 @@
+"""Per-segment totals and derived metrics."""
+
+import pandas as pd
+
+from performance_dashboard.utils.helpers import safe_divide
+
+SEGMENT_SUM_COLS = ["impressions", "clicks", "installs", "signup_7d", "create_account_7d", "deposit_30d", "cost", "deposit_revenue_30d", "initial_offering_30d", "initial_offering_revenue_30d"]
+SEGMENT_DIMENSIONS = ["source", "campaign_name", "sub_campaign_name", "creative_name"]
+COL_SORT_LIST = ['CTR', '설치율', '회원가입률', '지갑개설률', 'CPC', 'CPI', '회원가입단가', '지갑개설단가', '입금 ROAS', '청약 ROAS', '비용', '노출', '설치', '클릭', '회원가입', '지갑개설', '입금', '입금액', '청약', '청약금']
+
+
+def declare_segment_aggregates(view, seg="source"):
+    """Segment 섹션이 쓰는 집계 선언 (seg: 비교 기준)"""
+    if seg in view.dataset.frame.columns:
+        view.planner.declare((seg,), SEGMENT_SUM_COLS)
+
+
+def installs_max(view):
+    """필터된 행의 최대 설치수 (최소 설치수 슬라이더 범위)"""
+    # 필터링된 전체 프레임을 만들지 않고 한 컬럼만 모은다
+    return view.cached("installs_max", lambda: view.dataset.frame["installs"].to_numpy()[view.rows].max())
+
+
+def segment_metrics(view, seg, min_inst=0) -> pd.DataFrame:
+    """세그먼트별 합계 + 파생 지표 (최소 설치수 필터, 정렬 전, 컬럼: seg + COL_SORT_LIST)
+
+    (필터 상태, seg, min_inst) 단위로 캐시하므로 정렬만 바꾸면 파생 지표를 다시 계산하지 않습니다.
+    """
+    def compute():
+        cols_sum = SEGMENT_SUM_COLS
+        agg = view.segment_aggregation(seg, cols_sum)
+        
+        # 파생 컬럼
+        agg["CTR"] = safe_divide(agg["clicks"], agg["impressions"])
+        agg["설치율"] = safe_divide(agg["installs"], agg["clicks"])
+        agg["회원가입률"] = safe_divide(agg["signup_7d"], agg["installs"])
+        agg["지갑개설률"] = safe_divide(agg["create_account_7d"], agg["signup_7d"])
+        agg["CPC"] = safe_divide(agg["cost"], agg["clicks"])
+        agg["CPI"] = safe_divide(agg["cost"], agg["installs"])
+        agg["회원가입단가"] = safe_divide(agg["cost"], agg["signup_7d"])
+        agg["지갑개설단가"] = safe_divide(agg["cost"], agg["create_account_7d"])
+        agg["입금 ROAS"] = safe_divide(agg["deposit_revenue_30d"], agg["cost"])
+        agg["청약 ROAS"] = safe_divide(agg["initial_offering_revenue_30d"], agg["cost"])
+        
+        # 컬럼 이름 변경
+        cols_value = ["노출", "클릭", "설치", "회원가입", "지갑개설", "입금", "비용", "입금액", "청약", "청약금"]
+        col_dict = dict(zip(cols_sum, cols_value))
+        agg = agg.rename(columns=col_dict)
+        
+        agg = agg[[seg] + [c for c in COL_SORT_LIST if c in agg.columns]]
+        
+        # 필터(품질 가드)
+        return agg[agg["설치"] >= min_inst].reset_index(drop=True)
+
+    return view.cached("segment_metrics", compute, seg, min_inst)
+
+
+def segment_table(view, seg, min_inst=0, sort_key=COL_SORT_LIST[1], ascending=False) -> pd.DataFrame:
+    """세그먼트별 합계 + 파생 지표 (최소 설치수 필터, 정렬 적용, 컬럼: seg + COL_SORT_LIST)"""
+    agg = segment_metrics(view, seg, min_inst)
+    return agg.sort_values(sort_key, ascending=ascending, kind="stable")
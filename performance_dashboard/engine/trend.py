@@ -0,0 +1,202 @@
+"""Time-bucketed series for the trend charts."""
+
+import dataclasses
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from performance_dashboard.data.view import date_bounds, get_filtered_view
+from performance_dashboard.utils.helpers import safe_divide
+
+# 차트별 버킷 집계 컬럼
+CONVERSION_COLS = ["cost", "signup_7d", "create_account_7d"]
+FUNNEL_RATE_COLS = ["installs", "signup_7d", "create_account_7d"]
+COST_COLS = ["cost", "installs", "signup_7d", "create_account_7d"]
+SEGMENT_TREND_COLS = ["installs", "signup_7d", "create_account_7d", "cost"]
+# bucket 마다 계산하는 파생 지표 (지표 추이 비교 / 세그먼트별 추이 비교 선택지)
+TREND_METRICS = ["회원가입", "지갑개설", "회원가입률", "지갑개설률", "CPI", "회원가입단가", "지갑개설 단가"]
+UNIT_COST_SERIES = ["CPM", "CPI", "회원가입단가", "지갑개설단가"]
+# TREND_METRICS 정의 (이름: (분자, 분모 또는 None)) — 모드와 무관하게 bucket 합계의 비율로 계산
+TREND_METRIC_DEFS = {
+    "회원가입": ("signup_7d", None),
+    "지갑개설": ("create_account_7d", None),
+    "회원가입률": ("signup_7d", "installs"),
+    "지갑개설률": ("create_account_7d", "installs"),
+    "CPI": ("cost", "installs"),
+    "회원가입단가": ("cost", "signup_7d"),
+    "지갑개설 단가": ("cost", "create_account_7d"),
+}
+# 추이 시리즈 모드 (키: 표시 이름) / 이동 합계 기간 (일, bucket 이 하루인 Daily 에서만)
+SERIES_MODES = {"raw": "기간별", "rolling": "이동 합계", "cumulative": "누적"}
+ROLLING_WINDOWS = (7, 14, 28)
+ROLLING_GRANULARITY = "Daily"
+
+
+def declare_trend_aggregates(view, dim_col="source"):
+    """Trend 섹션이 쓰는 집계 선언 (dim_col: 세그먼트별 추이 비교 기준)"""
+    view.planner.declare(("bucket",), CONVERSION_COLS)
+    view.planner.declare(("bucket",), FUNNEL_RATE_COLS)
+    view.planner.declare(("bucket",), cost_cols(view))
+    if dim_col in view.dataset.frame.columns:
+        view.planner.declare(("bucket", dim_col), SEGMENT_TREND_COLS)
+
+
+def cost_cols(view):
+    """단가 추이 집계 컬럼 (impressions 가 있으면 CPM 용으로 포함)"""
+    cols = list(COST_COLS)
+    if "impressions" in view.dataset.frame.columns:
+        cols.append("impressions")
+    return cols
+
+
+def series_modes(granularity) -> dict:
+    """집계 단위에서 쓸 수 있는 시리즈 모드 (이동 합계는 Daily 에서만)"""
+    if granularity == ROLLING_GRANULARITY:
+        return dict(SERIES_MODES)
+    return {k: v for k, v in SERIES_MODES.items() if k != "rolling"}
+
+
+def series_sums(df, cols, mode="raw", window=None, by=None, origin=None) -> pd.DataFrame:
+    """bucket 별 합계 → 이동 합계(window 일) / 누적 합계 (mode 가 raw 면 그대로, 입력 프레임은 수정하지 않음)
+
+    (by 값 x bucket x cols) 조밀 배열 하나에 누적 합계를 한 번 구해 모든 세그먼트와 컬럼을 함께 계산합니다.
+    이동 합계는 일별 bucket 의 window 일 구간 합(누적[현재] - 누적[구간 시작 전])입니다 (Daily 전용).
+    origin(기본: 첫 bucket)보다 앞 날짜가 필요한 구간(창이 덜 찬 앞부분)은 NaN 입니다. 비율 지표는 이렇게 만든 합계로 다시 계산합니다 (비율의 평균이 아님).
+    """
+    if mode == "raw" or df.empty:
+        return df
+    dates = pd.to_datetime(df["bucket"]).to_numpy("datetime64[D]")
+    days, bucket_codes = np.unique(dates, return_inverse=True)
+    if by is None:
+        seg_codes, n_seg = np.zeros(len(df), dtype=np.int64), 1
+    else:
+        seg_codes, uniques = pd.factorize(df[by], use_na_sentinel=False)
+        n_seg = len(uniques)
+    dense = np.zeros((n_seg, len(days) + 1, len(cols)))
+    np.add.at(dense, (seg_codes, bucket_codes + 1), df[cols].to_numpy(dtype=np.float64))
+    cum = np.cumsum(dense, axis=1)
+    if mode == "cumulative":
+        result = cum[:, 1:]
+    else:
+        starts = days - np.timedelta64(window - 1, "D")
+        lo = np.searchsorted(days, starts, side="left")
+        result = cum[:, 1:] - cum[:, lo]
+        result[:, starts < (days[0] if origin is None else np.datetime64(origin, "D"))] = np.nan
+    out = df.copy()
+    out[list(cols)] = result[seg_codes, bucket_codes]
+    return out
+
+
+def windowed_sums(view, grain, cols, mode="raw", window=None, by=None) -> pd.DataFrame:
+    """grain(bucket 포함) 별 합계 → series_sums
+
+    이동 합계면 조회 시작일 전날까지 window - 1 일의 합계를 필터 구간 밖에서 더 가져와 창을 채우고,
+    필터 구간의 bucket 만 돌려줍니다 (데이터 첫날보다 앞이 필요한 창만 NaN). 이동 합계는 Daily 에서만 계산합니다.
+    """
+    agg = view.aggregate(grain, cols)
+    if mode != "rolling" or agg.empty:
+        return series_sums(agg, cols, mode, window, by)
+    if mode not in series_modes(view.state.granularity):
+        raise ValueError(f"이동 합계는 {ROLLING_GRANULARITY} 집계 단위에서만 계산합니다: {view.state.granularity}")
+    first_day = date_bounds(view.dataset)[0]
+    start = max(first_day, view.state.start - datetime.timedelta(days=window - 1))
+    if start >= view.state.start:
+        return series_sums(agg, cols, mode, window, by, origin=first_day)
+    state = dataclasses.replace(view.state, start=start, end=view.state.start - datetime.timedelta(days=1))
+    before = get_filtered_view(view.dataset, state, owner=view.owner).aggregate(grain, cols)
+    out = series_sums(pd.concat([before, agg], ignore_index=True), cols, mode, window, by, origin=first_day)
+    return out.iloc[len(before):].reset_index(drop=True)
+
+
+def add_trend_metrics(df) -> pd.DataFrame:
+    """합계 컬럼이 있는 TREND_METRICS 를 합계의 비율로 추가 (df 를 수정하고 돌려준다)"""
+    for name, (num, den) in TREND_METRIC_DEFS.items():
+        if den is None:
+            if num in df.columns:
+                df[name] = df[num]
+        elif {num, den}.issubset(df.columns):
+            df[name] = safe_divide(df[num], df[den])
+    return df
+
+
+def conversion_trend(view, mode="raw", window=None) -> pd.DataFrame:
+    """bucket 별 비용 / 회원가입 / 지갑개설 합계 (bucket + CONVERSION_COLS, mode: SERIES_MODES)"""
+    return windowed_sums(view, ("bucket",), CONVERSION_COLS, mode, window)
+
+
+def funnel_rate_trend(view, mode="raw", window=None) -> pd.DataFrame:
+    """bucket 별 회원가입률 / 지갑개설률 (분모가 0 이면 NaN)"""
+    tmp2 = windowed_sums(view, ("bucket",), FUNNEL_RATE_COLS, mode, window)
+    
+    # 전환율 계산 (0 나눗셈 방지)
+    tmp2["회원가입률"] = np.where(tmp2["installs"] > 0, tmp2["signup_7d"] / tmp2["installs"], np.nan)
+    tmp2["지갑개설률"] = np.where(tmp2["signup_7d"] > 0, tmp2["create_account_7d"] / tmp2["signup_7d"], np.nan)
+    return tmp2
+
+
+def unit_cost_trend(view, mode="raw", window=None) -> pd.DataFrame:
+    """bucket 별 단가 (CPM 은 impressions 가 있을 때만, 분모가 0 이면 NaN)"""
+    agg = windowed_sums(view, ("bucket",), cost_cols(view), mode, window)
+    
+    if "impressions" in agg.columns:
+        agg["CPM"] = np.where(agg["impressions"] > 0, agg["cost"] / agg["impressions"] * 1000.0, np.nan)
+    agg["CPI"] = np.where(agg["installs"] > 0, agg["cost"] / agg["installs"], np.nan)
+    agg["회원가입단가"] = np.where(agg["signup_7d"] > 0, agg["cost"] / agg["signup_7d"], np.nan)
+    agg["지갑개설단가"] = np.where(agg["create_account_7d"] > 0, agg["cost"] / agg["create_account_7d"], np.nan)
+    return agg
+
+
+def unit_cost_series(agg) -> list:
+    """unit_cost_trend 결과에 있는 단가 컬럼"""
+    return [c for c in UNIT_COST_SERIES if c in agg.columns]
+
+
+def metric_comparison_trend(view, mode="raw", window=None) -> pd.DataFrame:
+    """bucket 별 합계와 TREND_METRICS 파생 지표 (bucket 당 한 행, 파생 지표는 합계의 비율)"""
+    agg = windowed_sums(view, ("bucket",), cost_cols(view), mode, window)
+    date_col = "bucket"
+    
+    agg[date_col] = pd.to_datetime(agg[date_col], errors="coerce")
+    agg.dropna(subset=[date_col], inplace=True)
+    return add_trend_metrics(agg)
+
+
+def _aggregate_segment_trend(bd, dim_col):
+    """시간 x 분해축 집계 + 그룹 단위 파생 지표 (bd: 행 또는 이미 집계된 프레임)"""
+    date_col = "bucket"
+    sum_cols = [c for c in ["installs", "signup_7d", "create_account_7d", "cost"] if c in bd.columns]
+    working_df = bd[[date_col, dim_col] + sum_cols].copy()
+    working_df[date_col] = pd.to_datetime(working_df[date_col], errors="coerce")
+    working_df.dropna(subset=[date_col], inplace=True)
+    
+    g = working_df.groupby([date_col, dim_col], as_index=False).agg({c: "sum" for c in sum_cols})
+    
+    # 그룹 단위 파생 재계산
+    return add_trend_metrics(g)
+
+
+def segment_trend(view, dim_col, mode="raw", window=None) -> pd.DataFrame:
+    """bucket x 분해축 합계와 그룹 단위 파생 지표 (필터 상태 + 분해축 + 모드 단위로 캐시, 수정 금지)"""
+    return view.cached(
+        "segment_trend",
+        # 모든 세그먼트를 함께 이동/누적 합계로 바꾼 뒤 파생 지표 계산
+        lambda: _aggregate_segment_trend(
+            windowed_sums(view, ("bucket", dim_col), SEGMENT_TREND_COLS, mode, window, by=dim_col), dim_col),
+        dim_col, mode, window,
+    )
+
+
+def segment_totals(view, dim_col) -> pd.DataFrame:
+    """분해축 값별 기간 전체 합계와 TREND_METRICS (상위 세그먼트 순위 기준, 비율은 합계의 비율, 수정 금지)"""
+    def compute():
+        g = segment_trend(view, dim_col)
+        sum_cols = [c for c in SEGMENT_TREND_COLS if c in g.columns]
+        return add_trend_metrics(g.groupby(dim_col, as_index=False)[sum_cols].sum())
+
+    return view.cached("segment_totals", compute, dim_col)
+
+
+def segment_metric_options(g) -> list:
+    """segment_trend 결과에 있는 TREND_METRICS"""
+    return [c for c in TREND_METRICS if c in g.columns]
@@ -0,0 +1,156 @@
+"""Chunked CSV / Parquet / XLSX export of filtered rows and section aggregates."""
+
+import io
+import tempfile
+
+import pandas as pd
+
+from performance_dashboard.config import EXPORT_CHUNK_ROWS, METRICS
+from performance_dashboard.data.view import take_rows
+from performance_dashboard.engine import funnel_summary, kpi_summary, product_comparison, segment_table
+
+# 형식: (MIME, 확장자)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+# 원본 행 내보내기에서 뺄 전처리 보조 컬럼 (Date 와 같은 값)
+HELPER_COLUMNS = ("date", "week", "month")
+# 엑셀 시트 하나의 최대 행 수 (헤더 포함), 넘으면 다음 시트에 이어 쓴다
+XLSX_MAX_ROWS = 1_048_576
+
+
+def xlsx_available() -> bool:
+    """xlsxwriter 패키지 설치 여부 (XLSX 는 이 패키지가 있을 때만 제공)"""
+    try:
+        import xlsxwriter  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def available_formats() -> list:
+    """설치된 패키지로 만들 수 있는 형식"""
+    return [fmt for fmt in EXPORT_FORMATS if fmt != "xlsx" or xlsx_available()]
+
+
+def iter_row_chunks(view, chunk_rows: int = EXPORT_CHUNK_ROWS):
+    """필터된 원본 행을 chunk_rows 행씩 (공유 프레임에서 그 구간 행만 꺼내고 필터된 전체 프레임은 만들지 않음)"""
+    frame = view.dataset.frame
+    columns = [c for c in frame.columns if c not in HELPER_COLUMNS]
+    for lo in range(0, len(view.rows), chunk_rows):
+        yield take_rows(frame, view.rows[lo:lo + chunk_rows])[columns]
+
+
+def iter_frame_chunks(df: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS):
+    """이미 만든 집계 프레임을 chunk_rows 행씩"""
+    for lo in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[lo:lo + chunk_rows]
+
+
+def section_exports(view, segment=None, products=None) -> dict:
+    """섹션별 집계 내보내기 {이름: (라벨, 집계 프레임을 만드는 함수)} — 함수는 내려받을 때만 호출
+
+    segment: Segment 테이블 위젯 값 (sections.segment.segment_params), products: Product 설정 (없으면 제외).
+    """
+    exports = {
+        "kpi": ("KPI 합계", lambda: _kpi_frame(view)),
+        "trend": ("Trend 기간별 합계", lambda: view.bucket_aggregation(METRICS)),
+        "funnel": ("Funnel 단계", lambda: _funnel_frame(view)),
+    }
+    if segment is not None:
+        exports["segment"] = ("Segment 테이블", lambda: segment_table(view, **segment))
+    if products:
+        exports["product"] = ("Product 비교", lambda: product_comparison(view.dataset, products))
+    return exports
+
+
+def _kpi_frame(view) -> pd.DataFrame:
+    summary = kpi_summary(view)
+    return pd.DataFrame([(c.label, c.value) for c in summary.counts + summary.ratios], columns=["지표", "값"])
+
+
+def _funnel_frame(view) -> pd.DataFrame:
+    """전환수 / 전환율 / 단가를 (구분, 항목, 값) 한 표로"""
+    funnel = funnel_summary(view)
+    return pd.concat([
+        funnel.stages.set_axis(["항목", "값"], axis=1).assign(구분="전환수"),
+        funnel.conversion.set_axis(["항목", "값"], axis=1).assign(구분="전환율"),
+        funnel.unit_costs.set_axis(["항목", "값"], axis=1).assign(구분="단가"),
+    ], ignore_index=True)[["구분", "항목", "값"]]
+
+
+def write_export(chunks, fmt: str):
+    """청크를 차례로 fmt 형식의 임시 파일에 기록 → 처음 위치로 되돌린 파일 객체 (io.RawIOBase)
+
+    메모리에는 청크 하나(와 형식별 쓰기 버퍼)만 올라가고 결과는 디스크 임시 파일에 쌓입니다.
+    st.download_button 이 받는 파일 형식이 되도록 버퍼를 떼어 낸 원시 파일을 돌려주며, 닫히면 지워집니다.
+    """
+    raw = tempfile.TemporaryFile(buffering=0)
+    out = io.BufferedRandom(raw)
+    writer = {"csv": _write_csv, "parquet": _write_parquet, "xlsx": _write_xlsx}[fmt]
+    writer(chunks, out)
+    out.flush()
+    raw = out.detach()
+    raw.seek(0)
+    return raw
+
+
+def _write_csv(chunks, out):
+    # utf-8-sig: 엑셀에서 열어도 한글이 깨지지 않게 BOM 을 붙인다
+    text = io.TextIOWrapper(out, encoding="utf-8-sig", newline="")
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv(text, header=i == 0, index=False)
+    text.flush()
+    text.detach()
+
+
+def _write_parquet(chunks, out):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    for chunk in chunks:
+        if writer is None:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            writer = pq.ParquetWriter(out, table.schema, compression="zstd")
+        else:
+            # 첫 청크 스키마에 맞춘다 (청크마다 결측 여부가 달라도 같은 파일)
+            table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+        writer.write_table(table)
+    if writer is not None:
+        writer.close()
+
+
+def _xlsx_values(chunk: pd.DataFrame):
+    """청크 → xlsxwriter 가 쓸 수 있는 행 목록 (결측은 빈 칸, 숫자/날짜는 파이썬 값)"""
+    values = chunk.astype(object)
+    return values.where(chunk.notna(), None).itertuples(index=False, name=None)
+
+
+def _write_xlsx(chunks, out):
+    import xlsxwriter
+
+    # constant_memory: 행을 쓰는 즉시 시트 임시 파일로 내보낸다 (시트 전체를 메모리에 두지 않음)
+    book = xlsxwriter.Workbook(out, {"constant_memory": True, "in_memory": False,
+                                     "default_date_format": "yyyy-mm-dd"})
+    sheet, row, columns = None, 0, None
+    for chunk in chunks:
+        if columns is None:
+            columns = list(chunk.columns)
+        for record in _xlsx_values(chunk):
+            if sheet is None or row >= XLSX_MAX_ROWS:
+                sheet = book.add_worksheet(f"data{len(book.worksheets()) + 1}")
+                sheet.write_row(0, 0, [str(c) for c in columns])
+                row = 1
+            sheet.write_row(row, 0, record)
+            row += 1
+    if sheet is None:
+        book.add_worksheet("data1").write_row(0, 0, [str(c) for c in columns or []])
+    book.close()
+
+
+def export_file_name(name: str, state, fmt: str) -> str:
+    """내보내기 파일 이름 (이름_시작일_종료일.확장자)"""
+    return f"{name}_{state.start}_{state.end}.{EXPORT_FORMATS[fmt][1]}"
@@ -0,0 +1,74 @@
+"""Approximate preview: render from a stratified sample while the exact aggregates compute."""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from performance_dashboard.config import PREVIEW_MIN_ROWS
+from performance_dashboard.data.sample import get_sample
+from performance_dashboard.data.view import get_filtered_view
+from performance_dashboard.engine import OVERVIEW_SECTIONS, declare_section_aggregates, open_view
+
+logger = logging.getLogger(__name__)
+
+# 기억해 둘 작업 수 (끝난 작업은 결과가 캐시에 있으므로 오래된 것부터 잊는다)
+MAX_JOBS = 64
+
+_lock = threading.Lock()
+_executor = None
+_jobs = {}  # (데이터 버전, 필터 상태, 선언) -> 정확한 집계 Future
+_latest = {}  # 세션 -> 그 세션이 마지막으로 요청한 작업 키
+
+
+def _pool():
+    """정확한 집계를 계산할 백그라운드 스레드 (한 개, 작업은 순서대로)"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="preview-exact")
+    return _executor
+
+
+def worth_previewing(view) -> bool:
+    """표본 미리보기를 쓸 만한 뷰인지 (큐브가 있고 필터된 행이 PREVIEW_MIN_ROWS 이상)"""
+    return view.dataset.cube is not None and view.row_count >= PREVIEW_MIN_ROWS
+
+
+def _compute_exact(dataset, state, trend_dim, segment_dim, sections):
+    open_view(dataset, state, trend_dim=trend_dim, segment_dim=segment_dim, sections=sections)
+
+
+def preview_view(view, trend_dim="source", segment_dim="source", sections=OVERVIEW_SECTIONS):
+    """정확한 집계가 아직 없으면 백그라운드 계산을 시작하고 (표본 뷰, Future) 를, 준비됐으면 (None, None) 반환
+
+    view 에는 sections 의 집계가 선언돼 있어야 합니다 (캐시에 모두 있으면 미리보기 없이 그대로 쓴다).
+    같은 세션이 다른 필터로 넘어가면 아직 시작하지 않은 이전 작업은 취소합니다.
+    """
+    if not worth_previewing(view) or view.planner.ready():
+        return None, None
+    dataset, state = view.dataset, view.state
+    key = (dataset.version, state, view.planner.declared)
+    session = getattr(view.owner, "session_id", None)
+    with _lock:
+        job = _jobs.get(key)
+        if job is not None and job.done() and not job.cancelled():
+            # 끝났는데 캐시에 없으면 (실패 / 캐시 예산 초과) 미리보기 없이 바로 계산한다
+            if job.exception() is not None:
+                logger.warning("preview: exact aggregation failed (%s), computing inline", job.exception())
+            _jobs.pop(key)
+            return None, None
+        previous = _jobs.get(_latest.get(session))
+        if previous is not None and _latest.get(session) != key:
+            previous.cancel()
+        if job is None or job.cancelled():
+            job = _pool().submit(_compute_exact, dataset, state, trend_dim, segment_dim, sections)
+            _jobs[key] = job
+        _latest[session] = key
+        for stale in [k for k, f in _jobs.items() if f.cancelled()]:
+            _jobs.pop(stale)
+        while len(_jobs) > MAX_JOBS:
+            _jobs.pop(next(iter(_jobs)))
+
+    sample = get_sample(dataset)
+    sample_view = get_filtered_view(sample.dataset, state, owner=view.owner)
+    declare_section_aggregates(sample_view, trend_dim=trend_dim, segment_dim=segment_dim, sections=sections)
+    return sample_view, job
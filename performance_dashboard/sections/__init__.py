@@ -1,2 +1,134 @@
 """Dashboard sections."""
 
+import functools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+import streamlit as st
+
+from performance_dashboard.config import SECTION_COMPUTE_WORKERS, SECTION_FRAGMENTS, SHOW_CACHE_STATS
+from performance_dashboard.data.offload import YIELD_SEC, OffloadCancelled, current_owner, yield_to_rerun
+from performance_dashboard.engine import declare_section_aggregates  # noqa: F401  (섹션 공용 진입점)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _pool():
+    """섹션 계산 스레드 풀 (프로세스 단위, 처음 쓸 때 생성)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=SECTION_COMPUTE_WORKERS, thread_name_prefix="section-compute")
+        return _executor
+
+
+class SectionRun:
+    """compute_sections 결과 (섹션별 계산 결과와 소요 시간)"""
+
+    def __init__(self, futures: dict, timings: dict, wall_ms: float):
+        self._futures = futures
+        self.timings = timings
+        self.wall_ms = wall_ms
+
+    def result(self, name):
+        """섹션 계산 결과 (계산 중 예외는 렌더링하는 스크립트 스레드에서 다시 발생)"""
+        try:
+            return self._futures[name].result()
+        except OffloadCancelled:
+            # 세션 재실행으로 취소된 계산: Streamlit 이 대기 중인 재실행을 처리하게 한다
+            yield_to_rerun()
+            raise
+
+    def report(self) -> dict:
+        """섹션별 계산 시간 (ms), 벽시계 시간, 순차 실행했다면 걸렸을 합계"""
+        return {
+            "sections": dict(self.timings),
+            "wall_ms": self.wall_ms,
+            "sum_ms": sum(self.timings.values()),
+            "workers": SECTION_COMPUTE_WORKERS,
+        }
+
+
+def compute_sections(tasks: dict) -> SectionRun:
+    """{섹션 이름: 인자 없는 계산 함수} 를 스레드 풀에서 동시에 실행하고 모두 끝날 때까지 대기
+
+    계산 함수는 st 를 호출하지 않아야 합니다 (위젯 값은 스크립트 스레드에서 미리 읽어 넘긴다).
+    집계/차트 spec 은 numpy·pandas·JSON 직렬화 구간에서 GIL 을 놓으므로 섹션 간에 겹쳐 실행되고,
+    벽시계 시간은 가장 느린 섹션에 가까워집니다. SECTION_COMPUTE_WORKERS=0 이면 순서대로 실행합니다.
+    """
+    timings = {}
+
+    def timed(name, fn):
+        t0 = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            timings[name] = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    futures = {}
+    if SECTION_COMPUTE_WORKERS > 0:
+        pool = _pool()
+        for name, fn in tasks.items():
+            futures[name] = pool.submit(timed, name, fn)
+        # 기다리는 동안 주기적으로 Streamlit 에 재실행/중지 요청을 처리할 기회를 준다
+        # (요청이 있으면 여기서 실행이 끝나고, 다음 실행이 세대를 올려 오프로드 작업이 취소된다)
+        placeholder = None
+        while wait(list(futures.values()), timeout=YIELD_SEC).not_done:
+            placeholder = yield_to_rerun(placeholder)
+    else:
+        for name, fn in tasks.items():
+            future = Future()
+            try:
+                future.set_result(timed(name, fn))
+            except Exception as e:
+                future.set_exception(e)
+            futures[name] = future
+    return SectionRun(futures, timings, (time.perf_counter() - t0) * 1000)
+
+
+def prepared(data: dict, name: str, params, compute):
+    """compute 단계에서 만든 결과가 현재 위젯 값(params)과 같으면 재사용, 아니면 지금 계산
+
+    data[name] 은 (params, 결과) 쌍입니다. 렌더링 중 위젯 값이 compute 단계에서 읽은
+    session_state 와 다르면 (처음 그리는 위젯, 연쇄 선택지 보정 등) 그 자리에서 계산합니다.
+    """
+    entry = data.get(name)
+    if entry is not None and entry[0] == params:
+        return entry[1]
+    return compute()
+
+
+def _fragment_rerun() -> bool:
+    """지금 실행이 fragment 만 다시 실행하는 중인지 (전체 스크립트 실행이면 False)"""
+    return bool(getattr(current_owner(), "fragment_ids_this_run", None))
+
+
+def panel(name):
+    """위젯이 있는 섹션/패널을 fragment 로 감싸는 데코레이터 (위젯을 바꾸면 이 패널만 다시 실행)
+
+    fragment 재실행은 처음 호출할 때 받은 인자(뷰 핸들, compute 결과)를 그대로 다시 쓰므로,
+    패널은 위젯 값이 compute 단계와 달라진 부분만 `prepared` 로 다시 계산합니다.
+    사이드바 필터는 fragment 밖이므로 바꾸면 전체가 다시 실행됩니다.
+    SECTION_FRAGMENTS=0 이거나 st.fragment 가 없는 버전이면 일반 함수(전체 재실행)로 둡니다.
+    실행 시간은 session_state["panel_timings"][name] 에 남기고, SHOW_CACHE_STATS=1 이면 패널 아래에 표시합니다.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            result = fn(*args, **kwargs)
+            ms = (time.perf_counter() - t0) * 1000
+            scope = "fragment" if _fragment_rerun() else "전체 실행"
+            st.session_state.setdefault("panel_timings", {})[name] = {"ms": ms, "scope": scope}
+            if SHOW_CACHE_STATS:
+                st.caption(f"⏱ {name} {ms:,.0f}ms ({scope})")
+            return result
+
+        if SECTION_FRAGMENTS and hasattr(st, "fragment"):
+            return st.fragment(timed)
+        return timed
+
+    return decorate
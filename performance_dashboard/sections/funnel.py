@@ -2,54 +2,57 @@
 
 import streamlit as st
 import pandas as pd
-import numpy as np
 import altair as alt
 
+from performance_dashboard.charts.spec_cache import chart_spec, emit_chart
+from performance_dashboard.engine.funnel import FUNNEL_STAGES, funnel_summary
 from performance_dashboard.utils.helpers import get_gradient_colors
 
 
-def render_funnel_section(fdf):
-    """Funnel 섹션 렌더링"""
+def compute_funnel(view) -> dict:
+    """Funnel 섹션 데이터와 차트 spec 계산 (st 호출 없음, 섹션 계산 스레드에서 실행)"""
+    summary = funnel_summary(view)
+    return {
+        "chart": chart_spec("funnel", lambda: _funnel_chart(summary.stages.copy()), *view.key),
+        "conversion": _conversion_rates(summary.conversion),
+        "cost": _cost_metrics(summary.unit_costs),
+    }
+
+
+def render_funnel_section(view, data=None):
+    """Funnel 섹션 렌더링 (data: compute_funnel 결과, 없으면 지금 계산)"""
     st.header("📊 Funnel")
     
-    F_IMP = fdf["impressions"].sum()
-    F_CLK = fdf["clicks"].sum()
-    F_INS = fdf["installs"].sum()
-    F_SGN = fdf["signup_7d"].sum()
-    F_ACC = fdf["create_account_7d"].sum()
-    F_DEP = fdf["deposit_30d"].sum()
-    F_IO = fdf["initial_offering_30d"].sum()
-    
-    fun = pd.DataFrame({
-        "Stage": ["Install", "Signup", "Create Account", "Deposit", "Initial Offering"],
-        "Count": [F_INS, F_SGN, F_ACC, F_DEP, F_IO]
-    })
+    if data is None:
+        data = compute_funnel(view)
     
     c_a, c_b, c_c = st.columns(3)
     
     with c_a:
-        _render_funnel_chart(fun)
+        st.subheader("**퍼널 전환 차트**")
+        emit_chart("funnel", data["chart"])
     
     with c_b:
-        _render_conversion_rates(F_IMP, F_CLK, F_INS, F_SGN, F_ACC, F_DEP)
+        st.subheader("**단계별 전환율**")
+        st.dataframe(data["conversion"], hide_index=True, width="stretch")
     
     with c_c:
-        _render_cost_metrics(F_IMP, F_CLK, F_INS, F_SGN, F_ACC, fdf["cost"].sum())
+        st.subheader("**단계별 단가**")
+        st.dataframe(data["cost"], hide_index=True, width="stretch")
     
     st.divider()
 
 
-def _render_funnel_chart(fun):
-    """퍼널 전환 차트"""
-    st.subheader("**퍼널 전환 차트**")
+def _funnel_chart(fun):
+    """단계별 전환수 깔때기"""
     maxc = float(fun["Count"].max() or 0)
     fun["left"] = (maxc - fun["Count"]) / 2
     fun["right"] = fun["left"] + fun["Count"]
     
-    ordered = ["Install", "Signup", "Create Account", "Deposit", "Initial Offering"]
+    ordered = FUNNEL_STAGES
     green_range = get_gradient_colors("green", 5, "lightblue")
     
-    funnel_chart = (
+    return (
         alt.Chart(fun)
         .mark_rect()
         .encode(
@@ -69,36 +72,17 @@ def _render_funnel_chart(fun):
         .properties(height=alt.Step(44))
         .configure_view(strokeWidth=0)
     )
-    
-    st.altair_chart(funnel_chart, use_container_width=True)
 
 
-def _render_conversion_rates(F_IMP, F_CLK, F_INS, F_SGN, F_ACC, F_DEP):
-    """단계별 전환율 테이블"""
-    st.subheader("**단계별 전환율**")
-    conv = {
-        "CTR": (F_CLK / F_IMP) if F_IMP > 0 else np.nan,
-        "설치율": (F_INS / F_CLK) if F_CLK > 0 else np.nan,
-        "회원가입률": (F_SGN / F_INS) if F_INS > 0 else np.nan,
-        "지갑개설률": (F_ACC / F_SGN) if F_SGN > 0 else np.nan,
-        "예치금입금율": (F_DEP / F_ACC) if F_ACC > 0 else np.nan,
-    }
-    conv_df = pd.DataFrame({"Metric": list(conv.keys()), "Rate": list(conv.values())})
+def _conversion_rates(conversion):
+    """단계별 전환율 테이블 (표시용 문자열)"""
+    conv_df = conversion.copy()
     conv_df["Rate"] = conv_df["Rate"].apply(lambda x: f"{x:.1%}" if pd.notna(x) else "-")
-    st.dataframe(conv_df, hide_index=True, use_container_width=True)
+    return conv_df
 
 
-def _render_cost_metrics(F_IMP, F_CLK, F_INS, F_SGN, F_ACC, F_COST):
-    """단계별 단가 테이블"""
-    st.subheader("**단계별 단가**")
-    cost_metrics = {
-        "CPM": (F_COST / F_IMP * 1000) if F_IMP > 0 else np.nan,
-        "CPC": (F_COST / F_CLK) if F_CLK > 0 else np.nan,
-        "CPI": (F_COST / F_INS) if F_INS > 0 else np.nan,
-        "회원가입단가": (F_COST / F_SGN) if F_SGN > 0 else np.nan,
-        "지갑개설단가": (F_COST / F_ACC) if F_ACC > 0 else np.nan,
-    }
-    cost_df = pd.DataFrame({"Metric": list(cost_metrics.keys()), "Cost": list(cost_metrics.values())})
+def _cost_metrics(unit_costs):
+    """단계별 단가 테이블 (표시용 문자열)"""
+    cost_df = unit_costs.copy()
     cost_df["Cost"] = cost_df["Cost"].apply(lambda x: f"₩{x:,.0f}" if pd.notna(x) else "-")
-    st.dataframe(cost_df, hide_index=True, use_container_width=True)
-
+    return cost_df
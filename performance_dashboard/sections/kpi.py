@@ -1,41 +1,120 @@
 """KPI Board section."""
 
+import time
+
+import altair as alt
 import streamlit as st
-import numpy as np
 
+from performance_dashboard.charts.spec_cache import render_chart
+from performance_dashboard.config import KIOSK_REFRESH_SEC, KIOSK_TREND_DAYS
+from performance_dashboard.engine.kiosk import kiosk_snapshot
+from performance_dashboard.engine.kpi import COMPARISONS, KpiSummary, comparison_range, kpi_from_totals, kpi_summary
+from performance_dashboard.sections import panel, prepared
 from performance_dashboard.ui.components import create_kpi_card
-from performance_dashboard.utils.helpers import split_periods
 
+# 키오스크 최근 추이 차트 (컬럼: (제목, 축 형식))
+KIOSK_TREND_METRICS = {"cost": ("비용", ",.0f"), "installs": ("설치", ",.0f"), "signup_7d": ("회원가입", ",.0f")}
+
+
+def kpi_params() -> dict:
+    """KPI 비교 기간 위젯 값 (session_state 기준, 스크립트 스레드에서 읽는다)"""
+    custom = st.session_state.get("kpi_compare_range")
+    return {
+        "compare": st.session_state.get("kpi_compare", "previous"),
+        "custom": tuple(custom) if custom else None,
+    }
+
+
+def compute_kpi(view, params=None) -> dict:
+    """KPI 카드 값 계산 (st 호출 없음, 섹션 계산 스레드에서 실행)"""
+    params = params or {"compare": "previous", "custom": None}
+    widget = (params["compare"], params["custom"])
+    return {"summary": (widget, kpi_summary(view, *widget))}
 
-def render_kpi_section(fdf):
-    """KPI Board 섹션 렌더링"""
+
+def render_kpi_section(view, data=None):
+    """KPI Board 섹션 렌더링 (data: compute_kpi 결과, 없으면 지금 계산)"""
     st.header("📋 KPI Board")
     
-    cur7, prv7 = split_periods(fdf, 7)
-    
-    kpi_cols = st.columns(5)
-    with kpi_cols[0]:
-        create_kpi_card("비용", fdf["cost"].sum(), format_str="₩{:,.0f}")
-    with kpi_cols[1]:
-        create_kpi_card("설치", fdf["installs"].sum())
-    with kpi_cols[2]:
-        create_kpi_card("회원가입", fdf["signup_7d"].sum())
-    with kpi_cols[3]:
-        create_kpi_card("지갑개설", fdf["create_account_7d"].sum())
-    with kpi_cols[4]:
-        create_kpi_card("청약금", fdf["initial_offering_revenue_30d"].sum(), format_str="₩{:,.0f}")
+    if data is None:
+        data = compute_kpi(view, kpi_params())
     
-    kpi_cols2 = st.columns(5)
-    with kpi_cols2[0]:
-        create_kpi_card("CPI", (fdf["cost"].sum()/fdf["installs"].sum()) if fdf["installs"].sum()>0 else np.nan, format_str="₩{:,.0f}")
-    with kpi_cols2[1]:
-        create_kpi_card("회원가입 단가", (fdf["cost"].sum()/fdf["signup_7d"].sum()) if fdf["signup_7d"].sum()>0 else np.nan, format_str="₩{:,.0f}")
-    with kpi_cols2[2]:
-        create_kpi_card("지갑개설 단가", (fdf["cost"].sum()/fdf["create_account_7d"].sum()) if fdf["create_account_7d"].sum()>0 else np.nan, format_str="₩{:,.0f}")
-    with kpi_cols2[3]:
-        create_kpi_card("입금 ROAS", (fdf["deposit_revenue_30d"].sum()/fdf["cost"].sum()*100) if fdf["cost"].sum()>0 else np.nan, format_str="{:.2f}%")
-    with kpi_cols2[4]:
-        create_kpi_card("청약 ROAS", (fdf["initial_offering_revenue_30d"].sum()/fdf["cost"].sum()*100) if fdf["cost"].sum()>0 else np.nan, format_str="{:.2f}%")
+    _render_kpi_board(view, data)
     
     st.divider()
 
+
+@panel("kpi.board")
+def _render_kpi_board(view, data):
+    """비교 기간 위젯과 KPI 카드 (카드 옆 변화율은 비교 기간 대비)"""
+    col_compare, col_range = st.columns([1, 2])
+    with col_compare:
+        compare = st.selectbox("비교 기간", list(COMPARISONS), index=1, format_func=COMPARISONS.get, key="kpi_compare")
+    custom = None
+    if compare == "custom":
+        with col_range:
+            default = comparison_range("previous", view.state.start, view.state.end)
+            custom = st.date_input("비교 구간", default, key="kpi_compare_range")
+            custom = tuple(custom) if custom else None
+    
+    widget = (compare, custom)
+    summary = prepared(data, "summary", widget, lambda: kpi_summary(view, *widget))
+    _render_kpi_cards(summary)
+    if summary.compare is not None:
+        st.caption(f"변화율: {view.state.start} ~ {view.state.end} vs {summary.compare[0]} ~ {summary.compare[1]}")
+
+
+def _render_kpi_cards(data: KpiSummary):
+    for cards in (data.counts, data.ratios):
+        kpi_cols = st.columns(5)
+        for col, card in zip(kpi_cols, cards):
+            with col:
+                create_kpi_card(card.label, card.value, format_str=card.format, delta=card.delta, margin=card.margin)
+
+
+def render_live_kpi_section(load_dataset, state):
+    """키오스크 모드 KPI Board (KIOSK_REFRESH_SEC 마다 이 패널만 다시 실행)
+
+    load_dataset 은 tick 마다 현재 데이터셋을 돌려주는 함수(프로세스 공유 캐시)입니다.
+    데이터 버전이 그대로면 직전 일별 합계를 다시 그리기만 하고, 새 버전이면 최근 구간 행만 다시 합산합니다
+    (engine.kiosk_snapshot). 사이드바 필터를 바꾸면 전체 실행에서 이 패널을 새 상태로 다시 만듭니다.
+    """
+    def live():
+        t0 = time.perf_counter()
+        snapshot = kiosk_snapshot(load_dataset(), state, st.session_state.get("kiosk_snapshot"))
+        st.session_state["kiosk_snapshot"] = snapshot
+        
+        st.header("📋 KPI Board")
+        _render_kpi_cards(kpi_from_totals(snapshot.totals()))
+        
+        recent = snapshot.latest(KIOSK_TREND_DAYS)
+        if len(recent):
+            for col, metric in zip(st.columns(len(KIOSK_TREND_METRICS)), KIOSK_TREND_METRICS):
+                with col:
+                    title, axis_format = KIOSK_TREND_METRICS[metric]
+                    points = recent[["bucket", metric]]
+                    render_chart("kiosk_trend", lambda: _recent_chart(points, metric, title, axis_format),
+                                 points, metric)
+        st.caption(
+            f"🔄 {KIOSK_REFRESH_SEC:g}초마다 갱신 · 데이터 {snapshot.version} · {snapshot.state.start} ~ {snapshot.end} · "
+            f"이번 갱신 {snapshot.scanned_rows:,}행 합산 ({(time.perf_counter() - t0) * 1000:,.0f}ms)"
+        )
+        st.divider()
+
+    if hasattr(st, "fragment"):
+        live = st.fragment(run_every=KIOSK_REFRESH_SEC)(live)
+    live()
+
+
+def _recent_chart(points, metric, title, axis_format):
+    """최근 일별 값 (선 + 점, 마지막 날은 아직 집계 중일 수 있음)"""
+    return (
+        alt.Chart(points)
+        .mark_line(point=True)
+        .encode(
+            x=alt.X("bucket:T", title=None, axis=alt.Axis(format="%m/%d")),
+            y=alt.Y(f"{metric}:Q", title=None, axis=alt.Axis(format=axis_format)),
+            tooltip=[alt.Tooltip("bucket:T", format="%m/%d"), alt.Tooltip(f"{metric}:Q", title=title, format=axis_format)],
+        )
+        .properties(title=f"최근 {title}", height=160)
+    )
@@ -6,12 +6,51 @@ import numpy as np
 import altair as alt
 import plotly.graph_objects as go
 
+from performance_dashboard.charts.spec_cache import chart_spec, emit_chart, render_chart
+from performance_dashboard.data import offload
 from performance_dashboard.data.product_loader import load_product_dates
+from performance_dashboard.engine.product import (
+    UNSPECIFIED, product_breakdown, product_comparison, product_range, product_summary,
+)
+from performance_dashboard.sections import panel, prepared
+from performance_dashboard.ui.components import (
+    COUNT_FORMAT, RATE_FORMAT, RATIO_FORMAT, number_column_config, render_table,
+)
 from performance_dashboard.utils.helpers import safe_divide
 
+# 테이블 숫자 형식 (column_config 로 한 번만 선언)
+COMPARISON_FORMATS = {
+    **{col: COUNT_FORMAT for col in ['비용', '설치', '회원가입', '지갑개설', '입금건수', '청약건수',
+                                     'CPI', '회원가입단가', '지갑개설단가', '입금액', '청약금액']},
+    **{col: RATE_FORMAT for col in ['회원가입률', '지갑개설률', '입금전환율', '청약전환율', '입금 ROAS', '청약 ROAS']},
+}
+BREAKDOWN_FORMATS = {
+    **{col: COUNT_FORMAT for col in ['cost', 'installs', 'CPI', 'deposit_revenue_30d', 'initial_offering_revenue_30d']},
+    **{col: RATE_FORMAT for col in ['회원가입률', '지갑개설률', '입금전환율_30d', '청약전환율_30d']},
+    **{col: RATIO_FORMAT for col in ['Deposit_ROAS_30d', 'InitialOffering_ROAS_30d']},
+}
 
-def render_product_section(df):
-    """Product 섹션 렌더링"""
+
+def product_params() -> dict:
+    """Product 섹션 위젯 값 (session_state 기준, 스크립트 스레드에서 읽는다)"""
+    return {"selected_idx": st.session_state.get("product_selector", 0)}
+
+
+def compute_product(dataset, products, params, owner=None) -> dict:
+    """Product 비교 테이블과 선택 Product 집계 계산 (st 호출 없음, 섹션 계산 스레드에서 실행)
+
+    products 는 스크립트 스레드에서 load_product_dates() 로 읽어 넘깁니다 (st.cache_data 사용).
+    owner 는 오프로드 작업을 취소할 기준인 실행 토큰(offload.begin_run)입니다.
+    """
+    data = {"comparison": product_comparison(dataset, products, owner)}
+    selected_idx = params["selected_idx"]
+    if 0 <= selected_idx < len(products):
+        data["detail"] = (selected_idx, _product_detail(dataset, products[selected_idx]))
+    return data
+
+
+def render_product_section(dataset, data=None):
+    """Product 섹션 렌더링 (data: compute_product 결과, 없으면 지금 계산)"""
     st.divider()
     st.header("📊 Product")
     st.markdown("product 기준 : 건물 공개일 ~ 청약 종료일")
@@ -22,64 +61,27 @@ def render_product_section(df):
         st.warning("Product 날짜 파일을 확인해주세요.")
         return
     
+    if data is None:
+        data = compute_product(dataset, products, product_params(), offload.run_token())
+    
     # 전체 Product 비교
-    _render_all_products_comparison(df, products)
+    _render_all_products_comparison(data["comparison"])
     
     st.divider()
     
     # 개별 Product 상세 분석
-    _render_individual_product_analysis(df, products)
+    _render_individual_product_analysis(dataset, products, data)
 
 
-def _render_all_products_comparison(df, products):
+@panel("product.comparison")
+def _render_all_products_comparison(compare_df):
     """전체 Product 비교 차트"""
     st.subheader("Product 비교")
     
-    all_products_data = []
-    for product in products:
-        product_start = pd.to_datetime(product['start_date']).date()
-        product_end = pd.to_datetime(product['end_date']).date()
-        product_df = df[(df['date'] >= product_start) & (df['date'] <= product_end)].copy()
-        
-        if len(product_df) > 0:
-            total_cost = product_df['cost'].sum()
-            total_installs = product_df['installs'].sum()
-            total_signup = product_df['signup_7d'].sum()
-            total_create_account = product_df['create_account_7d'].sum()
-            total_deposit_30d = product_df['deposit_30d'].sum()
-            total_initial_offering_30d = product_df['initial_offering_30d'].sum()
-            total_deposit_revenue_30d = product_df['deposit_revenue_30d'].sum()
-            total_initial_offering_revenue_30d = product_df['initial_offering_revenue_30d'].sum()
-            
-            all_products_data.append({
-                'product_name': product['name'],
-                'product_id': product['id'],
-                'theme_color': product.get('theme_color', '#1f77b4'),
-                '비용': total_cost,
-                '설치': total_installs,
-                '회원가입': total_signup,
-                '지갑개설': total_create_account,
-                '입금건수': total_deposit_30d,
-                '청약건수': total_initial_offering_30d,
-                'CPI': total_cost / total_installs if total_installs > 0 else 0,
-                '회원가입단가': total_cost / total_signup if total_signup > 0 else 0,
-                '지갑개설단가': total_cost / total_create_account if total_create_account > 0 else 0,
-                '회원가입률': total_signup / total_installs if total_installs > 0 else 0,
-                '지갑개설률': total_create_account / total_installs if total_installs > 0 else 0,
-                '입금전환율': total_deposit_30d / total_create_account if total_create_account > 0 else 0,
-                '청약전환율': total_initial_offering_30d / total_create_account if total_create_account > 0 else 0,
-                '입금 ROAS': total_deposit_revenue_30d / total_cost if total_cost > 0 else 0,
-                '청약 ROAS': total_initial_offering_revenue_30d / total_cost if total_cost > 0 else 0,
-                '입금액': total_deposit_revenue_30d,
-                '청약금액': total_initial_offering_revenue_30d,
-            })
-    
-    if not all_products_data:
+    if compare_df is None:
         st.warning("표시할 Product 데이터가 없습니다.")
         return
     
-    compare_df = pd.DataFrame(all_products_data)
-    
     # 메트릭 선택 UI
     col_metric1, col_metric2, col_metric3, col_metric4 = st.columns([1, 1, 1, 1])
     
@@ -128,10 +130,10 @@ def _render_all_products_comparison(df, products):
     selected_set = set(selected_product_names)
     
     if len(selected_product_names) == 0 or selected_set == all_product_names:
-        filtered_df = compare_df.copy()
+        filtered_df = compare_df
         show_top_n = True
     else:
-        filtered_df = compare_df[compare_df['product_name'].isin(selected_product_names)].copy()
+        filtered_df = compare_df[compare_df['product_name'].isin(selected_product_names)]
         show_top_n = False
     
     if filtered_df.empty:
@@ -177,64 +179,49 @@ def _render_all_products_comparison(df, products):
         y_axis_format = metric_config['axis_format']
         tooltip_format = metric_config['axis_format']
     
-    filtered_color_map = compare_df.set_index('product_name')['theme_color'].to_dict()
-    color_domain = compare_df_sorted['product_name'].tolist()
-    color_range = [filtered_color_map.get(name, '#1f77b4') for name in color_domain]
-    
-    if sort_order == "기본":
-        x_sort = alt.EncodingSortField(field='product_id', order='ascending')
-    else:
-        ascending = (sort_order == "오름차순")
-        x_sort = alt.EncodingSortField(field=selected_metric, order='descending' if not ascending else 'ascending')
-    
-    chart_compare = alt.Chart(compare_df_sorted).mark_bar().encode(
-        x=alt.X('product_name:N',
-               title='Product',
-               sort=x_sort,
-               axis=alt.Axis(labelAngle=-45)),
-        y=alt.Y(f'{selected_metric}:Q',
-               title=selected_metric,
-               axis=alt.Axis(format=y_axis_format)),
-        color=alt.Color('product_name:N',
-                       legend=None,
-                       scale=alt.Scale(domain=color_domain, range=color_range)),
-        tooltip=[
-            alt.Tooltip('product_name:N', title='건물명'),
-            alt.Tooltip('product_id:N', title='product_id'),
-            alt.Tooltip(f'{selected_metric}:Q',
-                       title=selected_metric,
-                       format=tooltip_format)
-        ]
-    ).properties(height=400).interactive()
+    def build():
+        filtered_color_map = compare_df.set_index('product_name')['theme_color'].to_dict()
+        color_domain = compare_df_sorted['product_name'].tolist()
+        color_range = [filtered_color_map.get(name, '#1f77b4') for name in color_domain]
+        
+        if sort_order == "기본":
+            x_sort = alt.EncodingSortField(field='product_id', order='ascending')
+        else:
+            ascending = (sort_order == "오름차순")
+            x_sort = alt.EncodingSortField(field=selected_metric, order='descending' if not ascending else 'ascending')
+        
+        return alt.Chart(compare_df_sorted).mark_bar().encode(
+            x=alt.X('product_name:N',
+                   title='Product',
+                   sort=x_sort,
+                   axis=alt.Axis(labelAngle=-45)),
+            y=alt.Y(f'{selected_metric}:Q',
+                   title=selected_metric,
+                   axis=alt.Axis(format=y_axis_format)),
+            color=alt.Color('product_name:N',
+                           legend=None,
+                           scale=alt.Scale(domain=color_domain, range=color_range)),
+            tooltip=[
+                alt.Tooltip('product_name:N', title='건물명'),
+                alt.Tooltip('product_id:N', title='product_id'),
+                alt.Tooltip(f'{selected_metric}:Q',
+                           title=selected_metric,
+                           format=tooltip_format)
+            ]
+        ).properties(height=400).interactive()
     
-    st.altair_chart(chart_compare, use_container_width=True)
+    # 차트 모양은 표시할 행(테마 색 포함)과 정렬/메트릭 선택으로 결정된다
+    render_chart("product_comparison", build, compare_df_sorted, selected_metric, sort_order)
     
     # 상세 테이블
     with st.expander("📋 세부 데이터", expanded=False):
-        display_df = compare_df_sorted.drop(columns=['theme_color']).copy()
-        styled_df = display_df.style.format({
-            '비용': '{:,.0f}',
-            '설치': '{:,.0f}',
-            '회원가입': '{:,.0f}',
-            '지갑개설': '{:,.0f}',
-            '입금건수': '{:,.0f}',
-            '청약건수': '{:,.0f}',
-            'CPI': '{:,.0f}',
-            '회원가입단가': '{:,.0f}',
-            '지갑개설단가': '{:,.0f}',
-            '회원가입률': '{:.1%}',
-            '지갑개설률': '{:.1%}',
-            '입금전환율': '{:.1%}',
-            '청약전환율': '{:.1%}',
-            '입금 ROAS': '{:.1%}',
-            '청약 ROAS': '{:.1%}',
-            '입금액': '{:,.0f}',
-            '청약금액': '{:,.0f}',
-        })
-        st.dataframe(styled_df, use_container_width=True, hide_index=True)
-
-
-def _render_individual_product_analysis(df, products):
+        display_df = compare_df_sorted.drop(columns=['theme_color'])
+        st.dataframe(display_df, column_config=number_column_config(COMPARISON_FORMATS),
+                     width="stretch", hide_index=True)
+
+
+@panel("product.detail")
+def _render_individual_product_analysis(dataset, products, data):
     """개별 Product 상세 분석"""
     st.markdown("### 🔍 Product별 분석 데이터")
     
@@ -247,56 +234,31 @@ def _render_individual_product_analysis(df, products):
     )
     
     selected_product = products[selected_idx]
-    product_start = pd.to_datetime(selected_product['start_date']).date()
-    product_end = pd.to_datetime(selected_product['end_date']).date()
+    product_start, product_end = product_range(selected_product)
     
     st.info(f"**{selected_product['name']}** | 기간: {product_start} ~ {product_end}")
     
-    product_df = df[(df['date'] >= product_start) & (df['date'] <= product_end)].copy()
+    detail = prepared(data, "detail", selected_idx, lambda: _product_detail(dataset, selected_product))
+    product_df = detail["product_df"]
     
     if len(product_df) == 0:
         st.warning(f"선택한 기간({product_start} ~ {product_end})에 데이터가 없습니다.")
         return
     
-    # 전체 집계
-    total_cost = product_df['cost'].sum()
-    total_installs = product_df['installs'].sum()
-    total_signup = product_df['signup_7d'].sum()
-    total_create_account = product_df['create_account_7d'].sum()
-    total_deposit_30d = product_df['deposit_30d'].sum()
-    total_initial_offering_30d = product_df['initial_offering_30d'].sum()
-    total_deposit_revenue_30d = product_df['deposit_revenue_30d'].sum()
-    total_initial_offering_revenue_30d = product_df['initial_offering_revenue_30d'].sum()
-    
-    # 단가 계산
-    cpi = safe_divide(np.array([total_cost]), np.array([total_installs]))[0]
-    signup_cost = safe_divide(np.array([total_cost]), np.array([total_signup]))[0]
-    cac_create = safe_divide(np.array([total_cost]), np.array([total_create_account]))[0]
-    offering_cost = safe_divide(np.array([total_cost]), np.array([total_initial_offering_30d]))[0]
-    
-    # ROAS 계산
-    deposit_roas = safe_divide(np.array([total_deposit_revenue_30d]), np.array([total_cost]))[0]
-    initial_offering_roas = safe_divide(np.array([total_initial_offering_revenue_30d]), np.array([total_cost]))[0]
-    
-    # 전환율 계산
-    cvr_signup = safe_divide(np.array([total_signup]), np.array([total_installs]))[0]
-    cvr_create_account = safe_divide(np.array([total_create_account]), np.array([total_installs]))[0]
-    cvr_deposit = safe_divide(np.array([total_deposit_30d]), np.array([total_create_account]))[0]
-    cvr_initial_offering = safe_divide(np.array([total_initial_offering_30d]), np.array([total_create_account]))[0]
-    
     # 퍼널, 단가, ROAS 분석
     st.subheader("전환 및 단가 분석")
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        _render_product_funnel(total_installs, total_signup, total_create_account, total_deposit_30d, total_initial_offering_30d,
-                              cvr_signup, cvr_create_account, cvr_deposit, cvr_initial_offering)
+        st.markdown("**퍼널 전환율 분석**")
+        emit_chart("product_funnel", detail["funnel_chart"])
     
     with col2:
-        _render_product_cost_waterfall(cpi, signup_cost, cac_create, offering_cost)
+        _render_product_cost_waterfall(*detail["costs"])
     
     with col3:
-        _render_product_roas_comparison(deposit_roas, initial_offering_roas)
+        st.markdown("**ROAS 비교**")
+        emit_chart("product_roas", detail["roas_chart"])
     
     st.divider()
     
@@ -304,10 +266,31 @@ def _render_individual_product_analysis(df, products):
     _render_product_source_comparison(product_df)
 
 
-def _render_product_funnel(total_installs, total_signup, total_create_account, total_deposit_30d, total_initial_offering_30d,
+def _product_detail(dataset, product):
+    """선택 Product 기간의 행과 퍼널/단가/ROAS 값 (차트 spec 포함)
+
+    product_df 는 공유 프레임의 기간 행으로, 날짜순 데이터면 복사 없는 slice 입니다 (수정 금지).
+    """
+    summary = product_summary(dataset, product)
+    if not summary.totals:
+        return {"product_df": summary.product_df}
+    
+    t = summary.totals
+    deposit_roas, initial_offering_roas = summary.roas
+    funnel_args = (t['installs'], t['signup_7d'], t['create_account_7d'], t['deposit_30d'], t['initial_offering_30d'],
+                   *summary.cvr)
+    return {
+        "product_df": summary.product_df,
+        "funnel_chart": chart_spec("product_funnel", lambda: _product_funnel_chart(*funnel_args), *funnel_args),
+        "costs": summary.costs,
+        "roas_chart": chart_spec("product_roas", lambda: _product_roas_chart(deposit_roas, initial_offering_roas),
+                                 deposit_roas, initial_offering_roas),
+    }
+
+
+def _product_funnel_chart(total_installs, total_signup, total_create_account, total_deposit_30d, total_initial_offering_30d,
                           cvr_signup, cvr_create_account, cvr_deposit, cvr_initial_offering):
-    """Product 퍼널 차트"""
-    st.markdown("**퍼널 전환율 분석**")
+    """단계별 전환수 깔때기 + 단계 간 전환율 라벨"""
     funnel_values = [total_installs, total_signup, total_create_account, total_deposit_30d, total_initial_offering_30d]
     funnel_stages = ['설치', '회원가입', '지갑개설', '입금', '청약']
     max_value = max(funnel_values) if funnel_values else 1
@@ -394,8 +377,7 @@ def _render_product_funnel(total_installs, total_signup, total_create_account, t
         )
         chart_layers.extend([conversion_bg, conversion_labels])
     
-    funnel_chart = alt.layer(*chart_layers).configure_view(strokeWidth=0)
-    st.altair_chart(funnel_chart, use_container_width=True)
+    return alt.layer(*chart_layers).configure_view(strokeWidth=0)
 
 
 def _render_product_cost_waterfall(cpi, signup_cost, cac_create, offering_cost):
@@ -463,12 +445,11 @@ def _render_product_cost_waterfall(cpi, signup_cost, cac_create, offering_cost):
     )
     
     # Streamlit에서 차트 표시
-    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+    st.plotly_chart(fig, width="stretch", config={'displayModeBar': False})
 
 
-def _render_product_roas_comparison(deposit_roas, initial_offering_roas):
-    """Product ROAS 비교 차트"""
-    st.markdown("**ROAS 비교**")
+def _product_roas_chart(deposit_roas, initial_offering_roas):
+    """입금 / 청약 ROAS 막대"""
     roas_data = pd.DataFrame({
         'ROAS유형': ['입금 ROAS', '청약 ROAS'],
         'ROAS': [
@@ -477,7 +458,7 @@ def _render_product_roas_comparison(deposit_roas, initial_offering_roas):
         ]
     })
     
-    roas_chart = alt.Chart(roas_data).mark_bar().encode(
+    return alt.Chart(roas_data).mark_bar().encode(
         x=alt.X('ROAS유형:N', sort=['입금 ROAS', '청약 ROAS'], title='ROAS 유형'),
         y=alt.Y('ROAS:Q', title='ROAS'),
         color=alt.Color('ROAS유형:N', legend=None, scale=alt.Scale(
@@ -489,71 +470,65 @@ def _render_product_roas_comparison(deposit_roas, initial_offering_roas):
             alt.Tooltip('ROAS:Q', title='ROAS', format='.2f')
         ]
     ).properties(height=300).interactive()
-    
-    st.altair_chart(roas_chart, use_container_width=True)
 
 
+def _detail_filter_mask(dims, column, selected, n_rows):
+    """세부 필터 선택값에 해당하는 행 (전체 / 컬럼 없음이면 모든 행)"""
+    if selected == '전체' or column not in dims:
+        return np.ones(n_rows, dtype=bool)
+    return (dims[column] == selected).to_numpy()
+
+
+@panel("product.source_comparison")
 def _render_product_source_comparison(product_df):
-    """Product Source별 성과 비교"""
+    """Product Source별 성과 비교
+
+    product_df 는 공유 프레임의 기간 행이므로 복사하지 않고, 결측을 채운 차원 컬럼과
+    세부 필터 마스크만 따로 만들어 그룹 합계를 냅니다.
+    """
     st.markdown("#### 성과 분포")
     
-    # 필터링된 데이터프레임 준비
-    filtered_df = product_df.copy()
-    
-    # NaN 값 처리
-    for col in ['source', 'campaign_name', 'sub_campaign_name']:
-        if col in filtered_df.columns:
-            filtered_df[col] = filtered_df[col].fillna('(미지정)')
-    
-
+    # 차원 컬럼의 NaN 값 처리 (해당 컬럼만 새로 만든다)
+    dims = {
+        col: product_df[col].fillna(UNSPECIFIED)
+        for col in ['source', 'campaign_name', 'sub_campaign_name']
+        if col in product_df.columns
+    }
     
     # 세부 필터 섹션
     detail_filter_col1, detail_filter_col2, detail_filter_col3 = st.columns(3)
     
     # Source 필터
     with detail_filter_col1:
-        available_sources = sorted(filtered_df['source'].unique().tolist()) if 'source' in filtered_df.columns else []
+        available_sources = sorted(dims['source'].unique().tolist()) if 'source' in dims else []
         selected_source = st.selectbox(
             "Source",
             options=['전체'] + available_sources,
             key="product_detail_filter_source"
         )
+    source_mask = _detail_filter_mask(dims, 'source', selected_source, len(product_df))
     
     # Campaign Name 필터 (Source 선택에 따라 필터링)
     with detail_filter_col2:
-        campaign_df = filtered_df.copy()
-        if selected_source != '전체' and 'source' in campaign_df.columns:
-            campaign_df = campaign_df[campaign_df['source'] == selected_source]
-        
-        available_campaigns = sorted(campaign_df['campaign_name'].unique().tolist()) if 'campaign_name' in campaign_df.columns else []
+        available_campaigns = sorted(dims['campaign_name'][source_mask].unique().tolist()) if 'campaign_name' in dims else []
         selected_campaign = st.selectbox(
             "Campaign Name",
             options=['전체'] + available_campaigns,
             key="product_detail_filter_campaign"
         )
+    campaign_mask = source_mask & _detail_filter_mask(dims, 'campaign_name', selected_campaign, len(product_df))
     
     # Sub Campaign Name 필터 (Source와 Campaign Name 선택에 따라 필터링)
     with detail_filter_col3:
-        sub_campaign_df = filtered_df.copy()
-        if selected_source != '전체' and 'source' in sub_campaign_df.columns:
-            sub_campaign_df = sub_campaign_df[sub_campaign_df['source'] == selected_source]
-        if selected_campaign != '전체' and 'campaign_name' in sub_campaign_df.columns:
-            sub_campaign_df = sub_campaign_df[sub_campaign_df['campaign_name'] == selected_campaign]
-        
-        available_sub_campaigns = sorted(sub_campaign_df['sub_campaign_name'].unique().tolist()) if 'sub_campaign_name' in sub_campaign_df.columns else []
+        available_sub_campaigns = sorted(dims['sub_campaign_name'][campaign_mask].unique().tolist()) if 'sub_campaign_name' in dims else []
         selected_sub_campaign = st.selectbox(
             "Sub Campaign Name",
             options=['전체'] + available_sub_campaigns,
             key="product_detail_filter_sub_campaign"
         )
     
-    # 세부 필터로 데이터 필터링
-    if selected_source != '전체' and 'source' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['source'] == selected_source]
-    if selected_campaign != '전체' and 'campaign_name' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['campaign_name'] == selected_campaign]
-    if selected_sub_campaign != '전체' and 'sub_campaign_name' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['sub_campaign_name'] == selected_sub_campaign]
+    # 세부 필터로 남길 행
+    keep = campaign_mask & _detail_filter_mask(dims, 'sub_campaign_name', selected_sub_campaign, len(product_df))
  
     # 기준 필터
     group_by_options = ['source', 'campaign_name', 'sub_campaign_name', 'creative_name']
@@ -575,19 +550,8 @@ def _render_product_source_comparison(product_df):
         # 그룹화 기준 결정
         group_by_column = selected_group_by
         
-        # 그룹화 및 집계
-        agg_dict = {
-            'cost': 'sum',
-            'installs': 'sum',
-            'signup_7d': 'sum',
-            'create_account_7d': 'sum',
-            'deposit_30d': 'sum',
-            'initial_offering_30d': 'sum',
-            'deposit_revenue_30d': 'sum',
-            'initial_offering_revenue_30d': 'sum'
-        }
-        
-        grouped_agg = filtered_df.groupby(group_by_column).agg(agg_dict).reset_index()
+        # 그룹 합계 + 파생 지표 (세부 필터에서 빠진 행은 제외, 행 복사 없음)
+        grouped_agg = product_breakdown(product_df, group_by_column, keep=keep, dims=dims)
     
     # 파이 차트
     display_label_map = {
@@ -612,14 +576,6 @@ def _render_product_source_comparison(product_df):
     
     # 성과 테이블
     st.markdown("상세 데이터")
-    grouped_agg['CPI'] = safe_divide(grouped_agg['cost'], grouped_agg['installs'])
-    grouped_agg['회원가입률'] = safe_divide(grouped_agg['signup_7d'], grouped_agg['installs'])
-    grouped_agg['지갑개설률'] = safe_divide(grouped_agg['create_account_7d'], grouped_agg['installs'])
-    grouped_agg['입금전환율_30d'] = safe_divide(grouped_agg['deposit_30d'], grouped_agg['create_account_7d'])
-    grouped_agg['청약전환율_30d'] = safe_divide(grouped_agg['initial_offering_30d'], grouped_agg['create_account_7d'])
-    grouped_agg['Deposit_ROAS_30d'] = safe_divide(grouped_agg['deposit_revenue_30d'], grouped_agg['cost'])
-    grouped_agg['InitialOffering_ROAS_30d'] = safe_divide(grouped_agg['initial_offering_revenue_30d'], grouped_agg['cost'])
-    
     display_cols = [
         group_by_column, 'cost', 'installs', 'CPI', '회원가입률', '지갑개설률',
         '입금전환율_30d', '청약전환율_30d', 'Deposit_ROAS_30d', 'InitialOffering_ROAS_30d',
@@ -627,38 +583,29 @@ def _render_product_source_comparison(product_df):
     ]
     grouped_agg = grouped_agg[[c for c in display_cols if c in grouped_agg.columns]]
     
-    grouped_styler = grouped_agg.style.format({
-        'cost': '{:,.0f}',
-        'installs': '{:,.0f}',
-        'CPI': '{:,.0f}',
-        '회원가입률': '{:.1%}',
-        '지갑개설률': '{:.1%}',
-        '입금전환율_30d': '{:.1%}',
-        '청약전환율_30d': '{:.1%}',
-        'Deposit_ROAS_30d': '{:.2f}',
-        'InitialOffering_ROAS_30d': '{:.2f}',
-        'deposit_revenue_30d': '{:,.0f}',
-        'initial_offering_revenue_30d': '{:,.0f}'
-    })
-    
-    st.dataframe(grouped_styler, use_container_width=True, hide_index=True)
+    # 큰 표(Creative Name 기준 등)는 서버에서 정렬/페이지 나눔
+    render_table(grouped_agg, BREAKDOWN_FORMATS, key="product_source_table",
+                 sort_columns=[c for c in display_cols[1:] if c in grouped_agg.columns])
 
 
 def _render_source_pie_chart(agg_df, group_column, column, title):
     """그룹별 파이 차트"""
-    pie_data = agg_df[[group_column, column]].copy()
-    pie_data = pie_data[pie_data[column] > 0]
+    pie_data = agg_df.loc[agg_df[column] > 0, [group_column, column]]
     if len(pie_data) > 0:
-        pie = alt.Chart(pie_data).mark_arc(innerRadius=0).encode(
-            theta=alt.Theta(f'{column}:Q', stack=True),
-            color=alt.Color(f'{group_column}:N', scale=alt.Scale(scheme='category10'), legend=alt.Legend(title=group_column)),
-            tooltip=[
-                alt.Tooltip(f'{group_column}:N', title=group_column),
-                alt.Tooltip(f'{column}:Q', title=title, format=',.0f')
-            ]
-        ).properties(title=title, height=250)
-        st.altair_chart(pie, use_container_width=True)
+        render_chart("product_pie", lambda: _source_pie_chart(pie_data, group_column, column, title),
+                     pie_data, group_column, column, title)
     else:
         st.markdown(f"**{title}**")
         st.info("데이터 없음")
 
+
+def _source_pie_chart(pie_data, group_column, column, title):
+    """그룹별 비중 파이"""
+    return alt.Chart(pie_data).mark_arc(innerRadius=0).encode(
+        theta=alt.Theta(f'{column}:Q', stack=True),
+        color=alt.Color(f'{group_column}:N', scale=alt.Scale(scheme='category10'), legend=alt.Legend(title=group_column)),
+        tooltip=[
+            alt.Tooltip(f'{group_column}:N', title=group_column),
+            alt.Tooltip(f'{column}:Q', title=title, format=',.0f')
+        ]
+    ).properties(title=title, height=250)
@@ -1,74 +1,65 @@
 """Segment comparison section."""
 
 import streamlit as st
-import pandas as pd
 
-from performance_dashboard.utils.helpers import safe_divide, get_segment_aggregation
+from performance_dashboard.engine.segment import COL_SORT_LIST, SEGMENT_DIMENSIONS, installs_max, segment_table
+from performance_dashboard.sections import panel, prepared
+from performance_dashboard.ui.components import COUNT_FORMAT, RATE_FORMAT, render_table
 
+# 테이블 숫자 형식 (column_config 로 한 번만 선언)
+SEGMENT_FORMATS = {
+    **{col: RATE_FORMAT for col in ["CTR", "설치율", "회원가입률", "지갑개설률", "입금 ROAS", "청약 ROAS"]},
+    **{col: COUNT_FORMAT for col in ["CPC", "CPI", "회원가입단가", "지갑개설단가", "설치", "노출", "입금액", "청약금",
+                                     "클릭", "회원가입", "지갑개설", "입금", "비용", "청약"]},
+}
 
-def render_segment_section(fdf):
-    """세그먼트별 비교 섹션 렌더링"""
+
+def segment_params() -> dict:
+    """Segment 섹션 위젯 값 (session_state 기준, 스크립트 스레드에서 읽는다)"""
+    return {
+        "seg": st.session_state.get("segment_comparison", SEGMENT_DIMENSIONS[0]),
+        "min_inst": st.session_state.get("segment_min_installs", 0),
+        "sort_key": st.session_state.get("segment_sort", COL_SORT_LIST[1]),
+        "ascending": st.session_state.get("segment_ascending", False),
+    }
+
+
+def compute_segment(view, params) -> dict:
+    """Segment 섹션 테이블 계산 (st 호출 없음, 섹션 계산 스레드에서 실행)"""
+    widget = (params["seg"], params["min_inst"], params["sort_key"], params["ascending"])
+    return {
+        "installs_max": installs_max(view),
+        "table": (widget, segment_table(view, *widget)),
+    }
+
+
+def render_segment_section(view, data=None):
+    """세그먼트별 비교 섹션 렌더링 (data: compute_segment 결과, 없으면 지금 계산)"""
     st.header("세그먼트별 비교")
     
+    if data is None:
+        data = compute_segment(view, segment_params())
+    
+    _render_segment_table(view, data)
+
+
+@panel("segment.table")
+def _render_segment_table(view, data):
+    """비교 기준/정렬/최소 설치수 위젯과 세그먼트 테이블"""
+    installs_max = int(data["installs_max"] or 0)
+    # 필터가 바뀌어 최대값이 줄었으면 슬라이더 값도 맞춘다 (범위를 벗어난 값은 위젯 오류)
+    if st.session_state.get("segment_min_installs", 0) > installs_max:
+        st.session_state["segment_min_installs"] = installs_max
+    
     col_seg, col_sort, col_min_inst = st.columns(3)
     with col_seg:
-        seg = st.selectbox("비교 기준", ["source", "campaign_name", "sub_campaign_name", "creative_name"], index=0, key="segment_comparison")
+        seg = st.selectbox("비교 기준", SEGMENT_DIMENSIONS, index=0, key="segment_comparison")
     with col_min_inst:
-        min_inst = st.slider("최소 설치수", 0, int(fdf["installs"].max() or 0), 0, step=10)
-    
-    cols_sum = ["impressions", "clicks", "installs", "signup_7d", "create_account_7d", "deposit_30d", "cost", "deposit_revenue_30d", "initial_offering_30d", "initial_offering_revenue_30d"]
-    agg = get_segment_aggregation(fdf, seg, cols_sum)
-    
-    # 파생 컬럼
-    agg["CTR"] = safe_divide(agg["clicks"], agg["impressions"])
-    agg["설치율"] = safe_divide(agg["installs"], agg["clicks"])
-    agg["회원가입률"] = safe_divide(agg["signup_7d"], agg["installs"])
-    agg["지갑개설률"] = safe_divide(agg["create_account_7d"], agg["signup_7d"])
-    agg["CPC"] = safe_divide(agg["cost"], agg["clicks"])
-    agg["CPI"] = safe_divide(agg["cost"], agg["installs"])
-    agg["회원가입단가"] = safe_divide(agg["cost"], agg["signup_7d"])
-    agg["지갑개설단가"] = safe_divide(agg["cost"], agg["create_account_7d"])
-    agg["입금 ROAS"] = safe_divide(agg["deposit_revenue_30d"], agg["cost"])
-    agg["청약 ROAS"] = safe_divide(agg["initial_offering_revenue_30d"], agg["cost"])
-    
-    # 컬럼 이름 변경
-    cols_value = ["노출", "클릭", "설치", "회원가입", "지갑개설", "입금", "비용", "입금액", "청약", "청약금"]
-    col_dict = dict(zip(cols_sum, cols_value))
-    agg = agg.rename(columns=col_dict)
-    
-    col_sort_list = ['CTR', '설치율', '회원가입률', '지갑개설률', 'CPC', 'CPI', '회원가입단가', '지갑개설단가', '입금 ROAS', '청약 ROAS', '비용', '노출', '설치', '클릭', '회원가입', '지갑개설', '입금', '입금액', '청약', '청약금']
-    agg = agg[[seg] + [c for c in col_sort_list if c in agg.columns]]
-    
-    # 필터(품질 가드)
-    agg = agg[agg["설치"] >= min_inst]
-    
+        min_inst = st.slider("최소 설치수", 0, installs_max, step=10, key="segment_min_installs")
     with col_sort:
-        sort_key = st.selectbox("정렬 기준", col_sort_list, index=1, key="segment_sort")
-        ascending = st.checkbox("오름차순 정렬", value=False)
+        sort_key = st.selectbox("정렬 기준", COL_SORT_LIST, index=1, key="segment_sort")
+        ascending = st.checkbox("오름차순 정렬", value=False, key="segment_ascending")
     
-    agg = agg.sort_values(sort_key, ascending=ascending)
-    styler = agg.style.format({
-        "CTR": "{:.1%}",
-        "설치율": "{:.1%}",
-        "회원가입률": "{:.1%}",
-        "지갑개설률": "{:.1%}",
-        "CPC": "{:,.0f}",
-        "CPI": "{:,.0f}",
-        "회원가입단가": "{:,.0f}",
-        "지갑개설단가": "{:,.0f}",
-        "입금 ROAS": "{:.1%}",
-        "청약 ROAS": "{:.1%}",
-        "설치": "{:,.0f}",
-        "노출": "{:,.0f}",
-        "입금액": "{:,.0f}",
-        "청약금": "{:,.0f}",
-        "클릭": "{:,.0f}",
-        "회원가입": "{:,.0f}",
-        "지갑개설": "{:,.0f}",
-        "입금": "{:,.0f}",
-        "비용": "{:,.0f}",
-        "청약": "{:,.0f}",
-    })
-    
-    st.dataframe(styler, use_container_width=True, hide_index=True)
-
+    widget = (seg, min_inst, sort_key, ascending)
+    agg = prepared(data, "table", widget, lambda: segment_table(view, *widget))
+    render_table(agg, SEGMENT_FORMATS, key="segment_table")
@@ -1,52 +1,246 @@
 """Trend section with various trend charts."""
 
 import streamlit as st
-import pandas as pd
-import numpy as np
 import altair as alt
+import pandas as pd
+
+from performance_dashboard.charts.downsample import downsample, point_budget
+from performance_dashboard.charts.spec_cache import chart_spec, emit_chart
+from performance_dashboard.data.sample import bucket_intervals
+from performance_dashboard.engine.trend import (
+    CONVERSION_COLS, ROLLING_WINDOWS, TREND_METRICS, conversion_trend, funnel_rate_trend, metric_comparison_trend,
+    segment_metric_options, segment_totals, segment_trend, series_modes, unit_cost_series, unit_cost_trend,
+)
+from performance_dashboard.sections import panel, prepared
+
+METRIC_COMPARISON_OPTIONS = TREND_METRICS
+METRIC_COMPARISON_DEFAULT = ["회원가입", "지갑개설"]
+SEGMENT_DIM_CANDIDATES = ["source", "campaign_name", "sub_campaign_name", "creative_name"]
+SEGMENT_TOPK_DEFAULT = 8
+# 차트가 차지하는 본문 폭 비율 (다운샘플링 점 수 기준)
+TOP_CHART_WIDTH = 1 / 3
+COMPARISON_CHART_WIDTH = 1 / 2
+
+# 표본 미리보기에서 신뢰구간 띠를 그릴 시리즈 (이름: (분자, 분모 또는 None))
+CONVERSION_LEFT_BANDS = {"비용": ("cost", None)}
+CONVERSION_RIGHT_BANDS = {"회원가입": ("signup_7d", None), "지갑개설": ("create_account_7d", None)}
+FUNNEL_RATE_BANDS = {"회원가입률": ("signup_7d", "installs"), "지갑개설률": ("create_account_7d", "signup_7d")}
+COST_LEFT_BANDS = {"CPI": ("cost", "installs"), "회원가입단가": ("cost", "signup_7d")}
+COST_RIGHT_BANDS = {"지갑개설단가": ("cost", "create_account_7d")}
+# 전환값 추이 시리즈 (컬럼: 표시 이름)
+CONVERSION_LABELS = {"cost": "비용", "signup_7d": "회원가입", "create_account_7d": "지갑개설"}
+# 시리즈 모드 (모드, 이동 합계 기간 또는 None) — 기간별 값
+RAW_SERIES = ("raw", None)
+
+
+def trend_params(view) -> dict:
+    """Trend 섹션 위젯 값 (session_state 기준, 스크립트 스레드에서 읽는다)"""
+    dims = _dim_candidates(view)
+    return {
+        "selected": tuple(st.session_state.get("trend_metric_comparison", METRIC_COMPARISON_DEFAULT)),
+        "dim_col": st.session_state.get("segment_trend_comparison", dims[0] if dims else None),
+        "metric": st.session_state.get("segment_trend_metric"),
+        "k": st.session_state.get("segment_trend_top_k", SEGMENT_TOPK_DEFAULT),
+        "zoom": st.session_state.get("trend_zoom"),
+        "series": _series(st.session_state.get("trend_series_mode", "raw"),
+                          st.session_state.get("trend_rolling_window", ROLLING_WINDOWS[0]), view.state.granularity),
+    }
+
+
+def _series(mode, window, granularity):
+    """시리즈 모드 키 (이동 합계가 아니면 기간은 무시해 같은 캐시 항목을 쓴다, 집계 단위에 없는 모드는 기간별)"""
+    if mode not in series_modes(granularity):
+        return RAW_SERIES
+    return (mode, window if mode == "rolling" else None)
+
 
-from performance_dashboard.utils.helpers import add_time_bucket, safe_divide, get_bucket_aggregation
+def compute_trend(view, params) -> dict:
+    """Trend 섹션 차트 spec 계산 (st 호출 없음, 섹션 계산 스레드에서 실행)
 
+    위젯에 딸린 차트는 (위젯 값, spec) 쌍으로 담아 렌더링 때 위젯 값이 같을 때만 씁니다.
+    bucket 이 차트 폭보다 많으면 시리즈를 LTTB 로 줄여 보내고, 확대 구간(zoom)을 고르면 그 구간만 다시 줄입니다.
+    시리즈 모드(series)가 이동 합계 / 누적이면 전체 구간 합계를 먼저 바꾼 뒤 확대 구간으로 자릅니다.
+    """
+    bounds = _zoom_bounds(view)
+    zoom = _effective_zoom(params.get("zoom"), bounds)
+    series = params.get("series", RAW_SERIES)
+    data = {
+        "zoom_bounds": bounds,
+        "zoom": zoom,
+        "series": series,
+        "conversion": chart_spec("trend_conversion", lambda: _conversion_trend_chart(view, zoom, series),
+                                 *view.key, zoom, series),
+        "funnel_rate": chart_spec("trend_funnel_rate", lambda: _funnel_conversion_trend_chart(view, zoom, series),
+                                  *view.key, zoom, series),
+        "cost": chart_spec("trend_cost", lambda: _cost_trend_chart(view, zoom, series), *view.key, zoom, series),
+    }
+    selected = params["selected"]
+    if selected:
+        data["metric_comparison"] = (selected, _metric_comparison_spec(view, selected, zoom, series))
+    dim_col = params["dim_col"]
+    if dim_col in _dim_candidates(view):
+        g = segment_trend(view, dim_col, *series)
+        metric_options = segment_metric_options(g)
+        # session_state 값이 선택지에 없으면 selectbox 는 첫 항목으로 돌아간다
+        metric = params["metric"] if params["metric"] in metric_options else (metric_options[0] if metric_options else None)
+        if metric is not None:
+            widget = (dim_col, metric, params["k"])
+            data["segment_comparison"] = (widget, _segment_comparison_spec(view, g, *widget, zoom, series))
+    return data
 
-def render_trend_section(fdf, granularity):
-    """Trend 섹션 렌더링"""
+
+def render_trend_section(view, data=None):
+    """Trend 섹션 렌더링 (data: compute_trend 결과, 없으면 지금 계산)"""
     st.header("📈 Trend")
     
-    bd = add_time_bucket(fdf, granularity)
+    if data is None:
+        data = compute_trend(view, trend_params(view))
+    
+    _render_series_mode(view.state.granularity, data.get("series", RAW_SERIES))
+    if data["zoom_bounds"] is not None:
+        _render_zoom_slider(data["zoom_bounds"], data["zoom"])
     
     col_t1, col_t2, col_t3 = st.columns(3)
     
     # 전환값 추이
     with col_t1:
-        _render_conversion_trend(bd)
+        st.subheader("**전환값 추이**")
+        emit_chart("trend_conversion", data["conversion"])
     
     # 퍼널 전환율 추이
     with col_t2:
-        _render_funnel_conversion_trend(bd)
+        st.subheader("**퍼널 전환율 추이**")
+        emit_chart("trend_funnel_rate", data["funnel_rate"])
     
     # 단가 추이
     with col_t3:
-        _render_cost_trend(bd)
+        st.subheader("단가 추이")
+        emit_chart("trend_cost", data["cost"])
+        if "impressions" not in view.dataset.frame.columns:
+            st.caption("※ `impressions` 컬럼이 없어 CPM은 제외되었습니다. (계산식: cost / impressions × 1000)")
     
     col_t4, col_t5 = st.columns(2)
     
     # 지표 추이 비교
     with col_t4:
-        _render_metric_comparison(bd)
+        _render_metric_comparison(view, data)
     
     # 세그먼트별 추이 비교
     with col_t5:
-        _render_segment_trend_comparison(fdf, granularity)
+        _render_segment_trend_comparison(view, data)
     
     st.divider()
 
 
-def _render_conversion_trend(bd):
-    """전환값 추이 차트"""
-    st.subheader("**전환값 추이**")
-    tmp = get_bucket_aggregation(bd, ["cost", "signup_7d", "create_account_7d"])
+def _dim_candidates(view):
+    return [c for c in SEGMENT_DIM_CANDIDATES if c in view.dataset.frame.columns]
+
+
+def _zoom_bounds(view):
+    """bucket 수가 상단 차트 점 수를 넘으면 (첫 bucket, 마지막 bucket), 아니면 None (확대 슬라이더 불필요)"""
+    buckets = conversion_trend(view)["bucket"]
+    budget = point_budget(TOP_CHART_WIDTH)
+    if not budget or len(buckets) <= budget:
+        return None
+    return (pd.Timestamp(buckets.min()).date(), pd.Timestamp(buckets.max()).date())
+
+
+def _effective_zoom(zoom, bounds):
+    """슬라이더 값을 bucket 범위로 자른 확대 구간 (전체 범위거나 범위 밖이면 None)"""
+    if not zoom or bounds is None:
+        return None
+    lo, hi = max(zoom[0], bounds[0]), min(zoom[1], bounds[1])
+    if lo >= hi or (lo, hi) == bounds:
+        return None
+    return (lo, hi)
+
+
+def _render_zoom_slider(bounds, zoom):
+    """확대 구간 슬라이더 (좁히면 그 구간을 원래 해상도로 다시 그린다)"""
+    if st.session_state.get("trend_zoom") != (zoom or bounds):
+        # 필터가 바뀌어 범위를 벗어난 값은 위젯을 만들기 전에 바로잡는다
+        st.session_state["trend_zoom"] = zoom or bounds
+    st.slider("🔍 확대 구간", min_value=bounds[0], max_value=bounds[1], key="trend_zoom",
+              help="기간이 길면 차트 폭에 맞춰 점을 줄여(LTTB, 봉우리/골짜기 유지) 보냅니다. "
+                   "구간을 좁히면 그 구간을 원래 해상도로 그립니다.")
+
+
+def _render_series_mode(granularity, series):
+    """시리즈 모드 위젯 (기간별 / 이동 합계 / 누적, 바꾸면 Trend 차트 전체를 다시 계산)
+
+    이동 합계는 일 단위 창이므로 집계 단위가 Daily 일 때만 선택지에 둡니다.
+    """
+    modes = series_modes(granularity)
+    if st.session_state.get("trend_series_mode", "raw") not in modes:
+        # 집계 단위를 바꿔 없어진 모드는 위젯을 만들기 전에 기간별로 되돌린다
+        st.session_state["trend_series_mode"] = "raw"
+    col_mode, col_window = st.columns([2, 1])
+    with col_mode:
+        mode = st.radio("시리즈", list(modes), format_func=modes.get, horizontal=True,
+                        key="trend_series_mode",
+                        help="이동 합계 / 누적은 bucket 합계를 먼저 더한 뒤 단가·전환율을 다시 계산합니다 (비율의 평균이 아님). "
+                             "이동 합계는 집계 단위가 Daily 일 때만 선택할 수 있습니다.")
+    if mode == "rolling":
+        with col_window:
+            st.selectbox("이동 합계 기간", ROLLING_WINDOWS, format_func="{}일".format, key="trend_rolling_window")
+    if series[0] == "rolling":
+        st.caption(f"최근 {series[1]}일 이동 합계 기준 (앞부분은 조회 시작일 이전 데이터까지 더합니다)")
+    elif series[0] == "cumulative":
+        st.caption("조회 시작일부터의 누적 합계 기준")
+
+
+def _window(df, zoom):
+    """확대 구간의 bucket 만 (zoom 이 None 이면 그대로)"""
+    if zoom is None:
+        return df
+    bucket = pd.to_datetime(df["bucket"])
+    return df[(bucket >= pd.Timestamp(zoom[0])) & (bucket <= pd.Timestamp(zoom[1]))]
+
+
+def _thin(df, value_cols, zoom, width, by=None):
+    """확대 구간으로 자르고 차트 폭(본문 폭 비율 width)에 맞춰 LTTB 다운샘플링"""
+    return downsample(_window(df, zoom), "bucket", value_cols, point_budget(width), by=by)
+
+
+def _interval_band(view, series, label_col, color_enc, zoom=None, mode="raw"):
+    """표본 미리보기 뷰면 시리즈별 95% 신뢰구간 띠 (정확한 뷰 / 기간별 값이 아닌 모드면 None)"""
+    if mode != "raw":
+        return None
+    bands = bucket_intervals(view, series, label_col=label_col)
+    if bands is None:
+        return None
+    bands = _window(bands, zoom)
+    return (
+        alt.Chart(bands)
+        .mark_area(opacity=0.2)
+        .encode(
+            x=alt.X("bucket:T"),
+            y=alt.Y("lower:Q", axis=None),
+            y2="upper:Q",
+            color=color_enc,
+        )
+    )
+
+
+def _long(df, labels, label_col, value_col):
+    """bucket x 시리즈 long 형태 (labels: {컬럼: 표시 이름}, 값이 NaN 인 행은 뺀다)"""
+    long_df = df.melt(id_vars=["bucket"], value_vars=list(labels), var_name=label_col, value_name=value_col)
+    long_df[label_col] = long_df[label_col].map(labels)
+    return long_df.dropna(subset=[value_col]).reset_index(drop=True)
+
+
+def _banded(chart, band):
+    """띠가 있으면 선 아래에 겹친 레이어 (축은 선 차트와 공유)"""
+    return chart if band is None else alt.layer(band, chart)
+
+
+def _conversion_trend_chart(view, zoom=None, series=RAW_SERIES):
+    """전환값 추이 (비용 왼쪽 축, 전환수 오른쪽 축)"""
+    tmp = _thin(conversion_trend(view, *series), CONVERSION_COLS, zoom, TOP_CHART_WIDTH)
     
-    base = alt.Chart(tmp).encode(x=alt.X("bucket:T", title=None, axis=alt.Axis(format='%m/%d')))
+    # fold / 라벨은 서버에서 미리 계산하고 레이어마다 자기 행만 보낸다 (브라우저 transform 없음)
+    long_df = _long(tmp, CONVERSION_LABELS, "metric_label", "value")
+    x_enc = alt.X("bucket:T", title=None, axis=alt.Axis(format='%m/%d'))
     
     # 공통 색/범례 (한글 라벨 기준)
     color_scale = alt.Scale(
@@ -63,10 +257,10 @@ def _render_conversion_trend(bd):
     
     # 왼쪽 축: Cost → "비용"
     cost_line = (
-        base
-        .transform_calculate(metric='"Cost"', value="datum.cost", metric_label='"비용"')
+        alt.Chart(long_df[long_df["metric_label"] == "비용"])
         .mark_line(strokeDash=[4, 2])
         .encode(
+            x=x_enc,
             y=alt.Y("value:Q", axis=alt.Axis(title=None, format="~s")),
             color=color_enc,
             tooltip=[alt.Tooltip("bucket:T", format='%m/%d'), "metric_label:N", "value:Q"]
@@ -75,126 +269,98 @@ def _render_conversion_trend(bd):
     
     # 오른쪽 축: signup_7d → "회원가입", create_account_7d → "지갑개설"
     right_lines = (
-        base
-        .transform_fold(["signup_7d", "create_account_7d"], as_=["metric", "value"])
-        .transform_calculate(
-            metric_label="datum.metric === 'signup_7d' ? '회원가입' : "
-                         "(datum.metric === 'create_account_7d' ? '지갑개설' : datum.metric)"
-        )
+        alt.Chart(long_df[long_df["metric_label"] != "비용"])
         .mark_line()
         .encode(
+            x=x_enc,
             y=alt.Y("value:Q", axis=alt.Axis(orient="right", title=None, format="~s")),
             color=color_enc,
             tooltip=[alt.Tooltip("bucket:T", format='%m/%d'), "metric_label:N", "value:Q"]
         )
     )
     
-    chart = (
-        alt.layer(cost_line, right_lines)
+    return (
+        alt.layer(
+            _banded(cost_line, _interval_band(view, CONVERSION_LEFT_BANDS, "metric_label", color_enc, zoom, series[0])),
+            _banded(right_lines, _interval_band(view, CONVERSION_RIGHT_BANDS, "metric_label", color_enc, zoom, series[0])),
+        )
         .resolve_scale(y="independent")
         .properties(height=260)
         .interactive()
     )
-    
-    st.altair_chart(chart, use_container_width=True)
 
 
-def _render_funnel_conversion_trend(bd):
-    """퍼널 전환율 추이 차트"""
-    st.subheader("**퍼널 전환율 추이**")
-    tmp2 = get_bucket_aggregation(bd, ["installs", "signup_7d", "create_account_7d"])
-    
-    # 전환율 계산 (0 나눗셈 방지)
-    tmp2["회원가입률"] = np.where(tmp2["installs"] > 0, tmp2["signup_7d"] / tmp2["installs"], np.nan)
-    tmp2["지갑개설률"] = np.where(tmp2["signup_7d"] > 0, tmp2["create_account_7d"] / tmp2["signup_7d"], np.nan)
+def _funnel_conversion_trend_chart(view, zoom=None, series=RAW_SERIES):
+    """회원가입률 / 지갑개설률 추이"""
+    tmp2 = _thin(funnel_rate_trend(view, *series), list(FUNNEL_RATE_BANDS), zoom, TOP_CHART_WIDTH)
     
-    # Long 형태로 변환
-    rate_m = tmp2.melt(
-        id_vars=["bucket"],
-        value_vars=["회원가입률", "지갑개설률"],
-        var_name="전환",
-        value_name="Rate"
-    )
+    # Long 형태로 변환 (분모가 0 인 bucket 은 서버에서 뺀다)
+    rate_m = _long(tmp2, {c: c for c in FUNNEL_RATE_BANDS}, "전환", "Rate")
     
     # 색/범례 정의
     color_scale = alt.Scale(
         domain=["회원가입률", "지갑개설률"],
         range=["#ff7f0e", "#2ca02c"]
     )
+    color_enc = alt.Color("전환:N", title=None, scale=color_scale)
     
-    chart2 = (
+    lines = (
         alt.Chart(rate_m)
         .mark_line()
         .encode(
             x=alt.X("bucket:T", title=None, axis=alt.Axis(format='%m/%d')),
             y=alt.Y("Rate:Q", axis=alt.Axis(title=None, format=".0%")),
-            color=alt.Color("전환:N", title=None, scale=color_scale),
+            color=color_enc,
             tooltip=[
                 alt.Tooltip("bucket:T", title="Bucket", format='%m/%d'),
                 alt.Tooltip("전환:N", title="지표"),
                 alt.Tooltip("Rate:Q", title="전환율", format=".1%")
             ]
         )
-        .transform_filter(alt.datum.Rate != None)
+    )
+    
+    return (
+        _banded(lines, _interval_band(view, FUNNEL_RATE_BANDS, "전환", color_enc, zoom, series[0]))
         .properties(height=260)
         .interactive()
     )
-    
-    st.altair_chart(chart2, use_container_width=True)
 
 
-def _render_cost_trend(bd):
-    """단가 추이 차트"""
-    st.subheader("단가 추이")
-    
+def _cost_trend_chart(view, zoom=None, series=RAW_SERIES):
+    """단가 추이 (CPM/CPI/회원가입단가 왼쪽 축, 지갑개설단가 오른쪽 축)"""
     # 집계 & 계산
-    cols = ["cost", "installs", "signup_7d", "create_account_7d"]
-    if "impressions" in bd.columns:
-        cols.append("impressions")
-    agg = get_bucket_aggregation(bd, cols)
-    
-    if "impressions" in agg.columns:
-        agg["CPM"] = np.where(agg["impressions"] > 0, agg["cost"] / agg["impressions"] * 1000.0, np.nan)
-    agg["CPI"] = np.where(agg["installs"] > 0, agg["cost"] / agg["installs"], np.nan)
-    agg["회원가입단가"] = np.where(agg["signup_7d"] > 0, agg["cost"] / agg["signup_7d"], np.nan)
-    agg["지갑개설단가"] = np.where(agg["create_account_7d"] > 0, agg["cost"] / agg["create_account_7d"], np.nan)
-    
-    series = ["CPI", "회원가입단가", "지갑개설단가"]
-    if "CPM" in agg.columns:
-        series = ["CPM"] + series
-    
-    cost_m = agg.melt(
-        id_vars=["bucket"],
-        value_vars=series,
-        var_name="지표",
-        value_name="CostMetric"
-    )
+    agg = unit_cost_trend(view, *series)
+    cost_series = unit_cost_series(agg)
+    agg = _thin(agg, cost_series, zoom, TOP_CHART_WIDTH)
+    
+    cost_m = _long(agg, {s: s for s in cost_series}, "지표", "CostMetric")
     
     # 인코딩 공통(범례/색/선스타일)
     color_scale = alt.Scale(
-        domain=series,
-        range=["#9467bd", "#1f77b4", "#ff7f0e", "#2ca02c"][:len(series)]
+        domain=cost_series,
+        range=["#9467bd", "#1f77b4", "#ff7f0e", "#2ca02c"][:len(cost_series)]
     )
     color_enc = alt.Color(
-        "지표:N", scale=color_scale, sort=series,
+        "지표:N", scale=color_scale, sort=cost_series,
         legend=alt.Legend(title=None, orient="top", direction="horizontal",
                          symbolStrokeWidth=3, symbolSize=120, labelFontSize=12, padding=6)
     )
     
     dash_scale = alt.Scale(
-        domain=series,
-        range=[[2, 2], [6, 3], [], []][:len(series)]
+        domain=cost_series,
+        range=[[2, 2], [6, 3], [], []][:len(cost_series)]
     )
     dash_enc = alt.StrokeDash("지표:N", scale=dash_scale, legend=None)
     
-    base = alt.Chart(cost_m).encode(x=alt.X("bucket:T", title=None, axis=alt.Axis(format='%m/%d')))
+    x_enc = alt.X("bucket:T", title=None, axis=alt.Axis(format='%m/%d'))
     
-    # 왼쪽 축: CPM/CPI/회원가입단가
-    left_series = [s for s in series if s != "지갑개설단가"]
+    # 왼쪽 축: CPM/CPI/회원가입단가 (레이어별 행은 서버에서 나눈다)
+    left_series = [s for s in cost_series if s != "지갑개설단가"]
     left_lines = (
-        base.transform_filter(alt.FieldOneOfPredicate(field="지표", oneOf=left_series))
+        alt.Chart(cost_m[cost_m["지표"].isin(left_series)])
         .mark_line()
         .encode(
+            x=x_enc,
             y=alt.Y("CostMetric:Q", axis=alt.Axis(title=None, format=",.0f")),
             color=color_enc,
             strokeDash=dash_enc,
@@ -208,9 +374,10 @@ def _render_cost_trend(bd):
     
     # 오른쪽 축: 지갑개설단가
     right_line = (
-        base.transform_filter(alt.datum.지표 == "지갑개설단가")
+        alt.Chart(cost_m[cost_m["지표"] == "지갑개설단가"])
         .mark_line()
         .encode(
+            x=x_enc,
             y=alt.Y("CostMetric:Q", axis=alt.Axis(orient="right", title="지갑개설단가", format=",.0f")),
             color=color_enc,
             strokeDash=dash_enc,
@@ -222,69 +389,43 @@ def _render_cost_trend(bd):
         )
     )
     
-    chart2 = (
-        alt.layer(left_lines, right_line)
+    return (
+        alt.layer(
+            _banded(left_lines, _interval_band(view, COST_LEFT_BANDS, "지표", color_enc, zoom, series[0])),
+            _banded(right_line, _interval_band(view, COST_RIGHT_BANDS, "지표", color_enc, zoom, series[0])),
+        )
         .resolve_scale(y="independent")
         .properties(height=260)
         .interactive()
     )
-    
-    st.altair_chart(chart2, use_container_width=True)
-    
-    if "CPM" not in agg.columns:
-        st.caption("※ `impressions` 컬럼이 없어 CPM은 제외되었습니다. (계산식: cost / impressions × 1000)")
 
 
-def _render_metric_comparison(bd):
+@panel("trend.metric_comparison")
+def _render_metric_comparison(view, data):
     """지표 추이 비교 차트"""
-    # 집계 데이터 준비
-    cols = ["cost", "installs", "signup_7d", "create_account_7d"]
-    if "impressions" in bd.columns:
-        cols.append("impressions")
-    agg = get_bucket_aggregation(bd, cols)
-    
-    # 날짜 컬럼 확인 및 처리
-    candidate_dates = ["date", "bucket", "day", "event_date"]
-    date_col = next((c for c in candidate_dates if c in agg.columns), None)
-    if date_col is None:
-        st.error("날짜 컬럼이 필요합니다. (가능한 이름: date, bucket, day, event_date)")
-        return
-    
-    agg[date_col] = pd.to_datetime(agg[date_col], errors="coerce")
-    agg.dropna(subset=[date_col], inplace=True)
-    
-    # 파생 지표 추가
-    if "signup_7d" in agg.columns:
-        agg["회원가입"] = agg["signup_7d"]
-    if "create_account_7d" in agg.columns:
-        agg["지갑개설"] = agg["create_account_7d"]
-    if {"signup_7d", "installs"}.issubset(agg.columns):
-        agg["회원가입률"] = safe_divide(agg["signup_7d"], agg["installs"])
-    if {"create_account_7d", "installs"}.issubset(agg.columns):
-        agg["지갑개설률"] = safe_divide(agg["create_account_7d"], agg["installs"])
-    if {"cost", "installs"}.issubset(agg.columns):
-        agg["CPI"] = safe_divide(agg["cost"], agg["installs"])
-    if {"cost", "signup_7d"}.issubset(agg.columns):
-        agg["회원가입단가"] = safe_divide(agg["cost"], agg["signup_7d"])
-    if {"cost", "create_account_7d"}.issubset(agg.columns):
-        agg["지갑개설 단가"] = safe_divide(agg["cost"], agg["create_account_7d"])
-    
-    # 일자 집계
-    sum_cols = [c for c in ["installs", "signup_7d", "create_account_7d", "cost"] if c in agg.columns]
-    mean_cols = [c for c in ["회원가입", "지갑개설", "회원가입률", "지갑개설률", "CPI", "회원가입단가", "지갑개설 단가"] if c in agg.columns]
-    ts = (
-        agg.groupby(date_col, as_index=False)
-        .agg({**{c: "sum" for c in sum_cols}, **{c: "mean" for c in mean_cols}})
-    )
-    
-    # 사용자 선택
-    all_opts = [c for c in ["회원가입", "지갑개설", "회원가입률", "지갑개설률", "CPI", "회원가입단가", "지갑개설 단가"] if c in ts.columns]
     st.subheader("지표 추이 비교")
-    selected = st.multiselect("지표 선택(복수가능)", all_opts, default=[x for x in ["회원가입", "지갑개설"] if x in all_opts])
+    selected = st.multiselect("지표 선택(복수가능)", METRIC_COMPARISON_OPTIONS, default=METRIC_COMPARISON_DEFAULT,
+                              key="trend_metric_comparison")
     if not selected:
         st.info("최소 1개 이상 선택하세요.")
         return
     
+    selected = tuple(selected)
+    zoom, series = data.get("zoom"), data.get("series", RAW_SERIES)
+    emit_chart("trend_metric_comparison",
+               prepared(data, "metric_comparison", selected, lambda: _metric_comparison_spec(view, selected, zoom, series)))
+
+
+def _metric_comparison_spec(view, selected, zoom=None, series=RAW_SERIES):
+    return chart_spec("trend_metric_comparison", lambda: _metric_comparison_chart(view, list(selected), zoom, series),
+                      *view.key, tuple(selected), zoom, series)
+
+
+def _metric_comparison_chart(view, selected, zoom=None, series=RAW_SERIES):
+    """선택 지표 추이 (비율 지표는 오른쪽 축)"""
+    date_col = "bucket"
+    ts = _thin(metric_comparison_trend(view, *series), selected, zoom, COMPARISON_CHART_WIDTH)
+    
     # 자동 포맷/스케일 결정
     rate_set = {"회원가입률", "지갑개설률"}
     only_rates = set(selected).issubset(rate_set) and len(selected) > 0
@@ -352,8 +493,7 @@ def _render_metric_comparison(bd):
             )
         )
         
-        chart = alt.layer(left_chart, right_chart).resolve_scale(y="independent").properties(height=360).interactive()
-        st.altair_chart(chart, use_container_width=True)
+        return alt.layer(left_chart, right_chart).resolve_scale(y="independent").properties(height=360).interactive()
     else:
         # 단일 축 버전
         plot_df = ts[[date_col] + selected].copy()
@@ -368,7 +508,7 @@ def _render_metric_comparison(bd):
             y_enc = alt.Y("값:Q", title="값", axis=alt.Axis(format=",.0f"))
             val_format = ",.0f"
         
-        chart = (
+        return (
             alt.Chart(long_df)
             .mark_line(point=False)
             .encode(
@@ -384,82 +524,57 @@ def _render_metric_comparison(bd):
             .properties(height=360)
             .interactive()
         )
-        st.altair_chart(chart, use_container_width=True)
 
 
-def _render_segment_trend_comparison(fdf, granularity):
+def _segment_comparison_spec(view, g, dim_col, metric, k, zoom=None, series=RAW_SERIES):
+    return chart_spec("trend_segment_comparison",
+                      lambda: _segment_comparison_chart(g, segment_totals(view, dim_col), dim_col, metric, k, zoom),
+                      *view.key, dim_col, metric, k, zoom, series)
+
+
+@panel("trend.segment_comparison")
+def _render_segment_trend_comparison(view, data):
     """세그먼트별 추이 비교 차트"""
-    working_df = add_time_bucket(fdf, granularity)
     st.subheader("세그먼트별 추이 비교")
     
-    date_col = "bucket"
-    working_df[date_col] = pd.to_datetime(working_df[date_col], errors="coerce")
-    working_df.dropna(subset=[date_col], inplace=True)
-    
-    # 파생 지표 추가
-    if "signup_7d" in working_df.columns:
-        working_df["회원가입"] = working_df["signup_7d"]
-    if "create_account_7d" in working_df.columns:
-        working_df["지갑개설"] = working_df["create_account_7d"]
-    if {"signup_7d", "installs"}.issubset(working_df.columns):
-        working_df["회원가입률"] = safe_divide(working_df["signup_7d"], working_df["installs"])
-    if {"create_account_7d", "installs"}.issubset(working_df.columns):
-        working_df["지갑개설률"] = safe_divide(working_df["create_account_7d"], working_df["installs"])
-    if {"cost", "installs"}.issubset(working_df.columns):
-        working_df["CPI"] = safe_divide(working_df["cost"], working_df["installs"])
-    if {"cost", "signup_7d"}.issubset(working_df.columns):
-        working_df["회원가입단가"] = safe_divide(working_df["cost"], working_df["signup_7d"])
-    if {"cost", "create_account_7d"}.issubset(working_df.columns):
-        working_df["지갑개설 단가"] = safe_divide(working_df["cost"], working_df["create_account_7d"])
-    
     col_t5_1, col_t5_2, col_t5_3 = st.columns(3)
     with col_t5_1:
-        dim_candidates = [c for c in ["source", "campaign_name", "sub_campaign_name", "creative_name"] if c in working_df.columns]
+        dim_candidates = _dim_candidates(view)
         if not dim_candidates:
             st.error("분해 가능한 컬럼이 없습니다.")
             return
         dim_col = st.selectbox("비교 기준", dim_candidates, index=0, key="segment_trend_comparison")
     
-    with col_t5_2:
-        metric_options = [c for c in ["회원가입", "지갑개설", "회원가입률", "지갑개설률", "CPI", "회원가입단가", "지갑개설 단가"] if c in working_df.columns]
-        metric = st.selectbox("비교 지표", metric_options, index=0, key="segment_trend_metric")
+    # 시간 x 분해축으로 집계 (compute 단계에서 캐시에 올려 둔 결과, 시리즈 모드 적용)
+    series = data.get("series", RAW_SERIES)
+    g = segment_trend(view, dim_col, *series)
     
-    rate_set = {"회원가입률", "지갑개설률"}
-    
-    # 시간 x 분해축으로 집계 (캐싱 불가능 - dim_col이 동적이므로 직접 계산)
-    grp_cols = [date_col, dim_col]
-    base = working_df.copy()
-    sum_map = {c: "sum" for c in ["installs", "signup_7d", "create_account_7d", "cost"] if c in base.columns}
-    g = base.groupby(grp_cols, as_index=False).agg(sum_map)
-    
-    # 그룹 단위 파생 재계산
-    if {"signup_7d", "installs"}.issubset(g.columns):
-        g["회원가입률"] = safe_divide(g["signup_7d"], g["installs"])
-    if {"create_account_7d", "installs"}.issubset(g.columns):
-        g["지갑개설률"] = safe_divide(g["create_account_7d"], g["installs"])
-    if {"cost", "installs"}.issubset(g.columns):
-        g["CPI"] = safe_divide(g["cost"], g["installs"])
-    if {"cost", "signup_7d"}.issubset(g.columns):
-        g["회원가입단가"] = safe_divide(g["cost"], g["signup_7d"])
-    if {"cost", "create_account_7d"}.issubset(g.columns):
-        g["지갑개설 단가"] = safe_divide(g["cost"], g["create_account_7d"])
-    if "signup_7d" in g.columns:
-        g["회원가입"] = g["signup_7d"]
-    if "create_account_7d" in g.columns:
-        g["지갑개설"] = g["create_account_7d"]
+    with col_t5_2:
+        metric = st.selectbox("비교 지표", segment_metric_options(g), index=0, key="segment_trend_metric")
     
     with col_t5_3:
-        topk_default = 8
-        k = st.slider("표시할 상위 카테고리 수", min_value=3, max_value=20, value=topk_default, step=1)
-    
-    if metric in rate_set:
-        order_df = g.groupby(dim_col, as_index=False)[metric].mean().sort_values(metric, ascending=False)
-    else:
-        order_df = g.groupby(dim_col, as_index=False)[metric].sum().sort_values(metric, ascending=False)
+        k = st.slider("표시할 상위 카테고리 수", min_value=3, max_value=20, value=SEGMENT_TOPK_DEFAULT, step=1,
+                      key="segment_trend_top_k")
+    
+    widget = (dim_col, metric, k)
+    zoom = data.get("zoom")
+    emit_chart("trend_segment_comparison",
+               prepared(data, "segment_comparison", widget,
+                        lambda: _segment_comparison_spec(view, g, *widget, zoom, series)))
+
+
+def _segment_comparison_chart(g, totals, dim_col, metric, k, zoom=None):
+    """상위 k개 세그먼트의 지표 추이 (순위: totals 의 기간 전체 값, 비율 지표도 합계의 비율)"""
+    date_col = "bucket"
+    rate_set = {"회원가입률", "지갑개설률"}
+    order_df = totals.sort_values(metric, ascending=False, kind="stable")
     
     top_values = order_df.head(k)[dim_col].astype(str).tolist()
-    g["_dim_str"] = g[dim_col].astype(str)
-    plot_df = g[g["_dim_str"].isin(top_values)].copy()
+    # g 는 캐시에 공유된 프레임이므로 수정하지 않는다
+    dim_str = g[dim_col].astype(str)
+    keep = dim_str.isin(top_values)
+    plot_df = g[keep].copy()
+    plot_df["_dim_str"] = dim_str[keep]
     
     # 차트
     is_rate = metric in rate_set
@@ -467,9 +582,11 @@ def _render_segment_trend_comparison(fdf, granularity):
                    title="전환율 (%)" if is_rate else "값",
                    axis=alt.Axis(format="%" if is_rate else ",.0f"))
     
+    # 세그먼트별로 확대 구간을 자르고 차트 폭에 맞춰 줄인다
+    plot_df = _thin(plot_df, [metric], zoom, COMPARISON_CHART_WIDTH, by="_dim_str")
     long_df = plot_df[[date_col, "_dim_str", metric]].rename(columns={metric: "값"})
     
-    chart = (
+    return (
         alt.Chart(long_df)
         .mark_line(point=False)
         .encode(
@@ -485,6 +602,4 @@ def _render_segment_trend_comparison(fdf, granularity):
         .properties(height=380)
         .interactive()
     )
-    
-    st.altair_chart(chart, use_container_width=True)
 
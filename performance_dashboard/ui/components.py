@@ -4,14 +4,22 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 
+from performance_dashboard.config import TABLE_PAGE_ROWS
 
-def create_kpi_card(label, value, format_str="{:,.0f}", delta=None, delta_format="{:+.1%}"):
-    """KPI 카드 생성"""
+# 표 숫자 컬럼 형식 (format, step): 값은 숫자 타입 그대로 보내고 브라우저가 포맷한다
+# step 은 표시 자릿수 (localized 1 → 1,234 / percent 0.001 → 12.3%)
+COUNT_FORMAT = ("localized", 1)
+RATE_FORMAT = ("percent", 0.001)
+RATIO_FORMAT = ("%.2f", 0.01)
+
+
+def create_kpi_card(label, value, format_str="{:,.0f}", delta=None, delta_format="{:+.1%}", margin=None):
+    """KPI 카드 생성 (margin: 근사값의 95% 신뢰구간 반폭, 값 아래 ± 로 표시)"""
     col1, col2 = st.columns([1, 2])
     with col1:
         st.caption(label)
     with col2:
-        if isinstance(value, (int, float, np.floating)) and not pd.isna(value):
+        if isinstance(value, (int, float, np.integer, np.floating)) and not pd.isna(value):
             value_text = format_str.format(value)
         else:
             value_text = "-"
@@ -21,4 +29,75 @@ def create_kpi_card(label, value, format_str="{:,.0f}", delta=None, delta_format
             delta_text = delta_format.format(delta)
             color = "green" if delta >= 0 else "red"
             st.markdown(f"<h3 style='margin:0'>{value_text} <span style='font-size:0.8em;color:{color};'>({delta_text})</span></h3>", unsafe_allow_html=True)
+        if margin is not None and not pd.isna(margin) and value_text != "-":
+            st.caption(f"± {format_str.format(margin)} (95%)")
+
+
+def render_preview_notice(fraction, job, poll_sec):
+    """표본 미리보기 안내 (job: 정확한 집계 Future, 끝나면 앱 전체를 다시 실행해 정확한 값으로 교체)"""
+    st.info(f"⚡ 미리보기: {fraction * 100:g}% 표본 추정값입니다 (± 는 95% 신뢰구간). "
+            "정확한 집계가 끝나면 자동으로 바뀝니다.")
+    if hasattr(st, "fragment"):
+        @st.fragment(run_every=poll_sec)
+        def _poll_exact():
+            if job.done():
+                st.rerun(scope="app")
+        _poll_exact()
+    elif st.button("정확한 값으로 새로고침"):
+        st.rerun()
+
+
+def lazy_tabs(labels, key, default=None):
+    """열린 탭만 계산하는 섹션 탭 (labels: {섹션 이름: 탭 라벨}) → {섹션 이름: (컨테이너, 열림 여부)}
+
+    탭을 바꾸면 앱을 다시 실행해 새로 열린 탭만 계산합니다.
+    st.tabs 가 열린 탭 상태를 지원하지 않는 버전에서는 가로 radio + 컨테이너 하나로 대신합니다.
+    """
+    names = list(labels)
+    default = default or names[0]
+    try:
+        tabs = st.tabs([labels[n] for n in names], default=labels[default], key=key, on_change="rerun")
+        return {n: (tab, bool(tab.open)) for n, tab in zip(names, tabs)}
+    except TypeError:
+        chosen = st.radio("섹션", names, index=names.index(default), format_func=labels.get,
+                          horizontal=True, key=key, label_visibility="collapsed")
+        body = st.container()
+        return {n: (body, n == chosen) for n in names}
+
+
+def number_column_config(formats: dict) -> dict:
+    """{컬럼: (format, step)} → st.dataframe column_config (셀마다 Python 에서 문자열로 만들지 않음)"""
+    return {col: st.column_config.NumberColumn(format=fmt, step=step) for col, (fmt, step) in formats.items()}
+
+
+def render_table(df, formats, key, sort_columns=None):
+    """숫자 형식을 column_config 로 한 번 선언해 표시하는 표 (pandas Styler 대신)
 
+    sort_columns 가 있으면 정렬 기준("기본" = 원래 순서)/방향 위젯을 두고 서버에서 정렬합니다 (행 위치만 정렬해 보낼 페이지 행만 꺼냄).
+    TABLE_PAGE_ROWS 보다 긴 표는 페이지 번호 위젯을 두고 현재 페이지 행만 브라우저로 보냅니다.
+    위젯 key 는 key 를 접두어로 씁니다.
+    """
+    positions = np.arange(len(df))
+    if sort_columns:
+        col_sort, col_order = st.columns([3, 1])
+        with col_sort:
+            sort_key = st.selectbox("정렬 기준", [None] + list(sort_columns), key=f"{key}_sort",
+                                    format_func=lambda c: "기본" if c is None else c)
+        with col_order:
+            ascending = st.checkbox("오름차순 정렬", value=False, key=f"{key}_ascending")
+        if sort_key is not None:
+            values = df[sort_key].reset_index(drop=True)
+            positions = values.sort_values(ascending=ascending, kind="stable").index.to_numpy()
+    
+    if TABLE_PAGE_ROWS > 0 and len(df) > TABLE_PAGE_ROWS:
+        pages = -(-len(df) // TABLE_PAGE_ROWS)
+        # 필터가 바뀌어 페이지 수가 줄었으면 위젯 값도 맞춘다 (범위를 벗어난 값은 위젯 오류)
+        if st.session_state.get(f"{key}_page", 1) > pages:
+            st.session_state[f"{key}_page"] = pages
+        page = st.number_input(f"페이지 (총 {pages})", 1, pages, key=f"{key}_page")
+        lo = (page - 1) * TABLE_PAGE_ROWS
+        positions = positions[lo:lo + TABLE_PAGE_ROWS]
+        st.caption(f"{lo + 1:,}–{lo + len(positions):,} / {len(df):,}행")
+    
+    page_df = df if np.array_equal(positions, np.arange(len(df))) else df.take(positions)
+    st.dataframe(page_df, column_config=number_column_config(formats), width="stretch", hide_index=True)
@@ -1,29 +1,41 @@
 """Sidebar filters and controls."""
 
+import time
+
 import streamlit as st
 import pandas as pd
+from streamlit.errors import StreamlitAPIException
 
-from performance_dashboard.utils.helpers import normalize_date_range
+from performance_dashboard.utils.helpers import normalize_date_range, preset_date_range
 from performance_dashboard.data.loader import clear_data_cache
+from performance_dashboard.config import SHOW_CACHE_STATS, DATE_PRESETS, GRANULARITIES, FILTER_APPLY, FILTER_DEBOUNCE_SEC
+from performance_dashboard.charts.spec_cache import chart_timings
+from performance_dashboard.utils.cache import AGGREGATE_CACHE
+from performance_dashboard.data.view import ALL_OPTION, FilterState, dimension_options, date_bounds, pending_row_count
+from performance_dashboard.warmup import warmup_status
+from performance_dashboard.export import (
+    EXPORT_FORMATS, available_formats, export_file_name, iter_frame_chunks, iter_row_chunks, section_exports, write_export,
+)
+
 
+# 적용된 필터 상태 (데이터 버전, FilterState) / 편집 중인 상태와 마지막 편집 시각 (form / debounce 모드)
+APPLIED_KEY = "applied_filter"
+PENDING_KEY = "pending_filter"
 
-def create_multi_filter(df, column_name):
+
+def create_multi_filter(dataset, column_name):
     """다중 선택 필터 생성"""
-    unique_values = [str(x) for x in df[column_name].dropna().unique()]
-    options = ["(All)"] + sorted(unique_values)
-    selected = st.sidebar.multiselect(column_name, options, default=["(All)"])
+    options = [ALL_OPTION] + dimension_options(dataset, column_name)
+    selected = st.multiselect(column_name, options, default=[ALL_OPTION])
     return selected
 
 
-def apply_filter(series, selections):
-    """필터 적용"""
-    if "(All)" in selections or len(selections) == 0:
-        return True
-    return series.astype(str).isin(selections)
-
+def render_sidebar_filters(dataset):
+    """사이드바 필터 렌더링 및 정규화된 필터 상태 반환
 
-def render_sidebar_filters(df):
-    """사이드바 필터 렌더링 및 필터링된 데이터 반환"""
+    FILTER_APPLY 가 form / debounce 이면 필터 위젯은 fragment 안에서 편집만 모아 두고,
+    적용된 상태(session_state[APPLIED_KEY])를 반환합니다.
+    """
     with st.sidebar:
         st.header("🔎 Filters")
         
@@ -31,52 +43,188 @@ def render_sidebar_filters(df):
         if st.button("🔄 데이터 새로고침", help="구글 스프레드시트 재조회(캐시 초기화)"):
             clear_data_cache()
             st.rerun()
+
+        if FILTER_APPLY in ("form", "debounce") and hasattr(st, "fragment"):
+            _staged_filter_panel(dataset)
+            state = st.session_state[APPLIED_KEY][1]
+        else:
+            state = _filter_widgets(dataset)
+    
+        # 표본 미리보기 (큐브가 있을 때만, 값은 session_state["preview_mode"])
+        if dataset.cube is not None:
+            st.toggle("⚡ 미리보기 (표본 근사)", key="preview_mode",
+                      help="큰 범위는 표본 추정값과 95% 신뢰구간을 먼저 보여주고, 정확한 집계가 끝나면 자동으로 바꿉니다.")
     
-    min_d, max_d = df["date"].min(), df["date"].max()
+    if SHOW_CACHE_STATS:
+        render_cache_stats()
+    
+    return state
+
+
+def _apply_filter(dataset, state):
+    """편집 중인 필터를 적용하고 앱 전체를 다시 실행"""
+    st.session_state[APPLIED_KEY] = (dataset.version, state)
+    st.rerun(scope="app")
+
+
+def _staged_filter_panel(dataset):
+    """편집을 모아 두는 필터 패널 (위젯을 바꾸면 이 패널만 다시 실행, 적용할 때만 전체 재실행)"""
+
+    @st.fragment(run_every=FILTER_DEBOUNCE_SEC / 2)
+    def debounce_timer():
+        # 적용 대기 중일 때만 그려지므로, 대기 중인 편집이 없는 세션은 주기 실행이 없다
+        pending, edited_at = st.session_state[PENDING_KEY]
+        waited = time.monotonic() - edited_at
+        if waited >= FILTER_DEBOUNCE_SEC:
+            _apply_filter(dataset, pending)
+        st.caption(f"편집이 멈추면 {FILTER_DEBOUNCE_SEC - waited:.1f}초 뒤 자동 적용")
+
+    @st.fragment
+    def panel():
+        pending = _filter_widgets(dataset)
+        applied = st.session_state.get(APPLIED_KEY)
+        if applied is None or applied[0] != dataset.version:
+            # 첫 실행 / 새 데이터 버전: 편집 중인 값을 그대로 적용 (이미 전체 실행 중이므로 rerun 없음)
+            st.session_state[APPLIED_KEY] = applied = (dataset.version, pending)
+        previous = st.session_state.get(PENDING_KEY)
+        if previous is None or previous[0] != pending:
+            st.session_state[PENDING_KEY] = (pending, time.monotonic())
+        if pending == applied[1]:
+            return
+
+        count = pending_row_count(dataset, pending)
+        current = pending_row_count(dataset, applied[1])
+        st.caption(f"적용 대기: {count:,}행 (현재 {current:,}행)")
+        if st.button("✅ 필터 적용", type="primary", width="stretch"):
+            _apply_filter(dataset, pending)
+        if FILTER_APPLY == "debounce":
+            debounce_timer()
+
+    panel()
+
+
+def _filter_widgets(dataset):
+    """날짜 / 집계 단위 / 차원 필터 위젯 → 정규화된 필터 상태 (사이드바 컨텍스트 안에서 호출)"""
+    min_d, max_d = date_bounds(dataset)
     
     # KST 기준 오늘 날짜 계산 (Streamlit 퀵 선택 버그 우회)
     today_kst = pd.Timestamp.now(tz="Asia/Seoul").date()
     max_pick = min(today_kst, max_d)  # KST 오늘과 데이터 최대일 중 작은 값 사용
     
     # 커스텀 프리셋 UI (Streamlit 퀵 선택 버그 우회)
-    preset_options = ["최근 7일", "최근 30일", "최근 90일", "전체", "직접설정"]
-    preset_choice = st.sidebar.selectbox("날짜 범위", preset_options, index=0)
+    preset_options = DATE_PRESETS + ["직접설정"]
+    preset_choice = st.selectbox("날짜 범위", preset_options, index=0)
     
     if preset_choice == "직접설정":
-        raw_date = st.sidebar.date_input("기간 선택", (min_d, max_d), min_value=min_d, max_value=max_pick, key="date_range")
+        raw_date = st.date_input("기간 선택", (min_d, max_d), min_value=min_d, max_value=max_pick, key="date_range")
         start_d, end_d = normalize_date_range(raw_date, min_d, max_d)
-    elif preset_choice == "최근 7일":
-        start_d = max(min_d, today_kst - pd.Timedelta(days=6))
-        end_d = min(max_pick, today_kst)
-    elif preset_choice == "최근 30일":
-        start_d = max(min_d, today_kst - pd.Timedelta(days=29))
-        end_d = min(max_pick, today_kst)
-    elif preset_choice == "최근 90일":
-        start_d = max(min_d, today_kst - pd.Timedelta(days=89))
-        end_d = min(max_pick, today_kst)
-    else:  # All data
-        start_d, end_d = min_d, max_d
+    else:
+        start_d, end_d = preset_date_range(preset_choice, min_d, max_d, today_kst)
     
     # 선택값 사후 클램프 (Streamlit 퀵 선택 버그 우회)
     end_d = min(end_d, max_pick)
     start_d = max(start_d, min_d)
     
-    granularity = st.sidebar.selectbox("집계 단위", ["Daily", "Weekly", "Monthly"], index=0)
+    granularity = st.selectbox("집계 단위", GRANULARITIES, index=0)
     
     # 세그먼트 필터 멀티셀렉트
-    sel_source = create_multi_filter(df, "source")
-    sel_campaign = create_multi_filter(df, "campaign_name")
-    sel_sub_campaign = create_multi_filter(df, "sub_campaign_name")
-    sel_creative = create_multi_filter(df, "creative_name")
-    
-    # 필터 적용 마스크
-    mask = (df["date"] >= start_d) & (df["date"] <= end_d)
-    mask = mask & apply_filter(df["source"], sel_source) \
-               & apply_filter(df["campaign_name"], sel_campaign) \
-               & apply_filter(df["sub_campaign_name"], sel_sub_campaign) \
-               & apply_filter(df["creative_name"], sel_creative)
-    
-    fdf = df.loc[mask].copy()
-    
-    return fdf, granularity, start_d, end_d
+    selections = {
+        "source": create_multi_filter(dataset, "source"),
+        "campaign_name": create_multi_filter(dataset, "campaign_name"),
+        "sub_campaign_name": create_multi_filter(dataset, "sub_campaign_name"),
+        "creative_name": create_multi_filter(dataset, "creative_name"),
+    }
+    return FilterState.from_selections(start_d, end_d, granularity, selections)
+
+
+def render_export_panel(view, segment=None, products=None):
+    """현재 필터 상태의 원본 행 / 섹션 집계 내려받기 (파일은 버튼을 누를 때 청크 단위로 만든다)"""
+    with st.sidebar.expander("📤 내보내기", expanded=False):
+        fmt = st.radio("형식", available_formats(), format_func=str.upper, horizontal=True, key="export_format")
+        mime = EXPORT_FORMATS[fmt][0]
+        _download_button(f"필터된 원본 행 ({view.row_count:,}행)", lambda: write_export(iter_row_chunks(view), fmt),
+                         export_file_name("rows", view.state, fmt), mime, key="export_rows")
+        for name, (label, build) in section_exports(view, segment, products).items():
+            _download_button(label, lambda build=build: write_export(iter_frame_chunks(build()), fmt),
+                             export_file_name(name, view.state, fmt), mime, key=f"export_{name}")
+
+
+def _download_button(label, make, file_name, mime, key):
+    """내려받기 버튼 (make: 파일 객체를 만드는 함수, 누를 때 별도 스레드에서 실행)
+
+    data 에 함수를 받지 못하는 Streamlit 버전에서는 "준비" 버튼을 누른 실행에서만 파일을 만듭니다.
+    """
+    try:
+        st.download_button(f"⬇️ {label}", make, file_name=file_name, mime=mime, key=key,
+                           on_click="ignore", width="stretch")
+    except (TypeError, StreamlitAPIException):
+        if st.button(f"📦 {label} 준비", key=f"{key}_prepare", width="stretch"):
+            st.download_button(f"⬇️ {label}", make(), file_name=file_name, mime=mime, key=key,
+                               width="stretch")
+
+
+def render_cache_stats():
+    """집계 캐시 상태 (운영용: 예산 조정 근거)"""
+    stats = AGGREGATE_CACHE.stats()
+    with st.sidebar.expander("⚙️ 집계 캐시 상태", expanded=False):
+        st.caption(
+            f"{stats['current_bytes'] / 1024**2:,.1f} / {stats['max_bytes'] / 1024**2:,.0f} MB · "
+            f"항목 {stats['entries']}개 (압축 {stats['compressed_entries']}개)"
+        )
+        hit_rate = "-" if pd.isna(stats["hit_rate"]) else f"{stats['hit_rate']:.1%}"
+        st.caption(
+            f"적중률 {hit_rate} · 적중 {stats['hits']:,} · 미스 {stats['misses']:,} · "
+            f"제거 {stats['evictions']:,} · 압축 {stats['compressions']:,}"
+        )
+        warm = warmup_status()
+        if warm is not None:
+            state = "실패" if warm["error"] else ("완료" if warm["finished"] else "진행 중")
+            st.caption(f"예열 {state}: {warm['done']}/{warm['total']} · {warm['elapsed']:.1f}s")
+        ns_df = pd.DataFrame.from_dict(stats["namespaces"], orient="index")
+        if not ns_df.empty:
+            st.dataframe(ns_df, width="stretch")
+        report = st.session_state.get("aggregation_report")
+        if report:
+            # 직전 rerun 기준: 선언 수 → 계획된 그룹 패스 → 실제로 행을 훑은 패스
+            st.caption(
+                f"집계 선언 {report['declared']} → 패스 계획 {report['planned_passes']} · "
+                f"실행 {report['executed_passes']} · 캐시 {report['from_cache']} · "
+                f"롤업 {report['rollups']} · 즉석 {report['on_demand']}"
+            )
+        sections = st.session_state.get("section_timings")
+        if sections:
+            # 섹션 계산을 동시에 실행한 벽시계 시간 vs 순서대로 했다면 걸렸을 합계
+            slowest = max(sections["sections"], key=sections["sections"].get)
+            st.caption(
+                f"섹션 계산 {sections['wall_ms']:,.0f}ms (순차 합계 {sections['sum_ms']:,.0f}ms, "
+                f"스레드 {sections['workers']}) · 가장 느린 섹션 {slowest} {sections['sections'][slowest]:,.0f}ms"
+            )
+        panels = st.session_state.get("panel_timings")
+        if panels:
+            # 위젯 변경 지연시간: 전체 스크립트 재실행 vs fragment 패널만 재실행 (패널별 마지막 실행)
+            st.caption(
+                f"전체 실행 {st.session_state.get('rerun_ms', 0):,.0f}ms · 패널 " +
+                " · ".join(f"{name} {t['ms']:,.0f}ms ({t['scope']})" for name, t in panels.items())
+            )
+        memory = st.session_state.get("memory_stats")
+        if memory:
+            # 직전 rerun 이 새로 할당한 메모리 최대치 (MEMORY_STATS=1, 다른 세션 rerun 과 겹치면 그 할당도 포함)
+            overlapped = " · 다른 rerun 과 겹침" if memory["overlapped"] else ""
+            st.caption(
+                f"rerun 메모리 최대 +{memory['peak_bytes'] / 1024**2:,.1f}MB "
+                f"(남음 {memory['retained_bytes'] / 1024**2:+,.1f}MB) · "
+                f"세션 최대 {memory['session_peak_bytes'] / 1024**2:,.1f}MB{overlapped}"
+            )
+        payload = st.session_state.get("last_chart_payload")
+        if payload:
+            # 직전 rerun 에서 브라우저로 보낸 차트 spec + 데이터셋 크기 (websocket 전송량)
+            largest = max(payload, key=payload.get)
+            st.caption(
+                f"차트 전송 {sum(payload.values()) / 1024:,.1f}KB (차트 {len(payload)}개) · "
+                f"가장 큰 차트 {largest} {payload[largest] / 1024:,.1f}KB"
+            )
+        timings_df = pd.DataFrame(chart_timings())
+        if not timings_df.empty:
+            st.caption("차트 spec 평균 시간 (ms) / 마지막 전송 크기 (KB)")
+            st.dataframe(timings_df.set_index("chart").round(1), width="stretch")
 
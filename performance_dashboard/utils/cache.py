@@ -0,0 +1,199 @@
+"""Byte-budgeted LRU cache for derived aggregates."""
+
+import hashlib
+import logging
+import pickle
+import sys
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from performance_dashboard.config import AGG_CACHE_MAX_BYTES, AGG_CACHE_COMPRESS
+
+logger = logging.getLogger(__name__)
+
+# 예산 대비 이 비율을 넘으면 오래된 항목부터 압축
+_COMPRESS_WATERMARK = 0.75
+
+
+def estimate_nbytes(value) -> int:
+    """캐시 항목의 메모리 사용량 추정 (바이트)"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(index=True, deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_nbytes(k) + estimate_nbytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def hash_value(value, hasher=None) -> str:
+    """캐시 키용 해시 (DataFrame 은 내용 기준)"""
+    h = hasher or hashlib.sha1()
+    if isinstance(value, pd.DataFrame):
+        h.update(b"df")
+        h.update(repr((list(value.columns), [str(t) for t in value.dtypes])).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        h.update(b"series")
+        h.update(repr((value.name, str(value.dtype))).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        h.update(b"nd")
+        h.update(repr((value.dtype.str, value.shape)).encode())
+        h.update(np.ascontiguousarray(value).tobytes() if value.dtype != object else repr(value.tolist()).encode())
+    elif isinstance(value, (list, tuple)):
+        h.update(b"seq(")
+        for v in value:
+            hash_value(v, h)
+        h.update(b")")
+    elif isinstance(value, dict):
+        h.update(b"dict(")
+        for k in sorted(value, key=repr):
+            hash_value(k, h)
+            hash_value(value[k], h)
+        h.update(b")")
+    else:
+        h.update(repr(value).encode())
+    return h.hexdigest()
+
+
+def _copy_out(value):
+    """공유 캐시 값을 호출자가 수정해도 안전하도록 복사"""
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return value.copy()
+    return value
+
+
+class _Entry:
+    __slots__ = ("value", "nbytes", "cost", "priority", "compressed", "namespace")
+
+    def __init__(self, value, nbytes, cost, namespace):
+        self.value = value
+        self.nbytes = nbytes
+        self.cost = cost
+        self.priority = 0.0
+        self.compressed = False
+        self.namespace = namespace
+
+
+class BudgetedCache:
+    """바이트 예산 기반 LRU/비용 인식 캐시
+
+    - 전체 크기가 `max_bytes` 를 넘으면 GreedyDual-Size 방식으로 제거합니다.
+      (우선순위 = 시계 + 계산시간/크기, 재계산 비용이 큰 작은 항목이 오래 남음)
+    - 예산의 75% 를 넘으면 가장 오래 안 쓰인 항목부터 zlib 으로 압축합니다.
+    - 적중/미스/제거/압축 카운터와 현재 바이트 수를 `stats()` 로 제공합니다.
+    """
+
+    def __init__(self, max_bytes: int, compress: bool = True):
+        self.max_bytes = int(max_bytes)
+        self.compress = compress
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._clock = 0.0
+        self._bytes = 0
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "compressions": 0, "decompressions": 0}
+        self._by_namespace = {}
+
+    def _count(self, namespace, field):
+        self._counters[field] += 1
+        ns = self._by_namespace.setdefault(namespace, {"hits": 0, "misses": 0})
+        if field in ns:
+            ns[field] += 1
+
+    def _touch(self, key, entry):
+        self._entries.move_to_end(key)
+        entry.priority = self._clock + entry.cost / max(entry.nbytes, 1) * 1e6
+
+    def get(self, key, namespace="default", default=None):
+        """키 조회 (없으면 default)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._count(namespace, "misses")
+                return default
+            self._count(namespace, "hits")
+            if entry.compressed:
+                value = pickle.loads(zlib.decompress(entry.value))
+                self._bytes -= entry.nbytes
+                entry.value, entry.compressed = value, False
+                entry.nbytes = estimate_nbytes(value)
+                self._bytes += entry.nbytes
+                self._counters["decompressions"] += 1
+            self._touch(key, entry)
+            value = entry.value
+        return _copy_out(value)
+
+    def put(self, key, value, cost: float = 0.0, namespace="default"):
+        """항목 저장 (cost: 재계산에 걸리는 초)"""
+        nbytes = estimate_nbytes(value)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            entry = _Entry(value, nbytes, cost, namespace)
+            self._entries[key] = entry
+            self._bytes += nbytes
+            self._touch(key, entry)
+            self._shrink()
+
+    def _shrink(self):
+        if self.compress and self._bytes > self.max_bytes * _COMPRESS_WATERMARK:
+            for key, entry in list(self._entries.items())[:-1]:
+                if self._bytes <= self.max_bytes * _COMPRESS_WATERMARK:
+                    break
+                if entry.compressed:
+                    continue
+                packed = zlib.compress(pickle.dumps(entry.value, protocol=pickle.HIGHEST_PROTOCOL), 1)
+                if len(packed) >= entry.nbytes:
+                    continue
+                self._bytes += len(packed) - entry.nbytes
+                entry.value, entry.nbytes, entry.compressed = packed, len(packed), True
+                self._counters["compressions"] += 1
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            victim_key = min(self._entries, key=lambda k: self._entries[k].priority)
+            victim = self._entries.pop(victim_key)
+            self._bytes -= victim.nbytes
+            self._clock = victim.priority
+            self._counters["evictions"] += 1
+            logger.debug("cache evict %s (%d bytes)", victim.namespace, victim.nbytes)
+
+    def clear(self, namespace=None):
+        """항목 제거 (namespace 지정 시 해당 항목만, 카운터는 유지)"""
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                self._bytes = 0
+                self._clock = 0.0
+                return
+            for key in [k for k, e in self._entries.items() if e.namespace == namespace]:
+                self._bytes -= self._entries.pop(key).nbytes
+
+    def stats(self) -> dict:
+        """캐시 상태 (카운터, 현재 바이트 수, 적중률, namespace 별 적중/미스)"""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": self._counters["hits"] / lookups if lookups else np.nan,
+                "entries": len(self._entries),
+                "compressed_entries": sum(1 for e in self._entries.values() if e.compressed),
+                "current_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "namespaces": {k: dict(v) for k, v in self._by_namespace.items()},
+            }
+
+
+# 프로세스 전체가 공유하는 집계 캐시
+AGGREGATE_CACHE = BudgetedCache(AGG_CACHE_MAX_BYTES, compress=AGG_CACHE_COMPRESS)
@@ -2,7 +2,6 @@
 
 import numpy as np
 import pandas as pd
-import streamlit as st
 from matplotlib.cm import get_cmap
 from matplotlib.colors import LinearSegmentedColormap, to_hex
 
@@ -12,28 +11,12 @@ def safe_divide(a, b):
     return np.where(b == 0, np.nan, a / b)
 
 
-def split_periods(data, days=7):
-    """기간을 현재/이전으로 분할"""
-    if data["date"].nunique() < days * 2:
-        return None, None
-    latest = data["date"].max()
-    current = data[(data["date"] >= latest - pd.Timedelta(days=days-1)) & (data["date"] <= latest)]
-    previous = data[(data["date"] >= latest - pd.Timedelta(days=days*2-1)) & (data["date"] < latest - pd.Timedelta(days=days))]
-    return current, previous
-
-
-def calculate_percentage_delta(current, previous, column):
-    """변화율 계산"""
-    if current is None or previous is None or current.empty or previous.empty:
-        return np.nan
-    current_sum = current[column].sum()
-    previous_sum = previous[column].sum()
-    return np.nan if previous_sum == 0 else (current_sum - previous_sum) / previous_sum
-
-
 def add_time_bucket(dataframe, granularity, date_col="Date"):
-    """시간 버킷 추가 (최적화: preprocess_df에서 생성된 week/month 컬럼 활용)"""
-    df = dataframe.copy()
+    """시간 버킷 추가 (최적화: preprocess_frame에서 생성된 week/month 컬럼 활용)
+
+    얕은 복사본에 bucket 컬럼만 추가하므로 기존 컬럼 배열은 입력과 공유합니다.
+    """
+    df = dataframe.copy(deep=False)
     if granularity == "Daily":
         # date 컬럼이 이미 있으면 활용, 없으면 Date 컬럼에서 생성
         if "date" in df.columns:
@@ -82,6 +65,18 @@ def normalize_date_range(date_range, min_date, max_date):
     return start, end
 
 
+def preset_date_range(preset, min_date, max_date, today):
+    """날짜 프리셋("최근 N일"/"전체")의 시작/종료일 (KST 오늘 기준, 데이터 범위로 클램프)"""
+    max_pick = min(today, max_date)
+    preset_days = {"최근 7일": 6, "최근 30일": 29, "최근 90일": 89}
+    if preset in preset_days:
+        start = max(min_date, today - pd.Timedelta(days=preset_days[preset]))
+        end = min(max_pick, today)
+    else:  # All data
+        start, end = min_date, max_date
+    return max(start, min_date), min(end, max_pick)
+
+
 def get_color_palette(name="Greens", n=5, reverse=False):
     """색상 팔레트 생성"""
     cmap = get_cmap(name, n)
@@ -93,20 +88,3 @@ def get_gradient_colors(base="#2E7D32", n=5, to="white"):
     """그라데이션 색상 생성"""
     cmap = LinearSegmentedColormap.from_list("custom", [base, to])
     return [to_hex(cmap(i/(n-1))) for i in range(n)]
-
-
-@st.cache_data(show_spinner=False)
-def get_bucket_aggregation(bd, cols_to_sum):
-    """시간 버킷별 집계 결과 캐싱"""
-    # bucket 컬럼이 없으면 오류 발생하므로 확인
-    if "bucket" not in bd.columns:
-        raise ValueError("DataFrame에 'bucket' 컬럼이 없습니다. add_time_bucket()를 먼저 호출하세요.")
-    # bucket과 집계할 컬럼들을 함께 선택
-    all_cols = ["bucket"] + [c for c in cols_to_sum if c in bd.columns]
-    return bd[all_cols].groupby("bucket").sum().reset_index()
-
-
-@st.cache_data(show_spinner=False)
-def get_segment_aggregation(fdf, seg_col, cols_to_sum):
-    """세그먼트별 집계 결과 캐싱"""
-    return fdf.groupby(seg_col)[cols_to_sum].sum().reset_index()
@@ -0,0 +1,46 @@
+"""Per-rerun allocation accounting (tracemalloc, opt-in via MEMORY_STATS)."""
+
+import contextlib
+import threading
+import tracemalloc
+
+from performance_dashboard.config import MEMORY_STATS
+
+_lock = threading.Lock()
+_active = []  # 측정 중인 rerun 들의 결과 dict (겹친 rerun 표시용)
+
+
+@contextlib.contextmanager
+def track_rerun():
+    """with 블록 동안 새로 할당한 메모리를 측정해 yield 한 dict 에 채운다
+
+    - peak_bytes: 블록 시작 대비 추적 메모리 최대 증가량 (rerun 이 잠시 잡았던 임시 배열 포함)
+    - retained_bytes: 블록이 끝난 뒤에도 남은 증가량 (캐시에 들어간 집계 등)
+    - overlapped: 같은 프로세스의 다른 rerun 과 겹쳤는지 (겹치면 그 할당도 섞인다,
+      캐시 예열 같은 백그라운드 스레드의 할당은 표시 없이 섞일 수 있음)
+
+    tracemalloc 은 프로세스 전체를 추적하므로 numpy/pandas 배열은 포함되고 Arrow 버퍼는 빠집니다.
+    MEMORY_STATS=0 이면 아무것도 하지 않고 빈 dict 를 돌려줍니다.
+    """
+    usage = {}
+    if not MEMORY_STATS:
+        yield usage
+        return
+    with _lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if not _active:
+            tracemalloc.reset_peak()
+        for other in _active:
+            other["overlapped"] = True
+        usage["overlapped"] = bool(_active)
+        _active.append(usage)
+        start, _ = tracemalloc.get_traced_memory()
+    try:
+        yield usage
+    finally:
+        with _lock:
+            current, peak = tracemalloc.get_traced_memory()
+            _active[:] = [u for u in _active if u is not usage]
+        usage["peak_bytes"] = max(peak - start, 0)
+        usage["retained_bytes"] = current - start
@@ -6,6 +6,7 @@
 
 import sys
 import os
+import subprocess
 from pathlib import Path
 from importlib import import_module
 import traceback
@@ -67,23 +68,46 @@ def main():
         ("performance_dashboard/main.py", "메인 진입점"),
         ("performance_dashboard/app.py", "대시보드 로직"),
         ("performance_dashboard/config.py", "설정 파일"),
+        ("performance_dashboard/warmup.py", "캐시 예열"),
+        ("performance_dashboard/preview.py", "표본 미리보기"),
+        ("performance_dashboard/export.py", "내보내기"),
         ("performance_dashboard/requirements.txt", "패키지 의존성"),
         ("performance_dashboard/data/__init__.py", "데이터 모듈 초기화"),
         ("performance_dashboard/data/gspread_reader.py", "Google Sheets 읽기 (필수)"),
         ("performance_dashboard/data/loader.py", "데이터 로더"),
+        ("performance_dashboard/data/dataset.py", "공유 데이터셋"),
+        ("performance_dashboard/data/bundle.py", "사전 계산 번들"),
+        ("performance_dashboard/data/view.py", "필터 상태별 뷰"),
+        ("performance_dashboard/data/planner.py", "집계 계획"),
+        ("performance_dashboard/data/cube.py", "MetricCube 집계 커널"),
+        ("performance_dashboard/data/duckdb_backend.py", "DuckDB 집계 백엔드 (선택)"),
+        ("performance_dashboard/data/offload.py", "집계 프로세스 오프로드 (선택)"),
+        ("performance_dashboard/data/sample.py", "층별 표본"),
         ("performance_dashboard/data/preprocessor.py", "데이터 전처리"),
         ("performance_dashboard/data/product_loader.py", "Product 로더"),
+        ("performance_dashboard/engine/__init__.py", "헤드리스 엔진"),
+        ("performance_dashboard/engine/kpi.py", "KPI 엔진"),
+        ("performance_dashboard/engine/trend.py", "Trend 엔진"),
+        ("performance_dashboard/engine/funnel.py", "Funnel 엔진"),
+        ("performance_dashboard/engine/segment.py", "Segment 엔진"),
+        ("performance_dashboard/engine/product.py", "Product 엔진"),
+        ("performance_dashboard/engine/kiosk.py", "키오스크 증분 합계"),
         ("performance_dashboard/sections/__init__.py", "섹션 모듈 초기화"),
         ("performance_dashboard/sections/kpi.py", "KPI 섹션"),
         ("performance_dashboard/sections/trend.py", "Trend 섹션"),
         ("performance_dashboard/sections/funnel.py", "Funnel 섹션"),
         ("performance_dashboard/sections/segment.py", "Segment 섹션"),
         ("performance_dashboard/sections/product.py", "Product 섹션"),
+        ("performance_dashboard/charts/__init__.py", "차트 모듈 초기화"),
+        ("performance_dashboard/charts/spec_cache.py", "차트 spec 캐시"),
+        ("performance_dashboard/charts/downsample.py", "추이 다운샘플링"),
         ("performance_dashboard/ui/__init__.py", "UI 모듈 초기화"),
         ("performance_dashboard/ui/components.py", "UI 컴포넌트"),
         ("performance_dashboard/ui/sidebar.py", "사이드바"),
         ("performance_dashboard/utils/__init__.py", "유틸리티 모듈 초기화"),
         ("performance_dashboard/utils/helpers.py", "유틸리티 함수"),
+        ("performance_dashboard/utils/cache.py", "집계 캐시"),
+        ("performance_dashboard/utils/memory.py", "rerun 메모리 측정"),
         ("configs/product_dates.json", "Product 날짜 설정 (상위 디렉토리)"),
     ]
     
@@ -111,13 +135,30 @@ def main():
         ("performance_dashboard", "메인 패키지"),
         ("performance_dashboard.config", "설정 모듈"),
         ("performance_dashboard.app", "앱 모듈"),
+        ("performance_dashboard.warmup", "캐시 예열"),
+        ("performance_dashboard.preview", "표본 미리보기"),
+        ("performance_dashboard.export", "내보내기"),
         ("performance_dashboard.data.gspread_reader", "Google Sheets 읽기 (필수)"),
         ("performance_dashboard.data.loader", "데이터 로더"),
+        ("performance_dashboard.data.dataset", "공유 데이터셋"),
+        ("performance_dashboard.data.bundle", "사전 계산 번들"),
+        ("performance_dashboard.data.view", "필터 상태별 뷰"),
+        ("performance_dashboard.data.planner", "집계 계획"),
+        ("performance_dashboard.data.cube", "MetricCube 집계 커널"),
+        ("performance_dashboard.data.duckdb_backend", "DuckDB 집계 백엔드 (선택)"),
+        ("performance_dashboard.data.offload", "집계 프로세스 오프로드 (선택)"),
+        ("performance_dashboard.data.sample", "층별 표본"),
         ("performance_dashboard.data.preprocessor", "데이터 전처리"),
         ("performance_dashboard.data.product_loader", "Product 로더"),
         ("performance_dashboard.utils.helpers", "유틸리티 함수"),
+        ("performance_dashboard.utils.cache", "집계 캐시"),
+        ("performance_dashboard.utils.memory", "rerun 메모리 측정"),
+        ("performance_dashboard.charts.spec_cache", "차트 spec 캐시"),
+        ("performance_dashboard.charts.downsample", "추이 다운샘플링"),
         ("performance_dashboard.ui.sidebar", "사이드바"),
         ("performance_dashboard.ui.components", "UI 컴포넌트"),
+        ("performance_dashboard.engine", "헤드리스 엔진"),
+        ("performance_dashboard.engine.kiosk", "키오스크 증분 합계"),
         ("performance_dashboard.sections.kpi", "KPI 섹션"),
         ("performance_dashboard.sections.trend", "Trend 섹션"),
         ("performance_dashboard.sections.funnel", "Funnel 섹션"),
@@ -145,11 +186,11 @@ def main():
         function_checks.append(False)
     
     try:
-        from performance_dashboard.data.loader import load_mother_data
-        print(f"{GREEN}✅{RESET} load_mother_data 함수 존재")
+        from performance_dashboard.data.loader import get_shared_dataset
+        print(f"{GREEN}✅{RESET} get_shared_dataset 함수 존재")
         function_checks.append(True)
     except Exception as e:
-        print(f"{RED}❌{RESET} load_mother_data 함수 없음: {e}")
+        print(f"{RED}❌{RESET} get_shared_dataset 함수 없음: {e}")
         function_checks.append(False)
     
     try:
@@ -159,6 +200,18 @@ def main():
     except Exception as e:
         print(f"{RED}❌{RESET} run_dashboard 함수 없음: {e}")
         function_checks.append(False)
+    
+    # engine 은 streamlit 없이 import 되어야 한다 (새 인터프리터에서 확인)
+    probe = subprocess.run(
+        [sys.executable, "-c", "import sys, performance_dashboard.engine; sys.exit('streamlit' in sys.modules)"],
+        cwd=str(parent_dir), capture_output=True, text=True,
+    )
+    if probe.returncode == 0:
+        print(f"{GREEN}✅{RESET} engine 이 streamlit 없이 import 됨")
+        function_checks.append(True)
+    else:
+        print(f"{RED}❌{RESET} engine import 가 streamlit 을 불러옴: {probe.stderr.strip()[-200:]}")
+        function_checks.append(False)
     print()
     
     # 설정 값 확인
@@ -0,0 +1,89 @@
+"""Background cache warm-up for the default sidebar presets."""
+
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+
+from performance_dashboard.config import DATE_PRESETS, GRANULARITIES, CACHE_WARMUP_YIELD_SEC
+from performance_dashboard.data.view import FilterState, date_bounds
+from performance_dashboard.engine import installs_max, open_view
+from performance_dashboard.utils.helpers import preset_date_range
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_status = {}  # 데이터 버전 -> 진행 상태
+
+
+def warmup_states(dataset, today=None):
+    """예열 대상 필터 상태 목록 (날짜 프리셋 x 집계 단위, 차원 필터 없음)"""
+    today = today or pd.Timestamp.now(tz="Asia/Seoul").date()
+    min_d, max_d = date_bounds(dataset)
+    states = []
+    for preset in DATE_PRESETS:
+        start_d, end_d = preset_date_range(preset, min_d, max_d, today)
+        for granularity in GRANULARITIES:
+            states.append(FilterState(start=start_d, end=end_d, granularity=granularity))
+    return states
+
+
+def _lower_thread_priority():
+    """가능하면 예열 스레드의 스케줄링 우선순위를 낮춘다 (Linux 전용)"""
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except (AttributeError, OSError):
+        pass
+
+
+def _run(dataset, status):
+    _lower_thread_priority()
+    t0 = time.perf_counter()
+    try:
+        for state in warmup_states(dataset):
+            view = open_view(dataset, state)
+            if view.row_count:
+                installs_max(view)
+            status["done"] += 1
+            status["elapsed"] = time.perf_counter() - t0
+            logger.info(
+                "cache warm-up %s: %d/%d (%s~%s %s) %.2fs",
+                dataset.version, status["done"], status["total"],
+                state.start, state.end, state.granularity, status["elapsed"],
+            )
+            # 실사용자 rerun 에 GIL/CPU 양보
+            time.sleep(CACHE_WARMUP_YIELD_SEC)
+    except Exception as e:
+        status["error"] = str(e)
+        logger.warning("cache warm-up %s failed: %s", dataset.version, e)
+    finally:
+        status["elapsed"] = time.perf_counter() - t0
+        status["finished"] = True
+
+
+def start_warmup(dataset):
+    """데이터 버전마다 한 번만 백그라운드 예열 시작 (이미 시작했으면 상태만 반환)"""
+    with _lock:
+        status = _status.get(dataset.version)
+        if status is not None:
+            return status
+        _status.clear()  # 이전 버전 상태는 버린다
+        status = {
+            "version": dataset.version,
+            "total": len(DATE_PRESETS) * len(GRANULARITIES),
+            "done": 0,
+            "elapsed": 0.0,
+            "finished": False,
+            "error": None,
+        }
+        _status[dataset.version] = status
+    threading.Thread(target=_run, args=(dataset, status), name="cache-warmup", daemon=True).start()
+    return status
+
+
+def warmup_status():
+    """가장 최근 예열 상태 (없으면 None)"""
+    with _lock:
+        return next(iter(_status.values()), None)